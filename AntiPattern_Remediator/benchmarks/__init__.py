@@ -0,0 +1,10 @@
+"""
+Benchmarks for AntiPattern Remediator
+
+Standalone scripts that measure the tool's own overheads:
+- startup_benchmark: CLI import time against a budget (python -X importtime)
+- workflow_benchmark: files/sec, per-node orchestration overhead and memory,
+  with a scripted fake LLM (fake_llm) over a synthetic corpus (java_corpus)
+- retrieval_benchmark: recall@k, MRR and latency of the trove retrievers,
+  with synthetic trove sizes
+"""
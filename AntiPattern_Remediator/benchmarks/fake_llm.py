@@ -0,0 +1,152 @@
+"""
+Deterministic fake chat model for offline benchmarks
+
+ScriptedChatModel answers every call through a script (messages -> text),
+after an artificial time-to-first-token and at a fixed token rate, and
+reports token usage the way real providers do, so the graph, streaming
+helpers and instrumentation run exactly as they would against a server.
+AGENT_SCRIPTS holds one script per agent that keeps the graph on its normal
+path: one finding, a strategy, a small behaviour-preserving edit, a "pass"
+review and a JSON explanation.
+"""
+
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+_JAVA_BLOCK = re.compile(r"```java\s*\n(.*?)\n```", re.DOTALL)
+_CLASS_OPEN = re.compile(r"\bclass\s+\w+[^{]*\{")
+
+
+def approx_tokens(text: str) -> int:
+    """Rough token count (4 characters per token), used for usage metadata and pacing."""
+    return max(1, len(text) // 4)
+
+
+def _message_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+
+
+def scanner_script(messages: List[BaseMessage]) -> str:
+    return json.dumps({
+        "total_antipatterns_found": 1,
+        "antipatterns_detected": [{
+            "name": "Magic Constants",
+            "location": "class body",
+            "description": "Numeric literals are used without a named constant.",
+        }],
+    })
+
+
+def strategist_script(messages: List[BaseMessage]) -> str:
+    return ("1. Introduce a private static final constant for the repeated limit.\n"
+            "2. Keep the public API and behaviour unchanged.")
+
+
+def transformer_script(messages: List[BaseMessage]) -> str:
+    """Echo the original Java code with one private constant added to its first class."""
+    blocks = _JAVA_BLOCK.findall(_message_text(messages))
+    code = blocks[-1] if blocks else "public class Empty {\n}"
+    match = _CLASS_OPEN.search(code)
+    if match:
+        code = code[:match.end()] + "\n    private static final int BENCHMARK_LIMIT = 100;\n" + code[match.end():]
+    return f"```java\n{code}\n```"
+
+
+def reviewer_script(messages: List[BaseMessage]) -> str:
+    return "pass\nThe change is behaviour-preserving and keeps the public API."
+
+
+def explainer_script(messages: List[BaseMessage]) -> str:
+    return json.dumps({
+        "antipatterns": [{"name": "Magic Constants", "explanation": "A literal replaced by a named constant."}],
+        "closing_summary": "Introduced a named constant.",
+    })
+
+
+AGENT_SCRIPTS = {
+    "scanner": scanner_script,
+    "strategist": strategist_script,
+    "transformer": transformer_script,
+    "reviewer": reviewer_script,
+    "explainer": explainer_script,
+}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that answers from a script with configurable latency and token rate"""
+
+    script: Callable[[List[BaseMessage]], str]
+    latency_s: float = 0.0        # Time to first token
+    tokens_per_s: float = 0.0     # Output rate; 0 returns the whole response at once
+    agent: str = "default"
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+    _simulated_s: float = PrivateAttr(default=0.0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def simulated_s(self) -> float:
+        """Total time spent in artificial latency and token pacing."""
+        return self._simulated_s
+
+    def _respond(self, messages: List[BaseMessage]):
+        text = self.script(messages)
+        usage = {
+            "input_tokens": approx_tokens(_message_text(messages)),
+            "output_tokens": approx_tokens(text),
+        }
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        with self._lock:
+            self._calls += 1
+        return text, usage
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+            with self._lock:
+                self._simulated_s += seconds
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        text, usage = self._respond(messages)
+        self._sleep(self.latency_s)
+        if self.tokens_per_s > 0:
+            self._sleep(usage["output_tokens"] / self.tokens_per_s)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text, usage = self._respond(messages)
+        self._sleep(self.latency_s)
+        pieces = [text[i:i + 4] for i in range(0, len(text), 4)]  # One approximate token per chunk
+        for i, piece in enumerate(pieces):
+            if self.tokens_per_s > 0:
+                self._sleep(1 / self.tokens_per_s)
+            chunk = AIMessageChunk(content=piece, usage_metadata=usage if i == len(pieces) - 1 else None)
+            if run_manager is not None:
+                run_manager.on_llm_new_token(piece, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+def scripted_models(latency_s: float = 0.0, tokens_per_s: float = 0.0) -> dict:
+    """One ScriptedChatModel per agent, keyed like CreateGraph.agents."""
+    return {
+        agent: ScriptedChatModel(script=script, latency_s=latency_s, tokens_per_s=tokens_per_s, agent=agent)
+        for agent, script in AGENT_SCRIPTS.items()
+    }
@@ -0,0 +1,87 @@
+"""
+Synthetic Java corpus generator
+
+Writes deterministic (seeded), parseable Java classes laid out like the
+cloned repositories the workflow runs on (clones/<repo>/src/main/java/...),
+with a mix of sizes and the constructs the scanner's signals look for:
+magic numbers, nested conditionals, broad catches and long methods.
+
+Usage:
+    python -m benchmarks.java_corpus OUT_DIR [--files 50] [--repos 2] [--seed 0]
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+SIZES = {"small": (2, 4), "medium": (5, 10), "large": (12, 25)}  # Methods per class
+SIZE_WEIGHTS = (("small", 5), ("medium", 4), ("large", 1))
+
+
+def _method(rng: random.Random, index: int) -> str:
+    kind = rng.choice(("arithmetic", "nested", "loop", "catch"))
+    limit = rng.randint(2, 999)
+    if kind == "arithmetic":
+        body = f"        return value * {limit} + {rng.randint(1, 99)};"
+    elif kind == "nested":
+        body = (f"        if (value > {limit}) {{\n"
+                f"            if (value % 2 == 0) {{\n"
+                f"                return value / 2;\n"
+                f"            }}\n"
+                f"            return value - {limit};\n"
+                f"        }}\n"
+                f"        return value;")
+    elif kind == "loop":
+        body = (f"        int total = 0;\n"
+                f"        for (int i = 0; i < value && i < {limit}; i++) {{\n"
+                f"            total += i;\n"
+                f"        }}\n"
+                f"        return total;")
+    else:
+        body = (f"        try {{\n"
+                f"            return Integer.parseInt(String.valueOf(value)) + {limit};\n"
+                f"        }} catch (Exception e) {{\n"
+                f"            return -1;\n"
+                f"        }}")
+    return f"    public int compute{index}(int value) {{\n{body}\n    }}\n"
+
+
+def generate_class(rng: random.Random, package: str, name: str, size: str) -> str:
+    low, high = SIZES[size]
+    methods = "\n".join(_method(rng, i) for i in range(rng.randint(low, high)))
+    return f"package {package};\n\npublic class {name} {{\n\n{methods}}}\n"
+
+
+def generate_corpus(out_dir, files: int = 50, repos: int = 2, seed: int = 0) -> list:
+    """Write `files` classes spread over `repos` repositories under OUT_DIR/clones; returns their paths."""
+    rng = random.Random(seed)
+    sizes, weights = zip(*SIZE_WEIGHTS)
+    paths = []
+    for i in range(files):
+        repo = f"bench-repo-{i % repos}"
+        package = f"org.bench.module{i % 7}"
+        directory = Path(out_dir) / "clones" / repo / "src" / "main" / "java" / Path(*package.split("."))
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"Generated{i:05d}"
+        path = directory / f"{name}.java"
+        path.write_text(generate_class(rng, package, name, rng.choices(sizes, weights)[0]), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Java corpus")
+    parser.add_argument("out_dir", help="Directory to write clones/<repo>/... into")
+    parser.add_argument("--files", type=int, default=50, help="Number of classes")
+    parser.add_argument("--repos", type=int, default=2, help="Number of repositories to spread them over")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same corpus)")
+    args = parser.parse_args(argv)
+
+    paths = generate_corpus(args.out_dir, args.files, args.repos, args.seed)
+    print(f"Wrote {len(paths)} files under {Path(args.out_dir) / 'clones'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Trove retrieval benchmark
+
+Loads the trove sources (static/antipatterns/*.json and static/ap.json),
+labels every entry with its anti-pattern, and runs a labelled query set (the
+scanner's own signal queries plus name-based queries for every anti-pattern)
+through each retriever behind its manager's `as_retriever()`. Reports
+recall@k, MRR and p50/p99 query latency; with --sizes the trove is padded
+with synthetic distractor chunks (drawn from the trove's own vocabulary) to
+see how quality and latency scale.
+
+Chroma needs an embedding model. By default it uses HashingEmbedding, an
+offline bag-of-words embedding, which makes the index's latency and scaling
+comparable but not its semantic quality; --embedding provider uses the
+configured provider's model instead.
+
+Usage:
+    python -m benchmarks.retrieval_benchmark [--retrievers tinydb,chroma] [--sizes 0,10000]
+        [--k 1,3,5,10] [--embedding hashing|provider] [--json report.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+STATIC_DIR = PROJECT_ROOT / "static"
+DEFAULT_KS = (1, 3, 5, 10)
+CHROMA_BATCH = 4000  # Below Chroma's maximum batch size
+_WORD = re.compile(r"[a-z0-9]+")
+
+QUERY_TEMPLATES = ("{name}", "{name} refactoring remediation", "how to fix {name} in Java code")
+
+
+def normalise_label(name: str) -> str:
+    return " ".join(_WORD.findall(name.lower()))
+
+
+def load_trove_entries(static_dir: Path = STATIC_DIR) -> list:
+    """Every trove entry as {'id', 'label', 'text', 'name'}."""
+    entries = []
+    for path in sorted((static_dir / "antipatterns").glob("*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            for i, entry in enumerate(json.load(f)):
+                text = "\n".join(f"{k.capitalize()}: {v}" for k, v in entry.items() if v)
+                entries.append({"id": f"{path.stem}-{i}", "label": normalise_label(entry["name"]),
+                                "name": entry["name"], "text": text})
+    with open(static_dir / "ap.json", "r", encoding="utf-8") as f:
+        for entry in json.load(f):
+            entries.append({"id": entry["id"], "label": normalise_label(entry["type"]),
+                            "name": entry["type"], "text": f"{entry['type']}: {entry['document']}"})
+    return entries
+
+
+def build_queries(entries: list) -> list:
+    """Labelled queries: the scanner's signal queries plus templates per anti-pattern name."""
+    from src.core.utils.code_signals import SIGNAL_QUERIES
+
+    names = {}
+    for entry in entries:
+        names.setdefault(entry["label"], entry["name"])
+    by_length = sorted(names, key=len, reverse=True)
+
+    queries = []
+    for _, query in SIGNAL_QUERIES:
+        label = next((l for l in by_length if normalise_label(query).startswith(l)), None)
+        if label is not None:
+            queries.append({"query": query, "label": label, "source": "signal"})
+    for label, name in sorted(names.items()):
+        for template in QUERY_TEMPLATES:
+            queries.append({"query": template.format(name=name), "label": label, "source": "template"})
+    return queries
+
+
+def synthetic_chunks(entries: list, count: int, seed: int = 0, words_per_chunk: tuple = (40, 80)) -> list:
+    """Unlabelled distractor chunks made of the trove's own words."""
+    rng = random.Random(seed)
+    vocabulary = sorted({w for entry in entries for w in _WORD.findall(entry["text"].lower())})
+    return [
+        {"id": f"synthetic-{i}", "label": None, "name": None,
+         "text": " ".join(rng.choices(vocabulary, k=rng.randint(*words_per_chunk)))}
+        for i in range(count)
+    ]
+
+
+class HashingEmbedding(Embeddings):
+    """Offline bag-of-words embedding (feature hashing, L2-normalised)"""
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> list:
+        vector = [0.0] * self.dimensions
+        for word in _WORD.findall(text.lower()):
+            vector[zlib.crc32(word.encode()) % self.dimensions] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def build_tinydb(records: list, work_dir: Path, embedding_name: str, k: int):
+    """TinyDB keyword search, as seeded by scripts/seed_database.py."""
+    from src.data.database import TinyDBManager
+
+    manager = TinyDBManager(db_path=str(work_dir / "tinydb.json"))
+    manager.add_documents([{"content": r["text"], "label": r["label"], "id": r["id"]} for r in records])
+    retriever = manager.as_retriever()
+    return lambda query: retriever.get_relevant_documents(query, max_results=k)
+
+
+def build_chroma(records: list, work_dir: Path, embedding_name: str, k: int):
+    """Chroma similarity search, as seeded by scripts/setup_db.py."""
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+    from src.data.database import VectorDBManager
+
+    embedding = HashingEmbedding() if embedding_name == "hashing" else None
+    manager = VectorDBManager(persist_dir=str(work_dir / "chroma"), embedding=embedding)
+    documents = [Document(page_content=r["text"], metadata={"label": r["label"] or "", "id": r["id"]}) for r in records]
+    for start in range(0, len(documents), CHROMA_BATCH):
+        manager.get_db().add_documents(documents[start:start + CHROMA_BATCH])
+    retriever = manager.as_retriever(search_kwargs={"k": k})
+    return retriever.invoke
+
+
+RETRIEVERS = {"tinydb": build_tinydb, "chroma": build_chroma}
+
+
+def _label_of(doc) -> str:
+    metadata = getattr(doc, "metadata", None) or {}
+    return metadata.get("label") or None
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+def evaluate(search, queries: list, relevant_counts: dict, ks: tuple = DEFAULT_KS) -> dict:
+    """recall@k (share of a label's entries in the top k), MRR and latency over `queries`."""
+    recalls = {k: [] for k in ks}
+    reciprocal_ranks, latencies = [], []
+    search(queries[0]["query"])  # Warm-up (lazy index loading), not timed
+    for query in queries:
+        start = time.perf_counter()
+        docs = search(query["query"])
+        latencies.append(time.perf_counter() - start)
+        hits = [_label_of(doc) == query["label"] for doc in docs]
+        for k in ks:
+            recalls[k].append(min(1.0, sum(hits[:k]) / relevant_counts[query["label"]]))
+        reciprocal_ranks.append(next((1 / (i + 1) for i, hit in enumerate(hits) if hit), 0.0))
+    return {
+        "queries": len(queries),
+        "recall": {f"@{k}": round(sum(values) / len(values), 3) for k, values in recalls.items()},
+        "mrr": round(sum(reciprocal_ranks) / len(reciprocal_ranks), 3),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+        },
+    }
+
+
+def run_benchmark(retrievers=("tinydb",), sizes=(0,), ks: tuple = DEFAULT_KS, embedding: str = "hashing",
+                  seed: int = 0, verbose: bool = False) -> list:
+    """One result per (retriever, size): build time plus `evaluate`'s metrics."""
+    entries = load_trove_entries()
+    queries = build_queries(entries)
+    relevant_counts = {}
+    for entry in entries:
+        relevant_counts[entry["label"]] = relevant_counts.get(entry["label"], 0) + 1
+    output = sys.stdout if verbose else io.StringIO()
+
+    results = []
+    for size in sizes:
+        records = entries + synthetic_chunks(entries, size, seed=seed)
+        for name in retrievers:
+            with tempfile.TemporaryDirectory(prefix="remediator_retrieval_") as work_dir:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(output):
+                    search = RETRIEVERS[name](records, Path(work_dir), embedding, max(ks))
+                build_s = time.perf_counter() - start
+                with contextlib.redirect_stdout(output):
+                    metrics = evaluate(search, queries, relevant_counts, ks)
+            results.append({"retriever": name, "synthetic_chunks": size, "trove_size": len(records),
+                            "build_s": round(build_s, 2), **metrics})
+    return results
+
+
+def _int_list(text: str) -> tuple:
+    return tuple(int(part) for part in text.split(",") if part.strip())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Recall@k, MRR and latency of the trove retrievers")
+    parser.add_argument("--retrievers", default="tinydb,chroma", help=f"Comma-separated, from {sorted(RETRIEVERS)}")
+    parser.add_argument("--sizes", type=_int_list, default=(0, 10000),
+                        help="Synthetic chunks added to the trove per run, e.g. 0,10000,100000,1000000")
+    parser.add_argument("--k", type=_int_list, default=DEFAULT_KS, help="Cut-offs for recall@k")
+    parser.add_argument("--embedding", choices=("hashing", "provider"), default="hashing",
+                        help="Chroma embedding: offline hashing, or the configured provider's model")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic chunk seed")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the managers' own output")
+    args = parser.parse_args(argv)
+
+    retrievers = [name.strip() for name in args.retrievers.split(",") if name.strip()]
+    unknown = [name for name in retrievers if name not in RETRIEVERS]
+    if unknown:
+        parser.error(f"unknown retriever(s): {', '.join(unknown)}")
+    if args.embedding == "provider":
+        from config.settings import initialize_settings
+        initialize_settings(os.getenv("LLM_PROVIDER", "ollama"))
+
+    results = run_benchmark(retrievers, args.sizes, args.k, args.embedding, args.seed, args.verbose)
+
+    recall_keys = [f"@{k}" for k in args.k]
+    print(f"{'retriever':10} {'trove':>9} {'build s':>8} " + " ".join(f"{'R' + key:>6}" for key in recall_keys)
+          + f" {'MRR':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['retriever']:10} {r['trove_size']:>9} {r['build_s']:>8} "
+              + " ".join(f"{r['recall'][key]:>6}" for key in recall_keys)
+              + f" {r['mrr']:>6} {r['latency_ms']['p50']:>8} {r['latency_ms']['p99']:>8}")
+    print(f"{results[0]['queries']} labelled queries per run" if results else "No runs")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Startup import-time benchmark
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter (best of
+several runs) and checks the cumulative import time of the entry point
+against a budget. It also fails if heavy optional dependencies (the vector
+store, non-selected providers, LangSmith, SonarQube) are imported before a
+provider or trove has been chosen.
+
+Usage:
+    python -m benchmarks.startup_benchmark [--budget-ms 500] [--runs 5] [--module main]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 500.0
+DEFAULT_RUNS = 5
+
+# Modules that must only be imported once the user has chosen a provider/trove
+DEFERRED_MODULES = ("chromadb", "langchain_chroma", "langchain_openai", "langchain_ibm",
+                    "langchain_ollama", "langsmith", "langgraph", "sonarqube_tool")
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse `-X importtime` output into [{'module', 'self_us', 'cumulative_us', 'depth'}]."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({
+                'module': module,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': (len(indent) - 1) // 2,
+            })
+    return entries
+
+
+def measure_import(module: str = "main", cwd: Path = PROJECT_ROOT) -> dict:
+    """Import `module` once in a fresh interpreter and return its import-time breakdown."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = parse_importtime(result.stderr)
+    top = next((e for e in reversed(entries) if e['module'] == module and e['depth'] == 0), None)
+    imported = {e['module'] for e in entries}
+    return {
+        'total_ms': top['cumulative_us'] / 1000 if top else 0.0,
+        'entries': entries,
+        'deferred_imported': sorted(
+            m for m in DEFERRED_MODULES if m in imported
+        ),
+    }
+
+
+def run_benchmark(module: str = "main", runs: int = DEFAULT_RUNS, budget_ms: float = DEFAULT_BUDGET_MS) -> dict:
+    """Best-of-`runs` import time of `module`, checked against the budget."""
+    measurements = [measure_import(module) for _ in range(runs)]
+    best = min(measurements, key=lambda m: m['total_ms'])
+    direct_children = sorted(
+        (e for e in best['entries'] if e['depth'] == 1),
+        key=lambda e: -e['cumulative_us'],
+    )
+    return {
+        'module': module,
+        'best_ms': round(best['total_ms'], 1),
+        'median_ms': round(sorted(m['total_ms'] for m in measurements)[len(measurements) // 2], 1),
+        'budget_ms': budget_ms,
+        'within_budget': best['total_ms'] <= budget_ms,
+        'deferred_imported': best['deferred_imported'],
+        'slowest_imports': [
+            {'module': e['module'], 'cumulative_ms': round(e['cumulative_us'] / 1000, 1)}
+            for e in direct_children[:10]
+        ],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check CLI import time against a budget")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Fresh interpreters to time")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Import-time budget in ms")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.module, args.runs, args.budget_ms)
+
+    print(f"import {report['module']}: best {report['best_ms']} ms, median {report['median_ms']} ms "
+          f"(budget {report['budget_ms']} ms)")
+    print("Slowest direct imports:")
+    for entry in report['slowest_imports']:
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+    ok = True
+    if not report['within_budget']:
+        print(f"FAIL: import time exceeds the {report['budget_ms']} ms budget")
+        ok = False
+    if report['deferred_imported']:
+        print(f"FAIL: imported at startup: {', '.join(report['deferred_imported'])}")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
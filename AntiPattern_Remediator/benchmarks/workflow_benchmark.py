@@ -0,0 +1,223 @@
+"""
+Workflow orchestration benchmark
+
+Runs the repo-mode workflow (graph, trove retrieval, pre-checks, metrics,
+reports, results store and database) over a synthetic Java corpus with the
+scripted fake LLM from fake_llm.py and SonarQube replaced by an offline stub,
+so what is measured is our own Python code. Reports files/sec, per-node wall
+time split into LLM time and orchestration overhead, results-writer time and
+memory high-water marks.
+
+Usage:
+    python -m benchmarks.workflow_benchmark [--files 20] [--concurrency 1] [--latency-ms 0]
+        [--tokens-per-s 0] [--min-files-per-s N] [--json report.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.fake_llm import scripted_models
+from benchmarks.java_corpus import generate_corpus
+
+# Everything that would leave the process is off; instrumentation supplies the per-node numbers
+BENCHMARK_ENV = {
+    "LLM_PROVIDER": "ollama",
+    "INSTRUMENTATION_ENABLED": "true",
+    "TARGETED_TESTS_ENABLED": "false",
+    "COMPILE_CHECK_ENABLED": "false",
+    "LANGSMITH_ENABLED": "false",
+    "EXPLAINER_MODE": "inline",
+}
+
+
+class OfflineSonarQube:
+    """Stands in for SonarQubeAPI: no issues for any file"""
+
+    def get_issues_for_file(self, project_key=None, file_path=None):
+        return {"issues": []}
+
+    def get_rules_and_fix_method(self, rule_key=None):
+        return {}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # bytes on macOS, KiB elsewhere
+
+
+def build_benchmark_graph(models: dict):
+    """CreateGraph over the bundled TinyDB trove, with every agent's LLM replaced by its scripted model."""
+    from src.core.graph import CreateGraph
+    from src.core.prompt import PromptManager
+    from src.data.database import TinyDBManager
+
+    class BenchmarkGraph(CreateGraph):
+        def llm_for(self, agent=None):
+            model = models.get(agent, models["strategist"])
+            for callback in self._callbacks:
+                if callback not in (model.callbacks or []):
+                    model.callbacks = list(model.callbacks or []) + [callback]
+            return model
+
+    db_manager = TinyDBManager()
+    return db_manager, BenchmarkGraph(db_manager, PromptManager(), retriever=db_manager.as_retriever())
+
+
+def run_benchmark(files: int = 20, repos: int = 2, seed: int = 0, concurrency: int = 1,
+                  latency_ms: float = 0.0, tokens_per_s: float = 0.0, verbose: bool = False) -> dict:
+    os.environ.update(BENCHMARK_ENV)
+    from config.settings import initialize_settings
+    settings = initialize_settings("ollama")
+
+    import src.core.agents.antipattern_scanner as scanner_module
+    from src.core.utils.instrumentation import instrumentation
+    from full_repo_workflow import process_java_files_with_workflow
+    from workflow.results_db import ResultsDB
+    from workflow.results_writer import ResultsWriter
+
+    class TimedResultsWriter(ResultsWriter):
+        """Accumulates the time spent computing metrics and writing results"""
+        busy_s = 0.0
+
+        def _write(self, file_path, final_state):
+            start = time.perf_counter()
+            try:
+                super()._write(file_path, final_state)
+            finally:
+                self.busy_s += time.perf_counter() - start
+
+    scanner_module._sonarqube_api = OfflineSonarQube
+    models = scripted_models(latency_s=latency_ms / 1000, tokens_per_s=tokens_per_s)
+    output = sys.stdout if verbose else io.StringIO()
+
+    with tempfile.TemporaryDirectory(prefix="remediator_bench_") as work_dir:
+        file_paths = generate_corpus(work_dir, files=files, repos=repos, seed=seed)
+        results_dir = Path(work_dir) / "processing_results"
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            db_manager, graph = build_benchmark_graph(models)
+        build_s = time.perf_counter() - start
+        _, build_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        instrumentation.reset()
+
+        writer = TimedResultsWriter(settings, "benchmark", results_dir=str(results_dir),
+                                    results_db=ResultsDB(results_dir / "results.db"))
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            processed, failed = process_java_files_with_workflow(
+                file_paths, settings, db_manager, graph.prompt_manager, graph.workflow,
+                concurrency=concurrency, results_writer=writer,
+            )
+            drain_start = time.perf_counter()
+            writer_stats = writer.close()
+        end = time.perf_counter()
+        _, run_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    wall_s = end - start
+    summary = instrumentation.summary()
+    nodes = {
+        name: {
+            "calls": stats["calls"],
+            "wall_s": stats["total_s"],
+            "llm_s": stats["llm_total_s"],
+            "overhead_s": round(stats["total_s"] - stats["llm_total_s"], 3),
+            "overhead_ms_per_file": round((stats["total_s"] - stats["llm_total_s"]) * 1000 / max(files, 1), 2),
+        }
+        for name, stats in summary["nodes"].items()
+    }
+    simulated_s = sum(model.simulated_s for model in models.values())
+    return {
+        "files": files,
+        "concurrency": concurrency,
+        "latency_ms": latency_ms,
+        "tokens_per_s": tokens_per_s,
+        "processed": len(processed),
+        "refactored": sum(1 for r in processed if r["status"] == "success"),
+        "failed": len(failed),
+        "graph_build_s": round(build_s, 3),
+        "wall_s": round(wall_s, 3),
+        "files_per_s": round(files / wall_s, 2) if wall_s else None,
+        "llm_calls": sum(model.calls for model in models.values()),
+        "simulated_llm_s": round(simulated_s, 3),
+        "overhead_ms_per_file": round((sum(n["overhead_s"] for n in nodes.values())) * 1000 / max(files, 1), 2),
+        "retrieval": summary["retrieval"],
+        "results_writer": {**writer_stats, "busy_s": round(writer.busy_s, 3),
+                           "drain_after_run_s": round(end - drain_start, 3)},
+        "nodes": nodes,
+        "memory": {
+            "graph_build_peak_mb": round(build_peak / 2**20, 1),
+            "run_peak_mb": round(run_peak / 2**20, 1),
+            "process_peak_rss_mb": _peak_rss_mb(),
+        },
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure workflow overhead with a scripted fake LLM")
+    parser.add_argument("--files", type=int, default=20, help="Synthetic files to process")
+    parser.add_argument("--repos", type=int, default=2, help="Repositories to spread them over")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--concurrency", type=int, default=1, help="Files processed at once")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fake time to first token per LLM call")
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="Fake output rate (0 = instant)")
+    parser.add_argument("--min-files-per-s", type=float, help="Fail if throughput is below this")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show the workflow's own output")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.files, args.repos, args.seed, args.concurrency,
+                           args.latency_ms, args.tokens_per_s, args.verbose)
+
+    print(f"{report['files']} files, concurrency {report['concurrency']}: {report['wall_s']} s, "
+          f"{report['files_per_s']} files/s ({report['refactored']} refactored, {report['failed']} failed)")
+    print(f"Graph build: {report['graph_build_s']} s; LLM calls: {report['llm_calls']} "
+          f"({report['simulated_llm_s']} s simulated)")
+    print(f"Orchestration overhead: {report['overhead_ms_per_file']} ms/file")
+    for name, stats in report["nodes"].items():
+        print(f"  {name:32} {stats['overhead_ms_per_file']:8.2f} ms/file overhead "
+              f"({stats['wall_s']:.3f} s wall, {stats['llm_s']:.3f} s LLM, {stats['calls']} calls)")
+    print(f"Retrieval: {report['retrieval']['calls']} calls, {report['retrieval']['total_s']} s")
+    writer = report["results_writer"]
+    print(f"Results writer: {writer['written']} written, {writer['busy_s']} s busy, "
+          f"{writer['drain_after_run_s']} s left to drain after the last file")
+    memory = report["memory"]
+    print(f"Memory: graph build peak {memory['graph_build_peak_mb']} MB, run peak {memory['run_peak_mb']} MB "
+          f"(traced); process peak RSS {memory['process_peak_rss_mb']} MB")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    ok = report["failed"] == 0
+    if not ok:
+        print(f"FAIL: {report['failed']} files failed")
+    if args.min_files_per_s is not None and (report["files_per_s"] or 0) < args.min_files_per_s:
+        print(f"FAIL: throughput below {args.min_files_per_s} files/s")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,11 +31,30 @@ class Settings:
     LLM_MODEL: str = ""
     EMBEDDING_MODEL: str = ""
     parameters: Optional[dict] = None
+    limits: Optional[dict] = None  # Per-provider concurrency/rate limits (see provider_settings.json)
+    endpoints: Optional[list] = None  # Several vLLM/Ollama base URLs to load balance across
+    agents: Optional[dict] = None  # Per-agent overrides: {"reviewer": {"provider", "LLM_MODEL", "parameters", "endpoints"}}
 
     # Database configuration
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
 
+    # Workflow configuration
+    PRESCREEN_ENABLED: bool = True  # Skip clearly clean files before any LLM call
+    DEDUP_ENABLED: bool = True  # Process byte-identical files once and apply the result to every copy
+    CLUSTERING_ENABLED: bool = True  # Reuse a near-duplicate file's refactoring strategy when the findings match
+    STRUCTURED_OUTPUT: bool = True  # Constrain scanner output to its JSON schema where supported
+    COMPILE_CHECK_ENABLED: bool = False  # Compile changed files against their Maven module before review
+    TARGETED_TESTS_ENABLED: bool = False  # Run the tests covering each refactored file after saving it
+    INSTRUMENTATION_ENABLED: bool = True  # Record per-node timings, LLM latency and token counts
+    STREAMING_ENABLED: bool = True  # Stream explainer output and stop after the first JSON object
+    EXPLAINER_MODE: str = "inline"  # inline (in the graph) | deferred (after all transforms) | skip
+    TRANSFORMER_OUTPUT_MODE: str = "full"  # full (whole file) | patch (search/replace edits applied locally)
+    BACKUP_MODE: str = "snapshot"  # snapshot (slated files only) | git (stash commit + ref) | copy (whole repository) | preimage (lazily, at write time)
+    ASYNC_RESULTS_WRITER: bool = True  # Write repo-mode reports on a background thread
+    RESULTS_STORE: str = "jsonl"  # jsonl (one consolidated file per run) | parquet (jsonl + Parquet export, needs pyarrow) | none
+    RESULTS_DB_ENABLED: bool = True  # Record runs, files, metrics, findings and stage timings in processing_results/results.db
+
     # API configuration
     API_BASE_URL: Optional[str] = None
     API_KEY: Optional[str] = None
@@ -62,6 +81,30 @@ class Settings:
         self.LLM_PROVIDER = os.getenv("LLM_PROVIDER", self.LLM_PROVIDER)
         self.LLM_MODEL = os.getenv("LLM_MODEL", self.LLM_MODEL)
         self.EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", self.EMBEDDING_MODEL)
+        if os.getenv("LLM_ENDPOINTS"):
+            self.endpoints = [url.strip() for url in os.getenv("LLM_ENDPOINTS").split(",") if url.strip()]
+        self.PRESCREEN_ENABLED = os.getenv("PRESCREEN_ENABLED", str(self.PRESCREEN_ENABLED)).lower() == "true"
+        self.DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", str(self.DEDUP_ENABLED)).lower() == "true"
+        self.CLUSTERING_ENABLED = os.getenv("CLUSTERING_ENABLED", str(self.CLUSTERING_ENABLED)).lower() == "true"
+        self.STRUCTURED_OUTPUT = os.getenv("STRUCTURED_OUTPUT", str(self.STRUCTURED_OUTPUT)).lower() == "true"
+        self.COMPILE_CHECK_ENABLED = os.getenv("COMPILE_CHECK_ENABLED", str(self.COMPILE_CHECK_ENABLED)).lower() == "true"
+        self.TARGETED_TESTS_ENABLED = os.getenv("TARGETED_TESTS_ENABLED", str(self.TARGETED_TESTS_ENABLED)).lower() == "true"
+        self.INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", str(self.INSTRUMENTATION_ENABLED)).lower() == "true"
+        self.STREAMING_ENABLED = os.getenv("STREAMING_ENABLED", str(self.STREAMING_ENABLED)).lower() == "true"
+        self.EXPLAINER_MODE = os.getenv("EXPLAINER_MODE", self.EXPLAINER_MODE).lower()
+        if self.EXPLAINER_MODE not in ("inline", "deferred", "skip"):
+            self.EXPLAINER_MODE = "inline"
+        self.TRANSFORMER_OUTPUT_MODE = os.getenv("TRANSFORMER_OUTPUT_MODE", self.TRANSFORMER_OUTPUT_MODE).lower()
+        if self.TRANSFORMER_OUTPUT_MODE not in ("full", "patch"):
+            self.TRANSFORMER_OUTPUT_MODE = "full"
+        self.BACKUP_MODE = os.getenv("BACKUP_MODE", self.BACKUP_MODE).lower()
+        if self.BACKUP_MODE not in ("snapshot", "git", "copy", "preimage"):
+            self.BACKUP_MODE = "snapshot"
+        self.ASYNC_RESULTS_WRITER = os.getenv("ASYNC_RESULTS_WRITER", str(self.ASYNC_RESULTS_WRITER)).lower() == "true"
+        self.RESULTS_STORE = os.getenv("RESULTS_STORE", self.RESULTS_STORE).lower()
+        if self.RESULTS_STORE not in ("jsonl", "parquet", "none"):
+            self.RESULTS_STORE = "jsonl"
+        self.RESULTS_DB_ENABLED = os.getenv("RESULTS_DB_ENABLED", str(self.RESULTS_DB_ENABLED)).lower() == "true"
 
         # LangSmith configuration
         self.LANGSMITH_ENABLED = os.getenv("LANGSMITH_ENABLED", "False").lower() == "true"
@@ -83,9 +126,52 @@ class Settings:
         self.PROMPT_DIR.mkdir(parents=True, exist_ok=True)
         self.VECTOR_DB_DIR.mkdir(parents=True, exist_ok=True)
 
-
-# Global settings instance
-settings = None
+    def agent_llm_config(self, agent: Optional[str] = None, default_model: Optional[str] = None) -> dict:
+        """
+        Resolve the LLM configuration for an agent (None = the default model).
+        An override with another provider starts from that provider's entry in
+        provider_settings.json; parameters are merged over the base ones.
+        """
+        override = (self.agents or {}).get(agent, {}) if agent else {}
+        provider = override.get("provider", self.LLM_PROVIDER)
+        if provider == self.LLM_PROVIDER:
+            base = {
+                "LLM_MODEL": default_model or self.LLM_MODEL,
+                "parameters": self.parameters,
+                "limits": self.limits,
+                "endpoints": self.endpoints,
+            }
+        else:
+            base = load_provider_config(provider)
+
+        return {
+            "provider": provider,
+            "model": override.get("LLM_MODEL", base.get("LLM_MODEL", "")),
+            "parameters": {**(base.get("parameters") or {}), **(override.get("parameters") or {})},
+            "limits": base.get("limits"),
+            "endpoints": override.get("endpoints", base.get("endpoints")),
+        }
+
+
+class _LazySettings:
+    """
+    Module-level `settings` handle. The Settings instance is created on first
+    attribute access (not at import time), and the handle always reflects the
+    latest initialize_settings() call, even in modules that imported it earlier.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_settings(), name, value)
+
+    def __repr__(self):
+        return repr(_settings) if _settings is not None else "<settings: not initialized>"
+
+
+# Global settings instance (created lazily)
+_settings: Optional[Settings] = None
 
 
 def load_provider_config(provider: str) -> dict:
@@ -101,18 +187,28 @@ def load_provider_config(provider: str) -> dict:
 
 def initialize_settings(provider: str = "ollama") -> Settings:
     """Initialize and return the Settings instance based on the provider"""
-    global settings
+    global _settings
     provider_config = load_provider_config(provider)
 
-    settings = Settings(
+    _settings = Settings(
         LLM_PROVIDER=provider,
         LLM_MODEL=provider_config.get("LLM_MODEL", ""),
         EMBEDDING_MODEL=provider_config.get("EMBEDDING_MODEL", ""),
-        parameters=provider_config.get("parameters")
+        parameters=provider_config.get("parameters"),
+        limits=provider_config.get("limits"),
+        endpoints=provider_config.get("endpoints"),
+        agents=provider_config.get("agents")
     )
     print(f"Loaded settings for provider: {provider}")
-    return settings
+    return _settings
+
+
+def get_settings() -> Settings:
+    """The current Settings, initialized from LLM_PROVIDER on first use"""
+    if _settings is None:
+        initialize_settings(os.getenv("LLM_PROVIDER", "ollama"))
+    return _settings
 
 
-# Default initialization
-settings = initialize_settings(os.getenv("LLM_PROVIDER", "ollama"))
+# Default initialization happens on first use
+settings = _LazySettings()
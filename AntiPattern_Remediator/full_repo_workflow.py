@@ -2,14 +2,30 @@
 Full Repository Workflow - Process files with 100% test coverage from JaCoCo results
 """
 from colorama import Fore, Style
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 import os
 
 # Import workflow utilities
 from workflow.workflow_utils import parse_antipattern_results, get_repository_paths_from_files
 from workflow.backup_manager import create_repository_backup
-from workflow.results_manager import save_intermediate_results, create_processing_summary
+from workflow.results_manager import (
+    save_intermediate_results, create_processing_summary, export_stage_metrics, record_run_results,
+    processing_rates,
+)
 from workflow.file_operations import read_java_file, save_refactored_code
+from workflow.prescreen import prescreen_files
+from workflow.dedup import dedup_files
+from workflow.clustering import strategy_cache_for
+from workflow.targeted_tests import TargetedTestRunner
+from workflow.deferred_explainer import DeferredExplainer
+from workflow.run_journal import RunJournal, new_run_id
+from workflow.work_queue import WorkQueue
+from workflow.preimage_store import preimages_for
+from workflow.results_writer import results_writer_for, consolidate_parts
+from workflow.results_db import results_db_for
+from src.core.utils import PRECHECK_FAIL, PRECHECK_NOOP
 
 
 
@@ -80,156 +96,400 @@ def read_jacoco_results(jacoco_results_dir: str = "../jacoco_results") -> list:
 
 
 
-def process_java_files_with_workflow(file_paths: list, settings, db_manager, prompt_manager, langgraph):
-    """Process each Java file through the agentic workflow."""
-    processed_files = []
-    failed_files = []
-    
-    for i, file_path in enumerate(file_paths, 1):
-        print(Fore.BLUE + f"\n{'='*60}" + Style.RESET_ALL)
-        print(Fore.BLUE + f"Processing file {i}/{len(file_paths)}: {file_path}" + Style.RESET_ALL)
-        print(Fore.BLUE + f"{'='*60}" + Style.RESET_ALL)
-        
-        # Read the Java file content
-        java_code = read_java_file(file_path)
-        if java_code is None:
-            failed_files.append(file_path)
-            continue
-        
-        # Create initial state for this file
-        initial_state = {
-            "code": java_code,
-            "context": None,
-            "trove_context": None,
-            "antipatterns_scanner_results": None,
-            "refactoring_strategy_results": None,
-            "refactored_code": None,
-            "code_review_results": None,
-            "code_review_times": 0,
-            "msgs": [],
-            "answer": None,
-            "current_file_path": file_path,  # Track current file being processed
-            "explanation_response_raw": None,
-            "explanation_json": None
-        }
-        
+def load_jacoco_file_list(list_files: list) -> list:
+    """Read file paths from JaCoCo result files without prompting (duplicates dropped, order kept)."""
+    file_paths = []
+    seen = set()
+    for list_file in list_files:
         try:
-            # Run the agentic workflow
-            print(Fore.CYAN + "Running agentic workflow..." + Style.RESET_ALL)
-            final_state = langgraph.invoke(initial_state)
-            
-            # Save intermediate results for analysis
-            save_intermediate_results(file_path, final_state, settings)
-            
-            # Check if refactoring was successful
-            if final_state.get('refactored_code'):
-                # Parse anti-pattern results
-                antipatterns_found, antipatterns_count = parse_antipattern_results(final_state.get('antipatterns_scanner_results'))
-                
+            with open(list_file, 'r') as f:
+                for line in f:
+                    path = line.strip()
+                    if path and path not in seen:
+                        seen.add(path)
+                        file_paths.append(path)
+        except Exception as e:
+            print(Fore.RED + f"Error reading file {list_file}: {e}" + Style.RESET_ALL)
+    print(Fore.GREEN + f"Found {len(file_paths)} files with 100% test coverage in {len(list_files)} result file(s)" + Style.RESET_ALL)
+    return file_paths
+
+
+def _confirm(prompt: str, assume_yes: bool) -> bool:
+    """Y/N prompt; answered automatically in headless runs."""
+    if assume_yes:
+        print(f"{prompt} (Y/N): y [--yes]")
+        return True
+    return input(f"{prompt} (Y/N): ").strip().lower() == 'y'
+
+
+def process_java_file(index: int, total: int, file_path: str, settings, langgraph, test_runner, deferred_explainer,
+                      preimages=None, results_writer=None, duplicates=(), strategy_cache=None):
+    """
+    Run one file through the agentic workflow and apply the outcome to it and to its
+    byte-identical `duplicates`. Returns a list of (path, result dict or None if it failed),
+    the file first, then each duplicate.
+    With `preimages`, each file's original content is stored before it is overwritten.
+    With `results_writer`, the reports (and results database records) are written through it.
+    With `strategy_cache`, a near-duplicate file's strategy is offered to the strategist.
+    """
+    paths = [file_path, *duplicates]
+    print(Fore.BLUE + f"\n{'='*60}" + Style.RESET_ALL)
+    print(Fore.BLUE + f"Processing file {index}/{total}: {file_path}" + Style.RESET_ALL)
+    if duplicates:
+        print(Fore.BLUE + f"  (+{len(duplicates)} identical copies: {', '.join(duplicates)})" + Style.RESET_ALL)
+    print(Fore.BLUE + f"{'='*60}" + Style.RESET_ALL)
+
+    # Read the Java file content
+    java_code = read_java_file(file_path)
+    if java_code is None:
+        return [(path, None) for path in paths]
+
+    # Create initial state for this file
+    initial_state = {
+        "code": java_code,
+        "context": None,
+        "trove_context": None,
+        "code_signals": None,
+        "antipatterns_scanner_results": None,
+        "antipatterns_scan_report": None,
+        "refactoring_strategy_results": None,
+        "strategy_seed": strategy_cache.seed_for(file_path, java_code) if strategy_cache is not None else None,
+        "refactored_code": None,
+        "precheck_results": None,
+        "compile_results": None,
+        "code_review_results": None,
+        "code_review_times": 0,
+        "msgs": [],
+        "answer": None,
+        "current_file_path": file_path,  # Track current file being processed
+        "explanation_response_raw": None,
+        "explanation_json": None
+    }
+
+    try:
+        # Run the agentic workflow
+        print(Fore.CYAN + "Running agentic workflow..." + Style.RESET_ALL)
+        final_state = langgraph.invoke(initial_state)
+        if strategy_cache is not None:
+            strategy_cache.record(file_path, final_state)
+
+        # Save intermediate results for analysis, one report per copy
+        for path in paths:
+            path_state = final_state if path == file_path else {**final_state, "current_file_path": path}
+            if results_writer is not None:
+                results_writer.submit(path, path_state)
+            else:
+                save_intermediate_results(path, path_state, settings)
+        if deferred_explainer is not None:
+            deferred_explainer.submit(file_path, final_state, duplicates=duplicates)
+
+        # Parse anti-pattern results
+        antipatterns_found, antipatterns_count = parse_antipattern_results(
+            final_state.get('antipatterns_scan_report') or final_state.get('antipatterns_scanner_results')
+        )
+
+        def result_for(path, status):
+            result = {
+                'file_path': path,
+                'status': status,
+                'antipatterns_found': antipatterns_found,
+                'antipatterns_count': antipatterns_count,
+                'code_review_times': final_state.get('code_review_times', 0),
+                'has_intermediate_results': True
+            }
+            if path != file_path:
+                result['duplicate_of'] = file_path
+            return result
+
+        # Check if refactoring was successful (pre-check failures and no-op changes are not applied)
+        if final_state.get('refactored_code') and final_state.get('precheck_results') not in (PRECHECK_FAIL, PRECHECK_NOOP):
+            results = []
+            for path in paths:
                 # Save the refactored code back to the file
-                if save_refactored_code(file_path, final_state['refactored_code']):
-                    processed_files.append({
-                        'file_path': file_path,
-                        'status': 'success',
-                        'antipatterns_found': antipatterns_found,
-                        'antipatterns_count': antipatterns_count,
-                        'code_review_times': final_state.get('code_review_times', 0),
-                        'has_intermediate_results': True
-                    })
-                    print(Fore.GREEN + f"Successfully processed: {file_path}" + Style.RESET_ALL)
+                if not save_refactored_code(path, final_state['refactored_code'], preimages=preimages):
+                    results.append((path, None))
+                    continue
+                file_result = result_for(path, 'success')
+                # Verify the refactor with only the tests that cover this file
+                if test_runner is not None:
+                    file_result['test_results'] = test_runner.run_for_file(path)
+                print(Fore.GREEN + f"Successfully processed: {path}" + Style.RESET_ALL)
+                results.append((path, file_result))
+            return results
+
+        print(Fore.YELLOW + f"No refactored code generated for: {file_path}" + Style.RESET_ALL)
+        return [(path, result_for(path, 'no_refactoring')) for path in paths]
+
+    except Exception as e:
+        print(Fore.RED + f"Error processing {file_path}: {e}" + Style.RESET_ALL)
+        return [(path, None) for path in paths]
+
+
+def process_java_files_with_workflow(file_paths: list, settings, db_manager, prompt_manager, langgraph,
+                                     deferred_explainer=None, journal=None, concurrency: int = 1, preimages=None,
+                                     results_writer=None, duplicates=None, strategy_cache=None):
+    """
+    Process each Java file through the agentic workflow, `concurrency` files at a time.
+    `duplicates` maps a file to its byte-identical copies (see dedup.py), which reuse its result;
+    `strategy_cache` (see clustering.py) lets near-duplicate files reuse a strategy.
+    Each finished file is recorded in `journal` (if given) so an interrupted run can be resumed.
+    """
+    test_runner = TargetedTestRunner() if settings.TARGETED_TESTS_ENABLED else None
+    duplicates = duplicates or {}
+    total = len(file_paths)
+
+    def run_one(indexed_path):
+        index, file_path = indexed_path
+        try:
+            results = process_java_file(
+                index, total, file_path, settings, langgraph, test_runner, deferred_explainer,
+                preimages=preimages, results_writer=results_writer, duplicates=duplicates.get(file_path, ()),
+                strategy_cache=strategy_cache,
+            )
+        finally:
+            if strategy_cache is not None:
+                strategy_cache.done(file_path)  # Members of its cluster wait for this
+        if journal is not None:
+            for path, file_result in results:
+                if file_result is None:
+                    journal.record_failure(path)
                 else:
-                    failed_files.append(file_path)
-            else:
-                # Parse anti-pattern results
-                antipatterns_found, antipatterns_count = parse_antipattern_results(final_state.get('antipatterns_scanner_results'))
-                
-                print(Fore.YELLOW + f"No refactored code generated for: {file_path}" + Style.RESET_ALL)
-                processed_files.append({
-                    'file_path': file_path,
-                    'status': 'no_refactoring',
-                    'antipatterns_found': antipatterns_found,
-                    'antipatterns_count': antipatterns_count,
-                    'code_review_times': final_state.get('code_review_times', 0),
-                    'has_intermediate_results': True
-                })
-                
-        except Exception as e:
-            print(Fore.RED + f"Error processing {file_path}: {e}" + Style.RESET_ALL)
-            failed_files.append(file_path)
-    
-    return processed_files, failed_files
+                    journal.record_result(file_result)
+        return results
 
+    indexed_paths = list(enumerate(file_paths, 1))
+    if concurrency > 1 and total > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = [pair for group in pool.map(run_one, indexed_paths) for pair in group]
+    else:
+        results = [pair for indexed_path in indexed_paths for pair in run_one(indexed_path)]
+
+    processed_files = [result for _, result in results if result is not None]
+    failed_files = [file_path for file_path, result in results if result is None]
+    return processed_files, failed_files
 
-def run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph):
-    """Run the full repository workflow for files with 100% test coverage."""
-    print(Fore.BLUE + "\n=== Full Repository Workflow ===" + Style.RESET_ALL)
-    print("Process Java files with 100% test coverage from JaCoCo results...")
-    
-    # Read JaCoCo results to get files with 100% test coverage
-    print(Fore.CYAN + "\nReading JaCoCo results..." + Style.RESET_ALL)
-    file_paths = read_jacoco_results()
-    
-    if not file_paths:
-        print(Fore.RED + "No files found in JaCoCo results. Please run JaCoCo analysis first." + Style.RESET_ALL)
-        print("Run: python jacoco_tool/jacoco_analysis.py")
-        return False
 
+def _prepare_new_run(settings, file_paths, assume_yes: bool, dry_run: bool):
+    """
+    Pre-screen, confirm and back up a fresh run.
+    Returns (file_paths, skipped_files, backup_info, ok); backup_info is None when the run should
+    stop here, and `ok` says whether that is a success (dry run) or not. When every file passes
+    the pre-screen nothing is backed up (mode "none"), but the run is still journaled and summarised.
+    """
     # Extract repository paths from file paths
     print(Fore.CYAN + "\nIdentifying repositories to backup..." + Style.RESET_ALL)
     repo_paths = get_repository_paths_from_files(file_paths)
     
     if not repo_paths:
         print(Fore.RED + "No repository paths could be identified from the file paths." + Style.RESET_ALL)
-        return False
+        return file_paths, [], None, False
     
     print(f"Found {len(repo_paths)} repositories to backup:")
     for repo_path in sorted(repo_paths):
         repo_name = Path(repo_path).name
         print(f"  • {repo_name} ({repo_path})")
 
+    # Deterministic pre-screen: clearly clean files never reach the LLM agents
+    skipped_files = []
+    if settings.PRESCREEN_ENABLED:
+        print(Fore.CYAN + "\nPre-screening files with static metrics..." + Style.RESET_ALL)
+        file_paths, clean_files = prescreen_files(file_paths, repo_paths)
+        skipped_files = [
+            {
+                'file_path': clean['file_path'],
+                'status': 'skipped_clean',
+                'antipatterns_found': False,
+                'antipatterns_count': 0,
+                'code_review_times': 0,
+                'has_intermediate_results': False
+            }
+            for clean in clean_files
+        ]
+        if not file_paths:
+            print(Fore.GREEN + "All files passed the pre-screen; nothing to refactor or back up." + Style.RESET_ALL)
+            if dry_run:
+                return file_paths, skipped_files, None, True
+            no_backup = {'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"), 'backup_dir': None, 'mode': "none",
+                         'backed_up_repos': [], 'failed_backups': []}
+            return file_paths, skipped_files, no_backup, True
+
     # Ask user for confirmation to proceed with backup and processing
     print(f"\nFiles to process ({len(file_paths)} total):")
-    for i, path in enumerate(file_paths[:5], 1):  # Show first 5 files
+    shown = file_paths if dry_run else file_paths[:5]  # Dry runs list every file
+    for i, path in enumerate(shown, 1):
         print(f"  {i}. {path}")
-    if len(file_paths) > 5:
-        print(f"  ... and {len(file_paths) - 5} more files")
+    if len(file_paths) > len(shown):
+        print(f"  ... and {len(file_paths) - len(shown)} more files")
+
+    if dry_run:
+        print(Fore.YELLOW + "\nDry run: no backups created and no files modified." + Style.RESET_ALL)
+        return file_paths, skipped_files, None, True
     
-    proceed = input(f"\nProceed with backing up {len(repo_paths)} repositories and processing {len(file_paths)} files? (Y/N): ").strip().lower()
-    if proceed != 'y':
+    if not _confirm(f"\nProceed with backing up {len(repo_paths)} repositories and processing {len(file_paths)} files?", assume_yes):
         print("Operation cancelled.")
-        return False
+        return file_paths, skipped_files, None, False
 
     # Create repository backups
     print(Fore.BLUE + f"\n{'='*60}" + Style.RESET_ALL)
     print(Fore.BLUE + "CREATING REPOSITORY BACKUPS" + Style.RESET_ALL)
     print(Fore.BLUE + f"{'='*60}" + Style.RESET_ALL)
     
-    backup_info = create_repository_backup(repo_paths)
+    # Snapshot and git modes only cover the files that will actually be processed
+    backup_info = create_repository_backup(repo_paths, mode=settings.BACKUP_MODE, file_paths=file_paths)
     
     if backup_info['failed_backups']:
         print(Fore.RED + f"\nWarning: {len(backup_info['failed_backups'])} repositories failed to backup:" + Style.RESET_ALL)
         for failed in backup_info['failed_backups']:
             print(Fore.RED + f" {failed['repo_path']}: {failed['error']}" + Style.RESET_ALL)
         
-        continue_anyway = input("\nContinue processing despite backup failures? (Y/N): ").strip().lower()
-        if continue_anyway != 'y':
+        # Headless runs never continue without a complete backup
+        if assume_yes or not _confirm("\nContinue processing despite backup failures?", False):
             print("Operation cancelled due to backup failures.")
-            return False
+            return file_paths, skipped_files, None, False
     
-    print(Fore.GREEN + f"\nSuccessfully backed up {len(backup_info['backed_up_repos'])} repositories" + Style.RESET_ALL)
+    if backup_info.get('mode') != "preimage":
+        print(Fore.GREEN + f"\nSuccessfully backed up {len(backup_info['backed_up_repos'])} repositories" + Style.RESET_ALL)
     print(Fore.GREEN + f"Backup location: {backup_info['backup_dir']}" + Style.RESET_ALL)
+    return file_paths, skipped_files, backup_info, True
+
+
+def run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph, explainer=None,
+                           file_paths=None, assume_yes: bool = False, dry_run: bool = False,
+                           concurrency: int = 1, run_id=None, resume: bool = False,
+                           workers: int = 1, shard_strategy: str = "hash", queue_path=None, trove: str = "chroma"):
+    """
+    Run the full repository workflow for files with 100% test coverage.
+    `explainer` is only used when EXPLAINER_MODE is "deferred".
+
+    Headless runs pass `file_paths` (instead of the interactive JaCoCo menu) and
+    `assume_yes`. Progress is journaled under `run_id`; with `resume=True` the
+    run picks up from that journal, skipping files that already finished.
+
+    With `workers` > 1 or a `queue_path`, files are processed by separate worker
+    processes (each building its own graph from `trove` and the settings' provider);
+    backups, the journal header and the summary stay in this process.
+    """
+    print(Fore.BLUE + "\n=== Full Repository Workflow ===" + Style.RESET_ALL)
+    print("Process Java files with 100% test coverage from JaCoCo results...")
+
+    journal = RunJournal(run_id or new_run_id())
+    previous_results = []
+
+    if queue_path and not dry_run:
+        # Check before any backups: a queue holds one run's tasks and results
+        queue_run_id = WorkQueue(queue_path).run_id()
+        if queue_run_id is not None and queue_run_id != journal.run_id:
+            print(Fore.RED + f"Work queue {queue_path} belongs to run '{queue_run_id}'; use a new --queue path "
+                  f"or --resume {queue_run_id}" + Style.RESET_ALL)
+            return False
+
+    if resume:
+        journal_state = journal.load()
+        if journal_state is None:
+            print(Fore.RED + f"No run journal found for run id '{journal.run_id}' ({journal.path})" + Style.RESET_ALL)
+            return False
+        header = journal_state['header']
+        skipped_files = header['skipped_files']
+        backup_info = header['backup_info']
+        previous_results = [journal_state['results'][path] for path in header['file_paths'] if path in journal_state['results']]
+        file_paths = [path for path in header['file_paths'] if path not in journal_state['results']]
+        print(Fore.GREEN + f"Resuming run {journal.run_id}: {len(previous_results)} files already done, "
+              f"{len(file_paths)} to process ({len(journal_state['failed'])} previously failed)" + Style.RESET_ALL)
+        if dry_run:
+            for i, path in enumerate(file_paths, 1):
+                print(f"  {i}. {path}")
+            print(Fore.YELLOW + "\nDry run: no files modified." + Style.RESET_ALL)
+            return True
+    else:
+        if journal.exists():
+            print(Fore.RED + f"Run id '{journal.run_id}' already has a journal; use --resume to continue it." + Style.RESET_ALL)
+            return False
+
+        # Read JaCoCo results to get files with 100% test coverage
+        if file_paths is None:
+            print(Fore.CYAN + "\nReading JaCoCo results..." + Style.RESET_ALL)
+            file_paths = read_jacoco_results()
+        
+        if not file_paths:
+            print(Fore.RED + "No files found in JaCoCo results. Please run JaCoCo analysis first." + Style.RESET_ALL)
+            print("Run: python jacoco_tool/jacoco_analysis.py")
+            return False
+
+        file_paths, skipped_files, backup_info, ok = _prepare_new_run(settings, file_paths, assume_yes, dry_run)
+        if backup_info is None:
+            return ok
+        journal.start(file_paths, skipped_files, backup_info)
+        print(Fore.CYAN + f"Run id: {journal.run_id} (resume with --resume {journal.run_id})" + Style.RESET_ALL)
 
     # Process each file through the agentic workflow
     print(Fore.BLUE + f"\n{'='*60}" + Style.RESET_ALL)
     print(Fore.BLUE + "STARTING FILE PROCESSING" + Style.RESET_ALL)
     print(Fore.BLUE + f"{'='*60}" + Style.RESET_ALL)
-    
-    processed_files, failed_files = process_java_files_with_workflow(
-        file_paths, settings, db_manager, prompt_manager, langgraph
-    )
+
+    # Byte-identical copies (forks, shaded or generated sources) reuse one file's result
+    duplicates = {}
+    if settings.DEDUP_ENABLED:
+        file_paths, duplicates = dedup_files(file_paths)
+
+    results_db = results_db_for(settings)
+    if results_db is not None:
+        results_db.start_run(journal.run_id, settings)
+
+    stage_records = []
+    if not file_paths:
+        # Every file was skipped (pre-screen) or finished before a resume
+        processed_files, failed_files, explanation_stats, strategy_stats = [], [], None, None
+    elif workers > 1 or queue_path:
+        from workflow.distributed import run_distributed
+        distributed_results = run_distributed(
+            file_paths, settings.LLM_PROVIDER, trove, journal.run_id, workers,
+            concurrency=concurrency, strategy=shard_strategy, queue_path=queue_path, duplicates=duplicates,
+        )
+        processed_files = distributed_results['processed_files']
+        failed_files = distributed_results['failed_files']
+        explanation_stats = distributed_results['explanation_stats']
+        strategy_stats = distributed_results['strategy_stats']
+        stage_records = distributed_results['stage_records']
+        if settings.RESULTS_STORE != "none":
+            consolidate_parts("../processing_results", journal.run_id, settings.RESULTS_STORE)
+    else:
+        results_writer = results_writer_for(settings, journal.run_id)
+        strategy_cache = strategy_cache_for(settings, file_paths)
+        deferred_explainer = (
+            DeferredExplainer(explainer, settings, results_writer=results_writer)
+            if settings.EXPLAINER_MODE == "deferred" and explainer is not None
+            else None
+        )
+        try:
+            processed_files, failed_files = process_java_files_with_workflow(
+                file_paths, settings, db_manager, prompt_manager, langgraph, deferred_explainer,
+                journal=journal, concurrency=concurrency, preimages=preimages_for(settings, journal.run_id),
+                results_writer=results_writer, duplicates=duplicates, strategy_cache=strategy_cache,
+            )
+            # Explanations only feed the reports, so they run once every file has been transformed
+            explanation_stats = deferred_explainer.drain() if deferred_explainer is not None else None
+        finally:
+            # Flush queued reports even if the run is interrupted
+            results_writer.close()
+        strategy_stats = strategy_cache.stats() if strategy_cache is not None else None
+    processed_files = previous_results + processed_files + skipped_files
+
+    # Per-stage timings, LLM latency and token counts
+    stage_summary = None
+    if settings.INSTRUMENTATION_ENABLED:
+        from src.core.utils.instrumentation import instrumentation  # langchain_core; kept off the startup path
+        instrumentation.merge_records(stage_records)  # Worker processes' records, if any
+        stage_summary = export_stage_metrics(instrumentation)
+        stage_records = list(instrumentation.records)
 
     # Create comprehensive processing summary
-    summary_file = create_processing_summary(processed_files, backup_info)
+    summary_file = create_processing_summary(processed_files, backup_info, stage_summary=stage_summary)
+    if results_db is not None:
+        record_run_results(
+            results_db, journal.run_id, processed_files, failed_files,
+            stage_records=stage_records if settings.INSTRUMENTATION_ENABLED else None,
+            summary={'summary_file': summary_file, 'stage_metrics': stage_summary},
+        )
 
     # Generate summary report
     print(Fore.BLUE + "\n" + "="*80 + Style.RESET_ALL)
@@ -238,11 +498,14 @@ def run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph):
     
     # Backup summary
     print(Fore.CYAN + "Repository Backup Summary:" + Style.RESET_ALL)
-    print(f"  Backup timestamp: {backup_info['timestamp']}")
-    print(f"  Backup location: {backup_info['backup_dir']}")
-    print(f"  Repositories backed up: {len(backup_info['backed_up_repos'])}")
-    if backup_info['failed_backups']:
-        print(f"  Failed backups: {len(backup_info['failed_backups'])}")
+    if backup_info.get('mode') == "none":
+        print("  No backup needed: no files were sent for refactoring")
+    else:
+        print(f"  Backup timestamp: {backup_info['timestamp']}")
+        print(f"  Backup location: {backup_info['backup_dir']}")
+        print(f"  Repositories backed up: {len(backup_info['backed_up_repos'])}")
+        if backup_info['failed_backups']:
+            print(f"  Failed backups: {len(backup_info['failed_backups'])}")
     
     # Processing summary
     print(Fore.CYAN + "\nFile Processing Summary:" + Style.RESET_ALL)
@@ -252,19 +515,34 @@ def run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph):
     # Categorize results
     successful_refactoring = [f for f in processed_files if f['status'] == 'success']
     no_refactoring_needed = [f for f in processed_files if f['status'] == 'no_refactoring']
+    skipped_clean = [f for f in processed_files if f['status'] == 'skipped_clean']
     files_with_antipatterns = [f for f in processed_files if f.get('antipatterns_found', False)]
     total_antipatterns = sum(f.get('antipatterns_count', 0) for f in processed_files)
     
     print(Fore.GREEN + f"  Successfully refactored: {len(successful_refactoring)}" + Style.RESET_ALL)
     print(Fore.YELLOW + f"  No refactoring needed: {len(no_refactoring_needed)}" + Style.RESET_ALL)
+    print(Fore.YELLOW + f"  Skipped by pre-screen (clean): {len(skipped_clean)}" + Style.RESET_ALL)
     print(Fore.RED + f"  Failed: {len(failed_files)}" + Style.RESET_ALL)
     print(Fore.MAGENTA + f"  Files with anti-patterns: {len(files_with_antipatterns)}" + Style.RESET_ALL)
     print(Fore.MAGENTA + f"  Total anti-patterns found: {total_antipatterns}" + Style.RESET_ALL)
+
+    tested_files = [f for f in processed_files if f.get('test_results')]
+    if tested_files:
+        tests_passed = sum(1 for f in tested_files if f['test_results']['status'] == 'passed')
+        tests_failed = sum(1 for f in tested_files if f['test_results']['status'] in ('failed', 'timeout', 'error'))
+        test_time = sum(f['test_results']['duration_seconds'] for f in tested_files)
+        print(Fore.CYAN + f"  Targeted tests: {tests_passed} passed, {tests_failed} failed ({test_time:.1f}s)" + Style.RESET_ALL)
+    if explanation_stats:
+        print(Fore.CYAN + f"  Deferred explanations: {explanation_stats['explained']} generated, {explanation_stats['failed']} failed" + Style.RESET_ALL)
+    if strategy_stats and strategy_stats['clustered']:
+        print(Fore.CYAN + f"  Reused strategies: {strategy_stats['reused']} of {strategy_stats['clustered']} "
+              f"near-duplicate files" + Style.RESET_ALL)
     
-    # Statistics
+    # Statistics; rates only count files that went through the agents
     if processed_files:
-        refactor_rate = len(successful_refactoring) / len(processed_files) * 100
-        antipattern_rate = len(files_with_antipatterns) / len(processed_files) * 100
+        rates = processing_rates(processed_files)
+        refactor_rate = rates['refactoring_success_rate']
+        antipattern_rate = rates['antipattern_detection_rate']
 
         
         print(Fore.CYAN + "\nProcessing Statistics:" + Style.RESET_ALL)
@@ -272,6 +550,13 @@ def run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph):
         print(f"  Anti-pattern detection rate: {antipattern_rate:.1f}%")
         print(f"  Total anti-patterns found: {total_antipatterns}")
     
+    if stage_summary and stage_summary['nodes']:
+        print(Fore.CYAN + "\nStage Timings (slowest first):" + Style.RESET_ALL)
+        for node, stats in stage_summary['nodes'].items():
+            print(f"  {node}: {stats['total_s']:.1f}s total, {stats['mean_s']:.2f}s mean over {stats['calls']} calls (LLM {stats['llm_total_s']:.1f}s)")
+        llm_stats = stage_summary['llm']
+        print(f"  LLM calls: {llm_stats['calls']}, tokens: {llm_stats['prompt_tokens']} prompt / {llm_stats['completion_tokens']} completion, retries: {llm_stats['retries']}")
+    
     # Show detailed results
     if successful_refactoring:
         print(Fore.GREEN + "\nSuccessfully refactored files:" + Style.RESET_ALL)
@@ -285,11 +570,15 @@ def run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph):
             print(f"{file_path}")
     
     print(Fore.GREEN + f"\nBatch processing complete!" + Style.RESET_ALL)
-    print(Fore.CYAN + f"Repository backups available at: {backup_info['backup_dir']}" + Style.RESET_ALL)
-    print(f"To restore a repository, copy from backup directory back to original location.")
+    if backup_info.get('mode') != "none":
+        print(Fore.CYAN + f"Repository backups available at: {backup_info['backup_dir']}" + Style.RESET_ALL)
+        restore_target = journal.run_id if backup_info.get('mode') == "preimage" else backup_info['backup_dir']
+        print(f"To restore the original files, run: python main.py --restore {restore_target}")
     
     # Intermediate results information
     print(Fore.MAGENTA + f"\nIntermediate Results:" + Style.RESET_ALL)
     print(f"  Individual file analysis results saved in: ../processing_results/")
     if summary_file:
         print(f"  Comprehensive summary saved: {Path(summary_file).name}")
+
+    return not failed_files
@@ -7,15 +7,19 @@ from config.settings import initialize_settings
 from dotenv import load_dotenv
 load_dotenv()
 from colorama import Fore, Style
+import argparse
+import glob
 import os
+import sys
 from pathlib import Path
 import json
 
-from full_repo_workflow import run_full_repo_workflow
+from full_repo_workflow import run_full_repo_workflow, load_jacoco_file_list
 from workflow.results_manager import save_intermediate_results
+from workflow.deferred_explainer import explain_final_state
 
 
-def run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph):
+def run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph, explainer=None):
     """Run the original workflow with a hardcoded Java code snippet."""
     print(Fore.BLUE + "\n=== Code Snippet Analysis Workflow ===" + Style.RESET_ALL)
     print("Analyzing the provided Java code snippet...")
@@ -63,9 +67,13 @@ def run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph):
         "code": legacy_code,
         "context": None,
         "trove_context": None,
+        "code_signals": None,
         "antipatterns_scanner_results": None,
+        "antipatterns_scan_report": None,
         "refactoring_strategy_results": None,
         "refactored_code": None,
+        "precheck_results": None,
+        "compile_results": None,
         "code_review_results": None,
         "code_review_times": 0,
         "msgs": [],
@@ -76,6 +84,8 @@ def run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph):
     }
 
     final_state = langgraph.invoke(initial_state)
+    if settings.EXPLAINER_MODE == "deferred" and explainer is not None:
+        final_state = explain_final_state(explainer, final_state)
 
     print(Fore.GREEN + f"\nAnalysis Complete!" + Style.RESET_ALL)
     print(f"Final state keys: {list(final_state.keys())}")
@@ -99,10 +109,121 @@ def run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph):
 
 
 
-def main():
-    """Main function: Choose between code snippet analysis or full repository run"""
+DEFAULT_JACOCO_FILE = "../jacoco_results/all_100_percent_coverage_files.txt"
 
-    print(Fore.BLUE + "=== AntiPattern Remediator Tool ===" + Style.RESET_ALL)
+
+def parse_args(argv=None):
+    """Command-line flags; without --mode the tool falls back to the interactive prompts."""
+    parser = argparse.ArgumentParser(
+        description="Detect and refactor Java anti-patterns with the agentic workflow"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["snippet", "repo"],
+        help="Run headless: 'snippet' analyzes the sample snippet, 'repo' processes JaCoCo-covered files"
+    )
+    parser.add_argument(
+        "--provider",
+        choices=["ollama", "ibm", "vllm"],
+        default="ollama",
+        help="LLM provider (default: ollama)"
+    )
+    parser.add_argument(
+        "--trove",
+        choices=["chroma", "tinydb"],
+        default="chroma",
+        help="Anti-pattern trove backend (default: chroma)"
+    )
+    parser.add_argument(
+        "--jacoco-file",
+        action="append",
+        default=[],
+        help="JaCoCo result file listing files to process (repeatable)"
+    )
+    parser.add_argument(
+        "--jacoco-glob",
+        help="Glob of JaCoCo result files, e.g. '../jacoco_results/*_100_percent_coverage.txt'"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Files processed in parallel (default: 1)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes, each with its own graph instance (default: 1)"
+    )
+    parser.add_argument(
+        "--shard-strategy",
+        choices=["hash", "repo"],
+        default="hash",
+        help="How --workers splits the files: by path hash or by repository (default: hash)"
+    )
+    parser.add_argument(
+        "--queue",
+        metavar="DB_PATH",
+        help="SQLite work queue shared by workers, including other nodes on a shared filesystem"
+    )
+    parser.add_argument(
+        "--worker-only",
+        action="store_true",
+        help="Only run --workers processes against --queue (for extra nodes); no backups or summary"
+    )
+    parser.add_argument(
+        "--run-id",
+        help="Id for this run's journal (default: timestamp; --worker-only nodes read it from --queue)"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted repo run, skipping files that already finished"
+    )
+    parser.add_argument(
+        "--restore",
+        metavar="BACKUP_DIR_OR_RUN_ID",
+        help="Roll back a backup directory (../backups/repo_backup_<timestamp>) or, with BACKUP_MODE=preimage, a run id; then exit"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the files that would be processed; no backups, no LLM calls, no writes"
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Answer yes to confirmations (implied by --mode)"
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.worker_only and not args.queue:
+        parser.error("--worker-only requires --queue")
+    if args.worker_only:
+        args.mode = "repo"
+    if args.resume and args.mode not in (None, "repo"):
+        parser.error("--resume only applies to --mode repo")
+    if args.resume:
+        args.mode = "repo"
+    return args
+
+
+def resolve_jacoco_files(args) -> list:
+    """JaCoCo result files named by --jacoco-file/--jacoco-glob, or the combined list by default."""
+    list_files = list(args.jacoco_file)
+    if args.jacoco_glob:
+        list_files.extend(sorted(glob.glob(args.jacoco_glob)))
+    if not list_files and not args.jacoco_glob:
+        list_files = [DEFAULT_JACOCO_FILE]
+    return list_files
+
+
+def prompt_for_choices(args):
+    """Interactive mode, provider and trove selection (used when --mode is not given)."""
     print("Choose your analysis mode:")
     print("1) Code Snippet Analysis - Analyze a sample Java code snippet")
     print("2) Full Repository Run - Process files with 100% test coverage from JaCoCo results")
@@ -113,51 +234,113 @@ def main():
     if mode_choice not in ["1", "2"]:
         print(Fore.RED + "Invalid choice. Defaulting to Code Snippet Analysis." + Style.RESET_ALL)
         mode_choice = "1"
+    args.mode = "snippet" if mode_choice == "1" else "repo"
     
     # Let user select provider
     print("\nAvailable providers: 1) ollama  2) ibm  3) vllm")
     choice = input("Select provider (1-3): ").strip()
 
     provider_map = {"1": "ollama", "2": "ibm", "3": "vllm"}
-    provider = provider_map.get(choice, "ollama")  # default to ollama
+    args.provider = provider_map.get(choice, "ollama")  # default to ollama
 
     # Let us choose which DB to interact with
     print("Choose your trove: 1) ChromaDB (VectorDB) 2) TinyDB (DocumentDB)")
     db_choice = input("Choose 1 or 2: ").strip()
+    args.trove = "tinydb" if db_choice == "2" else "chroma"
+    return args
+
+
+def restore(target: str) -> int:
+    """Roll back a backup directory, or a run id recorded in the pre-image store."""
+    from workflow.backup_manager import BACKUP_INFO_FILE, load_backup_info, restore_repository_backup
+    from workflow.preimage_store import PreimageStore
+
+    if (Path(target) / BACKUP_INFO_FILE).exists():
+        return 1 if restore_repository_backup(load_backup_info(target))['failed'] else 0
+
+    store = PreimageStore()
+    if not store.manifest_path(target).exists():
+        print(Fore.RED + f"'{target}' is neither a backup directory nor a run id with pre-images" + Style.RESET_ALL)
+        return 1
+    results = store.restore_run(target)
+    return 1 if results['failed'] or results['skipped'] else 0
+
+
+def main(argv=None):
+    """Main function: Choose between code snippet analysis or full repository run"""
+    args = parse_args(argv)
+    headless = args.mode is not None
+
+    print(Fore.BLUE + "=== AntiPattern Remediator Tool ===" + Style.RESET_ALL)
+    if args.restore:
+        return restore(args.restore)
+
+    if not headless:
+        prompt_for_choices(args)
+
+    # Headless repo runs read their file list up front so bad paths fail before any model is loaded
+    file_paths = None
+    if args.mode == "repo" and not args.resume and not args.worker_only and (headless or args.jacoco_file or args.jacoco_glob):
+        list_files = resolve_jacoco_files(args)
+        file_paths = load_jacoco_file_list(list_files)
+        if not file_paths:
+            print(Fore.RED + f"No files to process in: {', '.join(list_files) or args.jacoco_glob}" + Style.RESET_ALL)
+            return 1
 
     # Initialize global settings with selected provider
-    settings = initialize_settings(provider)
+    settings = initialize_settings(args.provider)
     print(Fore.GREEN + f"Using {settings.LLM_PROVIDER} with model {settings.LLM_MODEL}" + Style.RESET_ALL)
 
-    # Temporary Lazy Imports
-    from src.core.graph import CreateGraph
-    from src.data.database import VectorDBManager, TinyDBManager
-    from src.core.prompt import PromptManager
-    from scripts import seed_database
-
-    # Initialize PromptManager
-    print("Initializing PromptManager...")
-    prompt_manager = PromptManager()
-
-    # Setup Database
-    if db_choice == "2":
-        print("Seeding TinyDB with AntiPattern Dataset")
-        seed_database.main()
-        db_manager = TinyDBManager()
-        print("Using TinyDB for knowledge retrieval")
-    else:
-        vector_db = VectorDBManager()
-        db_manager = vector_db.get_db()
-        print("Using ChromaDB for knowledge retrieval")
+    if args.worker_only:
+        from workflow.distributed import run_queue_workers
+        try:
+            results = run_queue_workers(args.queue, args.provider, args.trove, args.workers, args.concurrency,
+                                        run_id=args.run_id)
+        except ValueError as e:
+            print(Fore.RED + str(e) + Style.RESET_ALL)
+            return 1
+        return 1 if results['failed_files'] else 0
 
-    retriever = db_manager.as_retriever()
-    langgraph = CreateGraph(db_manager, prompt_manager, retriever=retriever).workflow
+    if args.dry_run and args.mode == "repo":
+        # Only file selection runs; the trove and models are never loaded
+        ok = run_full_repo_workflow(
+            settings, None, None, None, file_paths=file_paths, assume_yes=True,
+            dry_run=True, run_id=args.resume or args.run_id, resume=bool(args.resume),
+        )
+        return 0 if ok else 1
 
-    # Run the selected workflow
-    if mode_choice == "1":
-        run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph)
+    distributed = args.mode == "repo" and (args.workers > 1 or args.queue)
+    if distributed:
+        # Each worker process builds its own trove connection and graph; the trove is seeded once, here
+        db_manager = prompt_manager = langgraph = explainer = None
+        if args.trove == "tinydb":
+            from scripts import seed_database
+            print("Seeding TinyDB with AntiPattern Dataset")
+            seed_database.main()
     else:
-        run_full_repo_workflow(settings, db_manager, prompt_manager, langgraph)
+        from workflow.distributed import build_workflow_components
+        db_manager, prompt_manager, graph = build_workflow_components(args.trove)
+        langgraph = graph.workflow
+        explainer = graph.agents["explainer"]
+
+    # Run the selected workflow
+    if args.mode == "snippet":
+        run_code_snippet_workflow(settings, db_manager, prompt_manager, langgraph, explainer=explainer)
+        return 0
+
+    ok = run_full_repo_workflow(
+        settings, db_manager, prompt_manager, langgraph, explainer=explainer,
+        file_paths=file_paths,
+        assume_yes=headless or args.yes,
+        concurrency=args.concurrency,
+        run_id=args.resume or args.run_id,
+        resume=bool(args.resume),
+        workers=args.workers,
+        shard_strategy=args.shard_strategy,
+        queue_path=args.queue,
+        trove=args.trove,
+    )
+    return 0 if ok else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
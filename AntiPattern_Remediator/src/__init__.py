@@ -5,14 +5,19 @@ An AI-powered tool for analyzing, refactoring, and migrating legacy code
 using advanced language models and vector databases.
 """
 
+from .lazy_module import make_lazy_module
+
 __version__ = "1.0.0"
 __author__ = "Legacy Code Migration Team"
 
-from .core import AgentState
-from .core.graph import CreateGraph
-from .core.llm_models import LLMCreator
-from .core.agents import AntipatternScanner 
-from .data import VectorDBManager
+# Exports are imported on first access so that `import src.<module>` stays cheap
+_EXPORTS = {
+    "AgentState": ".core",
+    "CreateGraph": ".core.graph",
+    "LLMCreator": ".core.llm_models",
+    "AntipatternScanner": ".core.agents",
+    "VectorDBManager": ".data",
+}
 
 __all__ = [
     "AgentState", 
@@ -21,3 +26,6 @@ __all__ = [
     "LLMCreator",
     "AntipatternScanner"
 ]
+
+
+__getattr__, __dir__ = make_lazy_module(__name__, _EXPORTS)
@@ -2,14 +2,20 @@
 Core business logic package
 """
 
-from .state import AgentState
-from .agents import AntipatternScanner
-from .graph import CreateGraph
-from .llm_models import LLMCreator
-from .llm_models.base_provider import BaseLLMProvider
-from .llm_models.ollama_provider import OllamaProvider
-from .llm_models.ibm_provider import IBMProvider
-from .llm_models.vllm_provider import VLLMProvider
+from ..lazy_module import make_lazy_module
+
+# Exports are imported on first access so that `import src.core.<module>` stays cheap
+_EXPORTS = {
+    "AgentState": ".state",
+    "AntipatternScanner": ".agents",
+    "CreateGraph": ".graph",
+    "LLMCreator": ".llm_models",
+    "BaseLLMProvider": ".llm_models.base_provider",
+    "OllamaProvider": ".llm_models.ollama_provider",
+    "IBMProvider": ".llm_models.ibm_provider",
+    "VLLMProvider": ".llm_models.vllm_provider",
+}
+
 __all__ = [
     "AgentState", 
     "AntipatternScanner",
@@ -20,3 +26,6 @@ __all__ = [
     "IBMProvider",
     "VLLMProvider",
 ]
+
+
+__getattr__, __dir__ = make_lazy_module(__name__, _EXPORTS)
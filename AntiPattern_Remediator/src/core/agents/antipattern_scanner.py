@@ -4,30 +4,54 @@ Antipattern scanner agent for detecting code smells and antipatterns
 
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
 
 from ..state import AgentState
 from colorama import Fore, Style
 from ..prompt import PromptManager
-from sonarqube_tool import SonarQubeAPI
+from ..utils import extract_code_signals, build_trove_queries, parse_scan_report
+from src.data.trove_helpers import trove_search_context
 from pathlib import Path
 
+# Repository root, where the sonarqube_tool package lives
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
+
+
+def _sonarqube_api():
+    """Import the SonarQube client only for files that actually need it"""
+    if _REPO_ROOT not in sys.path:
+        sys.path.append(_REPO_ROOT)
+    from sonarqube_tool import SonarQubeAPI
+    return SonarQubeAPI()
+
 
 class AntipatternScanner:
     """Antipattern scanner agent"""
 
-    def __init__(self, tool, model, prompt_manager: PromptManager):
+    def __init__(self, tool, model, prompt_manager: PromptManager, retriever=None, *, structured_model=None, max_queries: int = 4, top_k: int = 6):
         self.prompt_manager = prompt_manager
         self.tool = tool
+        self.retriever = retriever
         self.llm = model
+        # Model constrained to the scan report JSON schema, where the provider supports it
+        self.structured_llm = structured_model or model
+        self.max_queries = max_queries  # targeted Trove queries per file
+        self.top_k = top_k              # Trove chunks kept in the search context
 
     def retrieve_context(self, state: AgentState):
         print("Retrieving context from knowledge base...")
         try:
-            # Create search query based on code snippet
-            search_query = f"Java antipatterns code analysis: {state['code'][:50]}"
-            # Use retriever_tool to get relevant context
-            context = self.tool.invoke({"query": search_query})
+            # Build targeted queries from structural signals of the code
+            signals = extract_code_signals(state['code'])
+            state["code_signals"] = signals
+            queries = build_trove_queries(signals, max_queries=self.max_queries)
+            print(Fore.CYAN + f"Trove queries: {queries}" + Style.RESET_ALL)
+            context = trove_search_context(
+                queries,
+                retriever=self.retriever,
+                retriever_tool=self.tool,
+                cap=self.top_k,
+                per_query=max(1, self.top_k // len(queries)),
+            )
 
             # Get current file path from state
             current_file_path = state['current_file_path']
@@ -47,7 +71,7 @@ class AntipatternScanner:
                         relative_file_path = str(Path(*path_obj.parts[i + 2:]))
                         break
 
-                api = SonarQubeAPI()
+                api = _sonarqube_api()
                 print(Fore.CYAN + f"Using SonarQube project: {project_key}, file: {relative_file_path}" + Style.RESET_ALL)
                 issues = api.get_issues_for_file(project_key=project_key, file_path=relative_file_path)
                 solutions = []
@@ -79,12 +103,20 @@ class AntipatternScanner:
                 msgs=msgs
             )
 
-            response = self.llm.invoke(formatted_messages)
-            state["antipatterns_scanner_results"] = response.content if hasattr(response, 'content') else str(response)
+            response = self.structured_llm.invoke(formatted_messages)
+            raw = response.content if hasattr(response, 'content') else str(response)
+            state["antipatterns_scanner_results"] = raw
+
+            # Parse once; downstream consumers use the typed report
+            report = parse_scan_report(raw)
+            if report is None:
+                print(Fore.YELLOW + "Scanner output did not contain a valid JSON report" + Style.RESET_ALL)
+            state["antipatterns_scan_report"] = report
             print(Fore.GREEN + "Analysis completed successfully" + Style.RESET_ALL)
         except Exception as e:
             print(Fore.RED + f"Error during analysis: {e}" + Style.RESET_ALL)
             state["antipatterns_scanner_results"] = f"Error occurred during analysis: {e}"
+            state["antipatterns_scan_report"] = None
         return state
 
     def display_antipatterns_results(self, state: AgentState):
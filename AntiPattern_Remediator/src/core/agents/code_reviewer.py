@@ -2,15 +2,63 @@ import difflib
 from colorama import Fore, Style
 from ..state import AgentState
 from ..prompt import PromptManager
+from ..utils import run_prechecks, PRECHECK_FAIL, PRECHECK_NOOP
 from langchain_core.messages import HumanMessage
 
 
 class CodeReviewerAgent:
     """Code reviewer agent for managing code review tasks"""
 
-    def __init__(self, model, prompt_manager: PromptManager):
+    def __init__(self, model, prompt_manager: PromptManager, compile_checker=None):
         self.prompt_manager = prompt_manager
         self.llm = model
+        self.compile_checker = compile_checker
+
+    def _fail_round(self, state: AgentState, source: str, reason: str) -> None:
+        """Record a deterministic failure as a review round so the loop stays bounded"""
+        times = state.get("code_review_times", 0) + 1
+        state["precheck_results"] = PRECHECK_FAIL
+        state["code_review_results"] = f"fail\n{source}: {reason}"
+        msgs = state.get('msgs', [])
+        msgs.append(HumanMessage(content=f"Code Review Feedback (Round {times}, {source.lower()}): {reason}"))
+        state["msgs"] = msgs
+        state["code_review_times"] = times
+
+    def precheck_code(self, state: AgentState) -> AgentState:
+        """Run deterministic checks so broken or unchanged output skips the reviewer LLM"""
+        print("Running deterministic pre-checks...")
+        result = run_prechecks(state.get('code', ''), state.get('refactored_code'))
+        state["precheck_results"] = result["decision"]
+
+        if result["decision"] == PRECHECK_FAIL:
+            print(Fore.RED + f"Pre-check failed: {result['reason']}" + Style.RESET_ALL)
+            self._fail_round(state, "Automated pre-check", result["reason"])
+        elif result["decision"] == PRECHECK_NOOP:
+            print(Fore.YELLOW + f"Pre-check: {result['reason']}" + Style.RESET_ALL)
+            state["code_review_results"] = f"pass\nAutomated pre-check: {result['reason']}"
+        else:
+            print(Fore.GREEN + f"Pre-check: {result['reason']}" + Style.RESET_ALL)
+        return state
+
+    def compile_check(self, state: AgentState) -> AgentState:
+        """Compile the changed file against its module; compiler errors go back as review feedback"""
+        file_path = state.get("current_file_path")
+        if self.compile_checker is None or not file_path:
+            state["compile_results"] = "skipped"
+            return state
+
+        print("Compiling refactored code against the module classpath...")
+        result = self.compile_checker.compile_source(file_path, state.get("refactored_code", ""))
+        state["compile_results"] = result["status"]
+
+        if result["status"] == "error":
+            print(Fore.RED + "Compilation failed" + Style.RESET_ALL)
+            self._fail_round(state, "Compilation check", f"The refactored code does not compile:\n{result['output']}")
+        elif result["status"] == "ok":
+            print(Fore.GREEN + "Compilation succeeded" + Style.RESET_ALL)
+        else:
+            print(Fore.YELLOW + f"Compilation check skipped: {result['output']}" + Style.RESET_ALL)
+        return state
 
     def review_code(self, state: AgentState) -> AgentState:
         print("Reviewing code...")
@@ -4,15 +4,25 @@ Agent responsible for refactoring code based on analysis.
 from ..state import AgentState
 from colorama import Fore, Style
 from ..prompt import PromptManager
+from ..utils import (
+    bounded_history, revision_message, REVISION_STRATEGY,
+    parse_search_replace_blocks, apply_search_replace,
+)
 import re
 
+# Placeholders transform_code writes instead of code; never revise these
+_FAILED_ATTEMPT_PREFIXES = ("Error during transformation", "Error: No valid response", "Transformation skipped")
+
 
 class CodeTransformer:
     """Code Transformer Agent"""
 
-    def __init__(self, model, prompt_manager: PromptManager):
+    def __init__(self, model, prompt_manager: PromptManager,
+                 history_keep_last: int = 1, output_mode: str = "full"):
         self.llm = model
         self.prompt_manager = prompt_manager
+        self.history_keep_last = history_keep_last  # review rounds sent verbatim; older ones are summarised
+        self.output_mode = output_mode  # "full" file or "patch" (search/replace edits applied locally)
     
     def extract_java(s: str) -> str:
         
@@ -54,22 +64,22 @@ class CodeTransformer:
             if msgs != []:
                 print(f"{len(msgs)} Code Review messages received, proceeding with transformation.")
 
-            prompt_template = self.prompt_manager.get_prompt(self.prompt_manager.CODE_TRANSFORMER)
+            # Later rounds revise the previous attempt against the review feedback; the attempt
+            # already applies the strategy, so neither the strategy nor the original is resent
+            previous_attempt = state.get("refactored_code")
+            revising = state.get("code_review_times", 0) > 0 and bool(previous_attempt) \
+                and not previous_attempt.startswith(_FAILED_ATTEMPT_PREFIXES)
+            history = bounded_history(msgs, keep_last=self.history_keep_last)
+            if revising:
+                history.append(revision_message())
 
-            formatted_messages = prompt_template.format_messages(
-                strategy=strategy,
-                code=original_code,
-                msgs=msgs
-            )
-            
-            response = self.llm.invoke(formatted_messages)
-            if response.content is None or response.content == "":
-                print(Fore.RED + "Error: No valid response received from LLM." + Style.RESET_ALL)
-                print(formatted_messages)
-                state["refactored_code"] = "Error: No valid response received from LLM."
-                raise ValueError("No valid response received from LLM.")
-            refactored_code = response.content.strip()
-            refactored_code = CodeTransformer.extract_java(refactored_code)
+            base_code = previous_attempt if revising else original_code
+            prompt_strategy = REVISION_STRATEGY if revising else strategy
+            refactored_code = None
+            if self.output_mode == "patch":
+                refactored_code = self._generate_patch(prompt_strategy, base_code, history)
+            if refactored_code is None:
+                refactored_code = self._generate_full(prompt_strategy, base_code, history)
 
             print(Fore.GREEN + "Code transformation complete." + Style.RESET_ALL)
             state["refactored_code"] = refactored_code
@@ -80,6 +90,58 @@ class CodeTransformer:
             
         return state
 
+    def _generate_full(self, strategy, code: str, history: list) -> str:
+        """Ask for the complete refactored file."""
+        prompt_template = self.prompt_manager.get_prompt(self.prompt_manager.CODE_TRANSFORMER)
+
+        formatted_messages = prompt_template.format_messages(
+            strategy=strategy,
+            code=code,
+            msgs=history
+        )
+
+        content = self.llm.invoke(formatted_messages).content
+        if content is None or content == "":
+            print(Fore.RED + "Error: No valid response received from LLM." + Style.RESET_ALL)
+            print(formatted_messages)
+            raise ValueError("No valid response received from LLM.")
+        return CodeTransformer.extract_java(content.strip())
+
+    def _generate_patch(self, strategy, code: str, history: list):
+        """
+        Ask for search/replace edits and apply them to `code`.
+        Returns None when the edits cannot be applied cleanly, so the caller
+        falls back to requesting the full file.
+        """
+        prompt_template = self.prompt_manager.get_prompt(self.prompt_manager.CODE_TRANSFORMER_PATCH)
+        if prompt_template is None:
+            return None
+
+        formatted_messages = prompt_template.format_messages(
+            strategy=strategy,
+            code=code,
+            msgs=history
+        )
+        content = (self.llm.invoke(formatted_messages).content or "").strip()
+        if not content:
+            return None
+
+        blocks = parse_search_replace_blocks(content)
+        if not blocks:
+            # The model ignored the edit format and returned the whole file
+            print(Fore.YELLOW + "No edit blocks in patch response; using it as the full file." + Style.RESET_ALL)
+            return CodeTransformer.extract_java(content)
+
+        patched, errors = apply_search_replace(code, blocks)
+        if errors:
+            print(Fore.YELLOW + f"{len(errors)} of {len(blocks)} edit(s) did not apply; requesting the full file." + Style.RESET_ALL)
+            for error in errors:
+                print(Fore.YELLOW + f"  {error}" + Style.RESET_ALL)
+            return None
+
+        print(Fore.GREEN + f"Applied {len(blocks)} edit(s) locally." + Style.RESET_ALL)
+        return patched
+
     def display_transformed_code(self, state: AgentState) -> AgentState:
         """
         Displays the refactored code.
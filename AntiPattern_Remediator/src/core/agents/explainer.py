@@ -12,14 +12,16 @@ from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.prompts import PromptTemplate
 from ..prompt import PromptManager
 from src.core.utils import extract_first_json
+from src.core.utils.streaming import stream_until_complete
 
 PROMPT_KEY = "explainer"
 
 
 class ExplainerAgent:
-    def __init__(self, llm: BaseLanguageModel, prompt_manager: PromptManager):
+    def __init__(self, llm: BaseLanguageModel, prompt_manager: PromptManager, streaming: bool = False):
         self.llm = llm
         self.prompt_manager = prompt_manager
+        self.streaming = streaming  # stop generation once the first JSON object is complete
 
     # Merge helper: return a FULL state but drop keys we must not rewrite.
     @staticmethod
@@ -41,15 +43,21 @@ class ExplainerAgent:
             refactored_code=state.get("refactored_code", ""),
             refactoring_strategy=state.get("refactoring_strategy_results", ""),
             antipattern_name=state.get("antipatterns_scanner_results", "Unknown antipattern"),
-            antipatterns_json=json.dumps(state.get("antipatterns_json", []), ensure_ascii=False),
+            antipatterns_json=json.dumps(
+                (state.get("antipatterns_scan_report") or {}).get("antipatterns_detected", []),
+                ensure_ascii=False,
+            ),
             msgs=state.get("msgs", []),
         )
 
         messages = self._build_messages(**kwargs)
 
         try:
-            response = self.llm.invoke(messages)
-            raw = getattr(response, "content", None) or str(response)
+            if self.streaming:
+                raw = stream_until_complete(self.llm, messages)
+            else:
+                response = self.llm.invoke(messages)
+                raw = getattr(response, "content", None) or str(response)
         except Exception as e:
             raw = f"LLM error: {e}"
 
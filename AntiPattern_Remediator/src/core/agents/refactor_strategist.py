@@ -1,7 +1,9 @@
+import json
 from typing import List, Any, Callable, cast, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from ..state import AgentState
 from ..prompt import PromptManager
+from ..utils import bounded_history, finding_names
 from colorama import Fore, Style
 
 
@@ -12,6 +14,7 @@ class RefactorStrategist:
     - Retrieves context from the Trove (TinyDB/Chroma) via a unified `invoke`-style callable
     - Feeds `code`, `context` (scanner findings), and `trove_context` into the prompt
     - Writes the final strategy to `state["refactoring_strategy_results"]`
+    - Reuses a near-duplicate file's strategy (`state["strategy_seed"]`) when the findings match
     """
 
     def __init__(
@@ -50,6 +53,10 @@ class RefactorStrategist:
             return []
         queries: List[str] = []
 
+        # A parsed scan report carries its findings under 'antipatterns_detected'
+        if isinstance(findings, dict):
+            findings = findings.get("antipatterns_detected", [])
+
         # findings may be a list[dict]/list[str] or a str (JSON text)
         if isinstance(findings, list):
             for f in findings:
@@ -101,6 +108,14 @@ class RefactorStrategist:
     # -------------------------------------------------------------------------
     def strategize_refactoring(self, state: AgentState):
         print("Strategizing refactoring options...")
+        seed = state.get("strategy_seed")
+        if seed:
+            if seed.get("antipatterns") == finding_names(state.get("antipatterns_scan_report")):
+                print(Fore.GREEN + f"Reusing the refactoring strategy of similar file {seed.get('source')}" + Style.RESET_ALL)
+                state["trove_context"] = seed.get("trove_context") or ""
+                state["refactoring_strategy_results"] = seed["strategy"]
+                return state
+            state["strategy_seed"] = None  # Different findings: strategize from scratch
         try:
             tmpl = cast(
                 ChatPromptTemplate,
@@ -109,11 +124,16 @@ class RefactorStrategist:
             if tmpl is None:
                 raise RuntimeError("Prompt 'refactor_strategist' not found or not loaded")
 
-            findings = state.get("antipatterns_scanner_results")
+            report = state.get("antipatterns_scan_report")
+            findings = (
+                json.dumps(report, indent=2, ensure_ascii=False)
+                if report is not None
+                else state.get("antipatterns_scanner_results")
+            )
             code = state.get("code", "")
 
             # Trove evidence
-            queries = self._build_queries_from_findings(findings)
+            queries = self._build_queries_from_findings(report if report is not None else findings)
             trove_ctx = self._gather_trove_context(queries) if queries else ""
 
             # Stash for later nodes / display
@@ -124,7 +144,7 @@ class RefactorStrategist:
                 code=code,
                 context=findings,
                 trove_context=trove_ctx,
-                msgs=state.get("msgs", []),  # keep if PromptManager includes MessagesPlaceholder("msgs")
+                msgs=bounded_history(state.get("msgs", [])),  # latest review verbatim, earlier rounds summarised
             )
 
             response = self.llm.invoke(messages)
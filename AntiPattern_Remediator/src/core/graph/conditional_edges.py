@@ -1,16 +1,38 @@
 import re
 from colorama import Fore, Style
+from ..utils import PRECHECK_FAIL, PRECHECK_NOOP
+
+# Transform/review rounds allowed before the loop defaults to pass
+MAX_REVIEW_TIMES = 2
+
 
 class ConditionalEdges:
     def __init__(self):
         pass
 
+    def precheck_condition(self, state):
+        """
+        Route after the deterministic pre-checks: failures go straight back to the
+        transformer, no-op changes skip review, everything else goes to the reviewer.
+        """
+        decision = state.get("precheck_results")
+        if decision == PRECHECK_FAIL:
+            if state["code_review_times"] > MAX_REVIEW_TIMES:
+                print(Fore.RED + "Pre-checks still failing after the last round, stopping without applying changes" + Style.RESET_ALL)
+                return "pass"
+            print(Fore.RED + "Decision: pre-check -> code_transformer" + Style.RESET_ALL)
+            return "transform_code"
+        if decision == PRECHECK_NOOP:
+            print(Fore.YELLOW + "Decision: no changes to review" + Style.RESET_ALL)
+            return "pass"
+        return "review_code"
+
     def code_review_condition(self, state):
         """
         Determine the next step based on code review results.
         Uses regex to match the first line decision with flexibility.
         """
-        if state["code_review_times"] > 2:
+        if state["code_review_times"] > MAX_REVIEW_TIMES:
             print(Fore.GREEN + "Code has been reviewed twice, defaulting to pass" + Style.RESET_ALL)
             return "pass"
         review_results = state.get("code_review_results", "")
@@ -2,6 +2,8 @@
 Enhanced workflow management using LangGraph
 """
 
+import json
+
 from langgraph.graph import StateGraph, END
 from langchain.tools.retriever import create_retriever_tool
 
@@ -10,16 +12,15 @@ from src.core.prompt.prompt_manager import PromptManager
 from .conditional_edges import ConditionalEdges
 from ..llm_models import LLMCreator
 from ..state import AgentState
+from ..utils import SCAN_REPORT_SCHEMA, JavaCompileChecker
+from ..utils.instrumentation import instrumentation
 from ..agents import AntipatternScanner
 from ..agents import RefactorStrategist
 from ..agents import CodeTransformer
 from ..agents import CodeReviewerAgent
 from ..agents import ExplainerAgent
 
-# Imports for LangSmith tracing
 import os
-from langsmith import Client
-from langchain.callbacks.tracers import LangChainTracer
 
 from colorama import Fore, Style
 
@@ -28,17 +29,18 @@ class CreateGraph:
     """Graph"""
 
     def __init__(self, db_manager, prompt_manager: PromptManager, retriever=None, llm_model=None):
-        # LLM init
-        llm_model = llm_model or settings.LLM_MODEL
-        self.llm = LLMCreator.create_llm(
-            provider=settings.LLM_PROVIDER,
-            model_name=settings.LLM_MODEL,
-            **getattr(settings, "parameters", {})
-        )
+        # LLM init: the default model, plus one per distinct per-agent override
+        self.llm_model = llm_model or settings.LLM_MODEL
+        self._llm_cache = {}
+        self._callbacks = []  # Attached to every LLM created below
 
         # LangSmith integration (optional)
         if settings.LLM_PROVIDER in ["ollama", "vllm"] and settings.LANGSMITH_ENABLED:
             try:
+                # Imported only when tracing is enabled; langsmith is slow to import
+                from langsmith import Client
+                from langchain.callbacks.tracers import LangChainTracer
+
                 os.environ["LANGCHAIN_TRACING_V2"] = "true"
                 client = Client(
                     api_url=settings.LANGSMITH_ENDPOINT,
@@ -48,7 +50,7 @@ class CreateGraph:
                     project_name=settings.LANGSMITH_PROJECT,
                     client=client
                 )
-                self.llm.callbacks = [tracer]
+                self._callbacks = [tracer]
                 print(
                     Fore.GREEN
                     + f"LangSmith tracing enabled for project: {settings.LANGSMITH_PROJECT} | provider - {settings.LLM_PROVIDER}"
@@ -56,7 +58,14 @@ class CreateGraph:
                 )
             except Exception as e:
                 print(Fore.RED + f"Error initializing LangSmith: {e}" + Style.RESET_ALL)
-                self.llm.callbacks = []
+                self._callbacks = []
+
+        # Per-stage timing and token instrumentation
+        self.instrumentation = instrumentation if settings.INSTRUMENTATION_ENABLED else None
+        if self.instrumentation is not None:
+            self._callbacks.append(self.instrumentation.callback)
+
+        self.llm = self.llm_for(None)
 
         # Trove plumbing
         self.db_manager = db_manager
@@ -65,6 +74,8 @@ class CreateGraph:
 
         # Assign the instance attribute before use
         self.retriever = retriever or self.db_manager.as_retriever()
+        if self.instrumentation is not None:
+            self.retriever = self.instrumentation.wrap_retriever(self.retriever)
 
         retriever_tool = create_retriever_tool(
             self.retriever,
@@ -72,42 +83,94 @@ class CreateGraph:
             description="Search the Anti-Pattern Trove (Chroma/TinyDB) for Java anti-pattern definitions, symptoms, and refactoring guidance.",
         )
 
+        # Scanner output constrained to the scan report schema (Ollama `format`, vLLM guided decoding)
+        scanner_llm = self.llm_for("scanner")
+        structured_llm = (
+            LLMCreator.bind_json_schema(self._agent_config("scanner")["provider"], scanner_llm, SCAN_REPORT_SCHEMA)
+            if settings.STRUCTURED_OUTPUT
+            else None
+        )
+
         # Agents
         self.agents = {
-            "scanner": AntipatternScanner(retriever_tool, self.llm, self.prompt_manager),
-            "strategist": RefactorStrategist(self.llm, self.prompt_manager, retriever=self.retriever),
-            "transformer": CodeTransformer(self.llm, self.prompt_manager),
-            "reviewer": CodeReviewerAgent(self.llm, self.prompt_manager),
-            "explainer": ExplainerAgent(self.llm, self.prompt_manager),
+            "scanner": AntipatternScanner(
+                retriever_tool, scanner_llm, self.prompt_manager,
+                retriever=self.retriever, structured_model=structured_llm,
+            ),
+            "strategist": RefactorStrategist(self.llm_for("strategist"), self.prompt_manager, retriever=self.retriever),
+            "transformer": CodeTransformer(
+                self.llm_for("transformer"), self.prompt_manager,
+                output_mode=settings.TRANSFORMER_OUTPUT_MODE,
+            ),
+            "reviewer": CodeReviewerAgent(
+                self.llm_for("reviewer"), self.prompt_manager,
+                compile_checker=JavaCompileChecker() if settings.COMPILE_CHECK_ENABLED else None,
+            ),
+            "explainer": ExplainerAgent(self.llm_for("explainer"), self.prompt_manager, streaming=settings.STREAMING_ENABLED),
         }
 
         # Build the LangGraph workflow
         self.workflow = self._build_graph()
 
+    def _agent_config(self, agent):
+        return settings.agent_llm_config(agent, default_model=self.llm_model)
+
+    def llm_for(self, agent=None):
+        """
+        LLM for an agent (None = the default), honouring per-agent overrides in
+        provider_settings.json. Agents with identical configurations share one instance.
+        """
+        config = self._agent_config(agent)
+        key = json.dumps(config, sort_keys=True, default=str)
+        if key not in self._llm_cache:
+            llm = LLMCreator.create_llm(
+                provider=config["provider"],
+                model_name=config["model"],
+                limits=config["limits"],
+                endpoints=config["endpoints"],
+                **config["parameters"]
+            )
+            llm.callbacks = list(llm.callbacks or []) + self._callbacks
+            self._llm_cache[key] = llm
+            if agent is not None:
+                print(Fore.CYAN + f"Agent '{agent}' uses {config['provider']} model {config['model']}" + Style.RESET_ALL)
+        return self._llm_cache[key]
+
+    def _add_node(self, graph, name, fn):
+        """Add a node, timing it when instrumentation is enabled."""
+        if self.instrumentation is not None:
+            fn = self.instrumentation.wrap_node(name, fn)
+        graph.add_node(name, fn)
+
     def _build_graph(self):
         """Build LangGraph workflow and return the compiled graph."""
         graph = StateGraph(AgentState)
 
         # Scanner: retrieve + analyze
-        graph.add_node("retrieve_context", self.agents["scanner"].retrieve_context)
-        graph.add_node("analyze_antipatterns", self.agents["scanner"].analyze_antipatterns)
-        graph.add_node("display_antipatterns_results", self.agents["scanner"].display_antipatterns_results)
+        self._add_node(graph, "retrieve_context", self.agents["scanner"].retrieve_context)
+        self._add_node(graph, "analyze_antipatterns", self.agents["scanner"].analyze_antipatterns)
+        self._add_node(graph, "display_antipatterns_results", self.agents["scanner"].display_antipatterns_results)
 
         # Strategist: plan using trove context
-        graph.add_node("strategize_refactoring", self.agents["strategist"].strategize_refactoring)
-        graph.add_node("display_refactoring_results", self.agents["strategist"].display_refactoring_results)
+        self._add_node(graph, "strategize_refactoring", self.agents["strategist"].strategize_refactoring)
+        self._add_node(graph, "display_refactoring_results", self.agents["strategist"].display_refactoring_results)
 
         # Transformer: apply changes
-        graph.add_node("transform_code", self.agents["transformer"].transform_code)
-        graph.add_node("display_transformed_code", self.agents["transformer"].display_transformed_code)
-
-        # Reviewer: code review + conditional loop-back
-        graph.add_node("review_code", self.agents["reviewer"].review_code)
-        graph.add_node("display_code_review_results", self.agents["reviewer"].display_code_review_results)
-
-        # Explainer: final storytelling
-        graph.add_node("explain_antipattern", self.agents["explainer"].explain_antipattern)
-        graph.add_node("display_explanation", self.agents["explainer"].display_explanation)
+        self._add_node(graph, "transform_code", self.agents["transformer"].transform_code)
+        self._add_node(graph, "display_transformed_code", self.agents["transformer"].display_transformed_code)
+
+        # Reviewer: deterministic pre-checks, code review + conditional loop-back
+        self._add_node(graph, "precheck_code", self.agents["reviewer"].precheck_code)
+        if settings.COMPILE_CHECK_ENABLED:
+            self._add_node(graph, "compile_check", self.agents["reviewer"].compile_check)
+        self._add_node(graph, "review_code", self.agents["reviewer"].review_code)
+        self._add_node(graph, "display_code_review_results", self.agents["reviewer"].display_code_review_results)
+
+        # Explainer: final storytelling (deferred/skip modes keep it off the critical path)
+        explain_inline = settings.EXPLAINER_MODE == "inline"
+        if explain_inline:
+            self._add_node(graph, "explain_antipattern", self.agents["explainer"].explain_antipattern)
+            self._add_node(graph, "display_explanation", self.agents["explainer"].display_explanation)
 
         # Topology
         graph.set_entry_point("retrieve_context")
@@ -117,7 +180,31 @@ class CreateGraph:
         graph.add_edge("strategize_refactoring", "display_refactoring_results")
         graph.add_edge("display_refactoring_results", "transform_code")
         graph.add_edge("transform_code", "display_transformed_code")
-        graph.add_edge("display_transformed_code", "review_code")
+        graph.add_edge("display_transformed_code", "precheck_code")
+
+        # Conditional: pre-check failures loop straight back, no-op changes skip the reviewer LLM
+        review_entry = "compile_check" if settings.COMPILE_CHECK_ENABLED else "review_code"
+        graph.add_conditional_edges(
+            "precheck_code",
+            self.conditional_edges.precheck_condition,
+            {
+                "transform_code": "transform_code",
+                "review_code": review_entry,
+                "pass": "display_code_review_results",
+            },
+        )
+
+        # Optional compile check: compiler errors loop back like pre-check failures
+        if settings.COMPILE_CHECK_ENABLED:
+            graph.add_conditional_edges(
+                "compile_check",
+                self.conditional_edges.precheck_condition,
+                {
+                    "transform_code": "transform_code",
+                    "review_code": "review_code",
+                    "pass": "display_code_review_results",
+                },
+            )
 
         # Conditional: either loop back to transform_code or proceed to display_code_review_results
         graph.add_conditional_edges(
@@ -130,9 +217,12 @@ class CreateGraph:
         )
 
         # Only reach explainer after the "pass" path completes
-        graph.add_edge("display_code_review_results", "explain_antipattern")
-        graph.add_edge("explain_antipattern", "display_explanation")
-        graph.add_edge("display_explanation", END)
+        if explain_inline:
+            graph.add_edge("display_code_review_results", "explain_antipattern")
+            graph.add_edge("explain_antipattern", "display_explanation")
+            graph.add_edge("display_explanation", END)
+        else:
+            graph.add_edge("display_code_review_results", END)
 
         # Compile and return
         compiled = graph.compile()
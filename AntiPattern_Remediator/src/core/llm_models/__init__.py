@@ -10,6 +10,8 @@ from .base_provider import BaseLLMProvider
 from .ollama_provider import OllamaProvider
 from .ibm_provider import IBMProvider
 from .vllm_provider import VLLMProvider
+from .rate_limiter import ProviderLimiter, RateLimitedLLM
+from .endpoint_pool import EndpointPool, LoadBalancedLLM
 
 __all__ = [
     "LLMCreator",
@@ -18,4 +20,8 @@ __all__ = [
     "OllamaProvider",
     "IBMProvider",
     "VLLMProvider",
+    "ProviderLimiter",
+    "RateLimitedLLM",
+    "EndpointPool",
+    "LoadBalancedLLM",
 ]
\ No newline at end of file
@@ -14,6 +14,10 @@ class BaseLLMProvider(ABC):
         """Create and return an embedding model instance"""
         pass
     
+    def bind_json_schema(self, llm: Any, schema: dict) -> Any:
+        """Return the LLM constrained to JSON matching `schema`, if the provider supports it"""
+        return llm
+
     @abstractmethod
     def get_provider_name(self) -> str:
         """Return the name of the provider"""
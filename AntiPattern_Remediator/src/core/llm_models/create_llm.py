@@ -3,6 +3,7 @@ from .base_provider import BaseLLMProvider
 from .ollama_provider import OllamaProvider
 from .ibm_provider import IBMProvider
 from .vllm_provider import VLLMProvider
+from .rate_limiter import RateLimitedLLM, get_provider_limiter
 
 class LLMCreator:
     _providers: Dict[str, Type[BaseLLMProvider]] = {
@@ -12,12 +13,28 @@ class LLMCreator:
     }
     
     @staticmethod
-    def create_llm(provider: str, model_name: str, **kwargs):
+    def create_llm(provider: str, model_name: str, limits: dict = None, endpoints: list = None, **kwargs):
+        """
+        Create an LLM; with `limits`, calls are gated by the provider's shared limiter,
+        and with several `endpoints` (vLLM/Ollama) they are load balanced across them
+        """
         provider_lower = provider.lower()
         if provider_lower not in LLMCreator._providers:
             raise ValueError(f"Unsupported provider: {provider}")
         provider_instance = LLMCreator._providers[provider_lower]()
-        return provider_instance.create_llm(model_name, **kwargs)
+        if endpoints:
+            kwargs["endpoints"] = endpoints
+        llm = provider_instance.create_llm(model_name, **kwargs)
+        limiter = get_provider_limiter(provider_lower, limits)
+        return RateLimitedLLM(llm, limiter) if limiter is not None else llm
+    
+    @staticmethod
+    def bind_json_schema(provider: str, llm, schema: dict):
+        provider_lower = provider.lower()
+        if provider_lower not in LLMCreator._providers:
+            raise ValueError(f"Unsupported provider: {provider}")
+        provider_instance = LLMCreator._providers[provider_lower]()
+        return provider_instance.bind_json_schema(llm, schema)
     
     @staticmethod
     def get_supported_providers() -> list:
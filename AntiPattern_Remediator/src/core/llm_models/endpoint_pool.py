@@ -0,0 +1,196 @@
+"""
+Load balancing across several inference servers (vLLM replicas, Ollama hosts).
+
+Providers build one client per endpoint and wrap them in `LoadBalancedLLM`,
+which looks like a single chat model to the graph. Each call goes to the
+healthy endpoint with the fewest outstanding requests; a connection failure
+marks the endpoint down and the call fails over to the next one. Endpoints
+that are down are probed again (HTTP health check) after `check_interval`.
+"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+CHECK_INTERVAL = 30.0  # Seconds before an endpoint marked down is probed again
+HEALTH_TIMEOUT = 2.0
+
+_FAILURE_NAME_HINTS = ("Connect", "Timeout", "ServiceUnavailable", "InternalServerError")
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """True for errors that mean the server is unreachable or unhealthy, rather than a bad request."""
+    if isinstance(error, (ConnectionError, TimeoutError, urllib.error.URLError)):
+        return True
+    return any(hint in type(error).__name__ for hint in _FAILURE_NAME_HINTS)
+
+
+def check_health(url: str, timeout: float = HEALTH_TIMEOUT) -> bool:
+    """GET the health URL; any 2xx response counts as healthy."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return 200 <= response.status < 300
+    except Exception:
+        return False
+
+
+class EndpointPool:
+    """Health and outstanding-request bookkeeping for a set of endpoints"""
+
+    def __init__(self, endpoints: List[str], health_url: Callable[[str], str],
+                 check_interval: float = CHECK_INTERVAL, health_check=check_health):
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self.health_url = health_url
+        self.check_interval = check_interval
+        self._health_check = health_check
+        self._outstanding = {url: 0 for url in self.endpoints}
+        self._down_until: Dict[str, float] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _probe_due(self, exclude) -> None:
+        """Health-check endpoints whose down period has expired (outside the lock)."""
+        now = time.monotonic()
+        with self._lock:
+            due = [url for url, until in self._down_until.items() if until <= now and url not in exclude]
+        for url in due:
+            if self._health_check(self.health_url(url)):
+                with self._lock:
+                    self._down_until.pop(url, None)
+            else:
+                self.mark_down(url)
+
+    def acquire(self, exclude=()) -> Optional[str]:
+        """Reserve the healthy endpoint with the fewest outstanding requests (round-robin on ties)."""
+        self._probe_due(exclude)
+        with self._lock:
+            n = len(self.endpoints)
+            candidates = [
+                (self._outstanding[url], (i - self._next) % n, url)
+                for i, url in enumerate(self.endpoints)
+                if url not in self._down_until and url not in exclude
+            ]
+            if not candidates:
+                return None
+            _, _, url = min(candidates)
+            self._outstanding[url] += 1
+            self._next = (self.endpoints.index(url) + 1) % n
+            return url
+
+    def release(self, url: str) -> None:
+        with self._lock:
+            self._outstanding[url] -= 1
+
+    def mark_down(self, url: str) -> None:
+        with self._lock:
+            self._down_until[url] = time.monotonic() + self.check_interval
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                url: {"healthy": url not in self._down_until, "outstanding": self._outstanding[url]}
+                for url in self.endpoints
+            }
+
+
+class LoadBalancedLLM:
+    """Single chat-model facade over one client per endpoint"""
+
+    def __init__(self, clients: Dict[str, Any], pool: EndpointPool):
+        object.__setattr__(self, "_clients", clients)
+        object.__setattr__(self, "_pool", pool)
+
+    @classmethod
+    def from_endpoints(cls, endpoints: List[str], client_factory: Callable[[str], Any],
+                       health_url: Callable[[str], str], **pool_kwargs) -> "LoadBalancedLLM":
+        return cls({url: client_factory(url) for url in endpoints}, EndpointPool(endpoints, health_url, **pool_kwargs))
+
+    @property
+    def pool(self) -> EndpointPool:
+        return self._pool
+
+    def _acquire(self, tried):
+        url = self._pool.acquire(exclude=tried)
+        if url is None:
+            raise ConnectionError(f"No healthy endpoints available (tried {len(tried)} of {len(self._clients)})")
+        return url
+
+    def invoke(self, input, *args, **kwargs):
+        tried = set()
+        while True:
+            url = self._acquire(tried)
+            try:
+                return self._clients[url].invoke(input, *args, **kwargs)
+            except Exception as e:
+                if not is_endpoint_failure(e):
+                    raise
+                self._pool.mark_down(url)
+                tried.add(url)
+            finally:
+                self._pool.release(url)
+
+    async def ainvoke(self, input, *args, **kwargs):
+        tried = set()
+        while True:
+            url = self._acquire(tried)
+            try:
+                return await self._clients[url].ainvoke(input, *args, **kwargs)
+            except Exception as e:
+                if not is_endpoint_failure(e):
+                    raise
+                self._pool.mark_down(url)
+                tried.add(url)
+            finally:
+                self._pool.release(url)
+
+    def stream(self, input, *args, **kwargs):
+        # Fail over only until the first chunk has been yielded
+        tried = set()
+        while True:
+            url = self._acquire(tried)
+            started = False
+            try:
+                for chunk in self._clients[url].stream(input, *args, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not is_endpoint_failure(e):
+                    raise
+                self._pool.mark_down(url)
+                tried.add(url)
+            finally:
+                self._pool.release(url)
+
+    async def astream(self, input, *args, **kwargs):
+        tried = set()
+        while True:
+            url = self._acquire(tried)
+            started = False
+            try:
+                async for chunk in self._clients[url].astream(input, *args, **kwargs):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started or not is_endpoint_failure(e):
+                    raise
+                self._pool.mark_down(url)
+                tried.add(url)
+            finally:
+                self._pool.release(url)
+
+    def bind(self, **kwargs):
+        return LoadBalancedLLM({url: client.bind(**kwargs) for url, client in self._clients.items()}, self._pool)
+
+    def __getattr__(self, name):
+        return getattr(next(iter(self._clients.values())), name)
+
+    def __setattr__(self, name, value):
+        # e.g. `llm.callbacks = [...]` must reach every endpoint's client
+        for client in self._clients.values():
+            setattr(client, name, value)
@@ -1,15 +1,27 @@
 from typing import Any
 from .base_provider import BaseLLMProvider
+from .endpoint_pool import LoadBalancedLLM
 
 class OllamaProvider(BaseLLMProvider):
     
-    def create_llm(self, model_name: str, **kwargs) -> Any:
+    def create_llm(self, model_name: str, endpoints: list = None, **kwargs) -> Any:
         from langchain_ollama import ChatOllama
+        if endpoints:
+            # One client per Ollama host, balanced behind a single chat model
+            return LoadBalancedLLM.from_endpoints(
+                endpoints,
+                lambda url: ChatOllama(model=model_name, base_url=url, **kwargs),
+                health_url=lambda url: url.rstrip("/") + "/api/tags",
+            )
         return ChatOllama(model=model_name, **kwargs)
     
     def create_embedding(self, model_name: str, **kwargs) -> Any:
         from langchain_ollama import OllamaEmbeddings
         return OllamaEmbeddings(model=model_name, **kwargs)
     
+    def bind_json_schema(self, llm: Any, schema: dict) -> Any:
+        # Ollama's `format` accepts a JSON schema for constrained decoding
+        return llm.bind(format=schema)
+    
     def get_provider_name(self) -> str:
         return "ollama"
@@ -0,0 +1,225 @@
+"""
+Per-provider concurrency and rate limits for LLM clients.
+
+Limits come from the provider's "limits" entry in provider_settings.json:
+
+    "limits": {
+        "max_concurrency": 4,         # requests in flight
+        "requests_per_minute": 120,
+        "tokens_per_minute": 100000   # prompt + completion, estimated up front
+    }
+
+`RateLimitedLLM` wraps the client returned by a provider and gates its sync
+and async entry points (invoke/ainvoke, stream/astream, batch/abatch) on a
+`ProviderLimiter` shared by every client of that provider in the process.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+WINDOW_SECONDS = 60.0
+CHARS_PER_TOKEN = 4  # Rough estimate used before the real usage is known
+POLL_SECONDS = 0.05
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count for a prompt (string, messages or prompt value) or a response."""
+    if value is None:
+        return 0
+    if hasattr(value, "to_messages"):
+        value = value.to_messages()
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(item) for item in value)
+    content = getattr(value, "content", value)
+    return max(1, len(str(content)) // CHARS_PER_TOKEN)
+
+
+def _response_tokens(response: Any) -> int:
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("output_tokens") is not None:
+        return usage["output_tokens"]
+    return estimate_tokens(response)
+
+
+class _SlidingWindow:
+    """Amounts recorded over the last WINDOW_SECONDS, checked against a limit"""
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self._entries = deque()  # (timestamp, amount)
+        self._total = 0
+
+    def _expire(self, now: float) -> None:
+        while self._entries and now - self._entries[0][0] >= WINDOW_SECONDS:
+            self._total -= self._entries.popleft()[1]
+
+    def wait_time(self, amount: int, now: float) -> float:
+        """Seconds until `amount` fits under the limit (0 if it fits now)."""
+        if not self.limit:
+            return 0.0
+        self._expire(now)
+        # A single request larger than the limit is let through once the window is empty
+        if self._total + amount <= self.limit or not self._entries:
+            return 0.0
+        excess = self._total + amount - self.limit
+        for timestamp, entry in self._entries:
+            excess -= entry
+            if excess <= 0:
+                return max(POLL_SECONDS, timestamp + WINDOW_SECONDS - now)
+        return max(POLL_SECONDS, self._entries[-1][0] + WINDOW_SECONDS - now)
+
+    def add(self, amount: int, now: float) -> None:
+        if self.limit and amount:
+            self._entries.append((now, amount))
+            self._total += amount
+
+
+class ProviderLimiter:
+    """Concurrency, request-rate and token-rate limits shared by one provider's clients"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._requests = _SlidingWindow(requests_per_minute)
+        self._tokens = _SlidingWindow(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, limits: Optional[Dict[str, int]]) -> Optional["ProviderLimiter"]:
+        if not limits:
+            return None
+        return cls(
+            max_concurrency=limits.get("max_concurrency"),
+            requests_per_minute=limits.get("requests_per_minute"),
+            tokens_per_minute=limits.get("tokens_per_minute"),
+        )
+
+    def _try_reserve(self, tokens: int) -> float:
+        """Reserve a request and `tokens` if the rate limits allow; else return the wait time."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._requests.wait_time(1, now), self._tokens.wait_time(tokens, now))
+            if wait == 0.0:
+                self._requests.add(1, now)
+                self._tokens.add(tokens, now)
+            return wait
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until the request may start."""
+        while True:
+            wait = self._try_reserve(tokens)
+            if wait == 0.0:
+                break
+            time.sleep(wait)
+        if self._slots is not None:
+            self._slots.acquire()
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """Wait, without blocking the event loop, until the request may start."""
+        while True:
+            wait = self._try_reserve(tokens)
+            if wait == 0.0:
+                break
+            await asyncio.sleep(wait)
+        if self._slots is not None:
+            while not self._slots.acquire(blocking=False):
+                await asyncio.sleep(POLL_SECONDS)
+
+    def release(self, completion_tokens: int = 0) -> None:
+        """Free the concurrency slot and charge the completion tokens to the window."""
+        if completion_tokens:
+            with self._lock:
+                self._tokens.add(completion_tokens, time.monotonic())
+        if self._slots is not None:
+            self._slots.release()
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str, limits: Optional[Dict[str, int]]) -> Optional[ProviderLimiter]:
+    """The process-wide limiter for a provider, created from its limits on first use."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            limiter = ProviderLimiter.from_config(limits)
+            if limiter is None:
+                return None
+            _limiters[provider] = limiter
+        return _limiters[provider]
+
+
+class RateLimitedLLM:
+    """Delegating proxy that gates an LLM client's calls on a ProviderLimiter"""
+
+    def __init__(self, llm: Any, limiter: ProviderLimiter):
+        object.__setattr__(self, "_llm", llm)
+        object.__setattr__(self, "_limiter", limiter)
+
+    @property
+    def wrapped(self) -> Any:
+        return self._llm
+
+    def invoke(self, input, *args, **kwargs):
+        self._limiter.acquire(estimate_tokens(input))
+        completion = 0
+        try:
+            response = self._llm.invoke(input, *args, **kwargs)
+            completion = _response_tokens(response)
+            return response
+        finally:
+            self._limiter.release(completion)
+
+    async def ainvoke(self, input, *args, **kwargs):
+        await self._limiter.acquire_async(estimate_tokens(input))
+        completion = 0
+        try:
+            response = await self._llm.ainvoke(input, *args, **kwargs)
+            completion = _response_tokens(response)
+            return response
+        finally:
+            self._limiter.release(completion)
+
+    def stream(self, input, *args, **kwargs):
+        self._limiter.acquire(estimate_tokens(input))
+        completion = 0
+        try:
+            for chunk in self._llm.stream(input, *args, **kwargs):
+                completion += estimate_tokens(chunk)
+                yield chunk
+        finally:
+            self._limiter.release(completion)
+
+    async def astream(self, input, *args, **kwargs):
+        await self._limiter.acquire_async(estimate_tokens(input))
+        completion = 0
+        try:
+            async for chunk in self._llm.astream(input, *args, **kwargs):
+                completion += estimate_tokens(chunk)
+                yield chunk
+        finally:
+            self._limiter.release(completion)
+
+    def batch(self, inputs, *args, **kwargs):
+        # Each item goes through invoke so the limits apply per request
+        from concurrent.futures import ThreadPoolExecutor
+        workers = self._limiter.max_concurrency or len(inputs) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda item: self.invoke(item, *args, **kwargs), inputs))
+
+    async def abatch(self, inputs, *args, **kwargs):
+        return await asyncio.gather(*(self.ainvoke(item, *args, **kwargs) for item in inputs))
+
+    def bind(self, **kwargs):
+        return RateLimitedLLM(self._llm.bind(**kwargs), self._limiter)
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+
+    def __setattr__(self, name, value):
+        # e.g. `llm.callbacks = [...]` must reach the wrapped client
+        setattr(self._llm, name, value)
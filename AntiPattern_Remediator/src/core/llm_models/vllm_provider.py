@@ -1,15 +1,34 @@
 from typing import Any
 from .base_provider import BaseLLMProvider
-from langchain_openai import ChatOpenAI
-from langchain_openai import OpenAIEmbeddings
+from .endpoint_pool import LoadBalancedLLM
 from config.settings import settings
 
+
+def _vllm_health_url(url: str) -> str:
+    """vLLM serves /health at the server root, beside the OpenAI-compatible /v1 API."""
+    base = url.rstrip("/")
+    if base.endswith("/v1"):
+        base = base[:-3]
+    return base + "/health"
+
+
 class VLLMProvider(BaseLLMProvider):
     
-    def create_llm(self, model_name: str, **kwargs) -> Any:
+    def create_llm(self, model_name: str, endpoints: list = None, **kwargs) -> Any:
+        if endpoints:
+            # One client per vLLM replica, balanced behind a single chat model
+            return LoadBalancedLLM.from_endpoints(
+                endpoints,
+                lambda url: self._create_client(model_name, url, **kwargs),
+                health_url=_vllm_health_url,
+            )
+        return self._create_client(model_name, settings.vLLM_URL, **kwargs)
+
+    def _create_client(self, model_name: str, base_url: str, **kwargs) -> Any:
+        from langchain_openai import ChatOpenAI
         vLLM_model = ChatOpenAI(
             model=model_name,
-            openai_api_base=settings.vLLM_URL,
+            openai_api_base=base_url,
             openai_api_key=settings.vLLM_API_KEY,
             # temperature=settings.parameters.get("temperature"),
             # max_tokens=settings.parameters.get("max_tokens"),
@@ -19,6 +38,7 @@ class VLLMProvider(BaseLLMProvider):
         return vLLM_model
     
     def create_embedding(self, model_name: str, **kwargs) -> Any:
+        from langchain_openai import OpenAIEmbeddings
         vLLM_embeddings_model = OpenAIEmbeddings(
             model=model_name,
             openai_api_base=settings.vLLM_Embedding_URL,
@@ -28,6 +48,9 @@ class VLLMProvider(BaseLLMProvider):
 
         return vLLM_embeddings_model
 
+    def bind_json_schema(self, llm: Any, schema: dict) -> Any:
+        # vLLM guided decoding via the OpenAI-compatible extra body
+        return llm.bind(extra_body={"guided_json": schema})
     
     def get_provider_name(self) -> str:
         return "vllm"
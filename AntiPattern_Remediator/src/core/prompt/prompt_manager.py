@@ -11,6 +11,7 @@ class PromptManager:
         self.ANTIPATTERN_SCANNER = "antipattern_scanner"
         self.REFACTOR_STRATEGIST = "refactor_strategist"
         self.CODE_TRANSFORMER = "code_transformer"
+        self.CODE_TRANSFORMER_PATCH = "code_transformer_patch"
         self.CODE_REVIEWER = "code_reviewer"
         self.EXPLAINER = "explainer"
 
@@ -28,6 +29,7 @@ class PromptManager:
                 self.ANTIPATTERN_SCANNER,
                 self.REFACTOR_STRATEGIST,
                 self.CODE_TRANSFORMER,
+                self.CODE_TRANSFORMER_PATCH,
                 self.CODE_REVIEWER,
                 self.EXPLAINER
             ]
@@ -5,14 +5,32 @@ State definitions for the antipattern analysis workflow
 from typing import TypedDict, Optional, List, Dict, Any
 
 
+class AntipatternFinding(TypedDict):
+    """A single anti-pattern reported by the scanner"""
+    name: str
+    location: str
+    description: str
+
+
+class ScanReport(TypedDict):
+    """Scanner results parsed once from the LLM's structured output"""
+    total_antipatterns_found: int
+    antipatterns_detected: List[AntipatternFinding]
+
+
 class AgentState(TypedDict):
     """State definition for passing data through the workflow"""
     code: str                                # Code to be analyzed
     context: Optional[str]                   # Context retrieved from knowledge base (scanner)
     trove_context: Optional[str]             # Context retrieved from the Anti-Pattern Trove (TinyDB/Chroma)
+    code_signals: Optional[Dict[str, Any]]   # Structural signals used to build targeted Trove queries
     antipatterns_scanner_results: Optional[str]
+    antipatterns_scan_report: Optional[ScanReport]  # Parsed scanner results (single source for consumers)
     refactoring_strategy_results: Optional[str]  # Refactoring strategy generated by strategist
+    strategy_seed: Optional[Dict[str, Any]]  # Strategy of a near-duplicate file's run, reused if the findings match
     refactored_code: Optional[str]  # Code after refactoring
+    precheck_results: Optional[str]  # Deterministic pre-check decision: fail / noop / review
+    compile_results: Optional[str]   # Single-file compile check: ok / error / skipped
     code_review_results: Optional[str]  # Code review results
     code_review_times: int  # Number of times code has been reviewed
     msgs: List[Dict[str, Any]]   # Message history for conversation context
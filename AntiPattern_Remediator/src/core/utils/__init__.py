@@ -1,3 +1,28 @@
 from .json_utils import extract_first_json
+from .code_signals import extract_code_signals, build_trove_queries
+from .scan_report import SCAN_REPORT_SCHEMA, parse_scan_report, finding_names
+from .java_checks import run_prechecks, PRECHECK_FAIL, PRECHECK_NOOP, PRECHECK_REVIEW
+from .java_compiler import JavaCompileChecker
+from .streaming import stream_until_complete
+from .message_history import bounded_history, revision_message, REVISION_STRATEGY
+from .patching import parse_search_replace_blocks, apply_search_replace
 
-__all__ = ["extract_first_json"]
+__all__ = [
+    "extract_first_json",
+    "extract_code_signals",
+    "build_trove_queries",
+    "SCAN_REPORT_SCHEMA",
+    "parse_scan_report",
+    "finding_names",
+    "run_prechecks",
+    "PRECHECK_FAIL",
+    "PRECHECK_NOOP",
+    "PRECHECK_REVIEW",
+    "JavaCompileChecker",
+    "stream_until_complete",
+    "bounded_history",
+    "revision_message",
+    "REVISION_STRATEGY",
+    "parse_search_replace_blocks",
+    "apply_search_replace",
+]
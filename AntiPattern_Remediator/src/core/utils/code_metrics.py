@@ -0,0 +1,96 @@
+"""
+Lizard-based size and complexity metrics for Java source.
+
+Used by the code-signal extraction and, through workflow/compute_metrics.py,
+by the before/after metric comparison in the reports.
+"""
+
+from pathlib import Path
+
+import javalang
+import lizard
+
+
+def calculate_nesting_depth(code: str) -> int:
+    """
+    Calculate the maximum nesting depth for a function.
+    """
+    tree = javalang.parse.parse(code)
+
+    max_depth = 0
+
+    def walk(node, depth=0):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        if isinstance(node, (javalang.tree.IfStatement,
+                             javalang.tree.ForStatement,
+                             javalang.tree.WhileStatement,
+                             javalang.tree.TryStatement,
+                             javalang.tree.SwitchStatement)):
+            depth += 1
+        for child in getattr(node, 'children', []):
+            if isinstance(child, (list, tuple)):
+                for c in child:
+                    if isinstance(c, javalang.ast.Node):
+                        walk(c, depth)
+            elif isinstance(child, javalang.ast.Node):
+                walk(child, depth)
+
+    walk(tree)
+    return max_depth
+
+
+def _process_lizard_result(lizard_result, source_code: str, filename: str, source_type: str = "file"):
+    """
+    Helper function to process lizard analysis results and extract metrics.
+    """
+    functions = []
+    
+    for fn in lizard_result.function_list:        
+
+        functions.append({
+            "name": fn.long_name,                 
+            "start_line": fn.start_line,
+            "end_line": fn.end_line,
+            "nloc": fn.nloc,                      # SLOC (non-comment LOC) for the function
+            "cyclomatic_complexity": fn.cyclomatic_complexity    
+            })
+        
+    # Calculate nesting depth using brace counting approach
+    nesting_depth = calculate_nesting_depth(source_code)
+
+    file_metrics = {
+        "file": filename,
+        "file_sloc_nloc": lizard_result.nloc,              # file-level SLOC (non-comment LOC)
+        "total_functions": len(functions),
+        "avg_cc": round(sum(f["cyclomatic_complexity"] for f in functions)/len(functions), 2) if functions else 0.0,
+        "max_cc": max((f["cyclomatic_complexity"] for f in functions), default=0),
+        "max_nd_in_file": nesting_depth,
+        "functions": functions,
+    }
+    
+    # Add source type indicator for string analysis
+    if source_type == "string":
+        file_metrics["source_type"] = "string"
+    
+    return file_metrics
+
+def analyze_file(path: Path):
+    """Analyze a Java file from file path."""
+    # Read the source code for custom nesting analysis
+    with open(path, 'r', encoding='utf-8') as f:
+        source_code = f.read()
+    
+    # Analyze with lizard
+    lizard_result = lizard.analyze_file(str(path))
+    
+    # Process the results using shared helper
+    return _process_lizard_result(lizard_result, source_code, str(path), "file")
+
+def analyze_source_code(source_code: str, filename: str = "AnalyzedCode.java"):
+    """Analyze Java source code directly from string."""
+    # Analyze with lizard
+    lizard_result = lizard.analyze_file.analyze_source_code(filename, source_code)
+    
+    # Process the results using shared helper
+    return _process_lizard_result(lizard_result, source_code, filename, "string")
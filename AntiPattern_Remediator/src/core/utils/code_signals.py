@@ -0,0 +1,157 @@
+"""
+Cheap structural signals for Java source code.
+
+The signals are used to build targeted Anti-Pattern Trove queries instead of
+searching with the first characters of the file (usually a licence header).
+"""
+
+from typing import Any, Dict, List
+
+import javalang
+
+from .code_metrics import analyze_source_code
+
+# Thresholds at which a signal is considered a hint for an anti-pattern
+GOD_CLASS_METHODS = 20
+GOD_CLASS_FIELDS = 15
+GOD_CLASS_SLOC = 500
+LONG_METHOD_NLOC = 50
+HIGH_CC = 10
+DEEP_NESTING = 4
+MAGIC_NUMBERS = 3
+MIDDLE_MAN_RATIO = 0.5
+MIDDLE_MAN_MIN_METHODS = 4
+
+CATCH_ALL_TYPES = {"Exception", "Throwable", "RuntimeException", "java.lang.Exception", "java.lang.Throwable"}
+TRIVIAL_LITERALS = {"0", "1", "-1", "2", "0L", "1L", "0.0", "1.0", "0.0f", "1.0f"}
+
+# Signal -> Trove query, in priority order. Queries use words that appear in the
+# Trove descriptions so that both keyword (TinyDB) and vector (Chroma) search hit.
+SIGNAL_QUERIES = [
+    ("god_class", "God Class too many responsibilities large class"),
+    ("monolithic_method", "Monolithic Method long method doing too much"),
+    ("deep_nesting", "Deep Nesting nested conditional loop blocks"),
+    ("catch_all", "Generic Exception Handling catch Exception"),
+    ("swallowed_exception", "Unsafe or Vague Exception Handling empty catch swallowed"),
+    ("magic_constants", "Magic Constants unexplained numeric literals"),
+    ("middle_man", "Middle Man class delegating to another class"),
+]
+FALLBACK_QUERY = "Java anti-patterns code smells"
+
+
+def _empty_signals() -> Dict[str, Any]:
+    return {
+        "parsed": False,
+        "sloc": 0,
+        "class_count": 0,
+        "field_count": 0,
+        "method_count": 0,
+        "max_cc": 0,
+        "longest_method_nloc": 0,
+        "max_nesting": 0,
+        "catch_all_handlers": 0,
+        "empty_catch_blocks": 0,
+        "magic_numbers": 0,
+        "delegating_methods": 0,
+    }
+
+
+def _is_constant_declaration(path) -> bool:
+    """Literals inside `static final` fields are named constants, not magic numbers."""
+    for node in path:
+        if isinstance(node, javalang.tree.FieldDeclaration):
+            return {"static", "final"} <= set(node.modifiers or ())
+    return False
+
+
+def _is_delegating(method) -> bool:
+    """A method whose whole body is a single call on another object."""
+    body = method.body or []
+    if len(body) != 1:
+        return False
+    stmt = body[0]
+    expr = getattr(stmt, "expression", None)
+    if not isinstance(stmt, (javalang.tree.ReturnStatement, javalang.tree.StatementExpression)):
+        return False
+    return isinstance(expr, javalang.tree.MethodInvocation) and bool(expr.qualifier)
+
+
+def extract_code_signals(code: str) -> Dict[str, Any]:
+    """
+    Extract cheap structural signals (size, complexity, nesting, exception
+    handling, literals, delegation) from Java source code.
+    Never raises; unparsable code yields zeroed signals with `parsed=False`.
+    """
+    signals = _empty_signals()
+    if not code or not code.strip():
+        return signals
+
+    try:
+        metrics = analyze_source_code(code)
+        signals["sloc"] = metrics["file_sloc_nloc"]
+        signals["max_cc"] = metrics["max_cc"]
+        signals["max_nesting"] = metrics["max_nd_in_file"]
+        signals["longest_method_nloc"] = max((f["nloc"] for f in metrics["functions"]), default=0)
+    except Exception:
+        return signals
+
+    try:
+        tree = javalang.parse.parse(code)
+    except Exception:
+        return signals
+
+    signals["parsed"] = True
+    signals["class_count"] = sum(1 for _ in tree.filter(javalang.tree.ClassDeclaration))
+    signals["field_count"] = sum(len(f.declarators) for _, f in tree.filter(javalang.tree.FieldDeclaration))
+
+    methods = [m for _, m in tree.filter(javalang.tree.MethodDeclaration)]
+    signals["method_count"] = len(methods)
+    signals["delegating_methods"] = sum(1 for m in methods if _is_delegating(m))
+
+    for _, clause in tree.filter(javalang.tree.CatchClause):
+        if CATCH_ALL_TYPES.intersection(clause.parameter.types or ()):
+            signals["catch_all_handlers"] += 1
+        if not clause.block:
+            signals["empty_catch_blocks"] += 1
+
+    for path, literal in tree.filter(javalang.tree.Literal):
+        value = str(literal.value)
+        if not value or not (value[0].isdigit() or value[0] == "."):
+            continue  # strings, chars, booleans, null
+        if value in TRIVIAL_LITERALS or _is_constant_declaration(path):
+            continue
+        signals["magic_numbers"] += 1
+
+    return signals
+
+
+def detect_hints(signals: Dict[str, Any]) -> List[str]:
+    """Map signals to the anti-pattern hints they suggest, in priority order."""
+    method_count = signals.get("method_count", 0)
+    hints = {
+        "god_class": (
+            method_count >= GOD_CLASS_METHODS
+            or signals.get("field_count", 0) >= GOD_CLASS_FIELDS
+            or signals.get("sloc", 0) >= GOD_CLASS_SLOC
+        ),
+        "monolithic_method": (
+            signals.get("longest_method_nloc", 0) >= LONG_METHOD_NLOC
+            or signals.get("max_cc", 0) >= HIGH_CC
+        ),
+        "deep_nesting": signals.get("max_nesting", 0) >= DEEP_NESTING,
+        "catch_all": signals.get("catch_all_handlers", 0) > 0,
+        "swallowed_exception": signals.get("empty_catch_blocks", 0) > 0,
+        "magic_constants": signals.get("magic_numbers", 0) >= MAGIC_NUMBERS,
+        "middle_man": (
+            method_count >= MIDDLE_MAN_MIN_METHODS
+            and signals.get("delegating_methods", 0) / method_count >= MIDDLE_MAN_RATIO
+        ),
+    }
+    return [name for name, _ in SIGNAL_QUERIES if hints[name]]
+
+
+def build_trove_queries(signals: Dict[str, Any], max_queries: int = 4) -> List[str]:
+    """Turn code signals into a bounded list of targeted Trove queries."""
+    queries = dict(SIGNAL_QUERIES)
+    selected = [queries[hint] for hint in detect_hints(signals)]
+    return (selected or [FALLBACK_QUERY])[:max_queries]
@@ -0,0 +1,249 @@
+"""
+Lightweight per-stage instrumentation for the LangGraph workflow.
+
+Records, per node and per file, wall time, LLM latency (time-to-first-token
+and total), prompt/completion token counts, retries and retriever latency.
+Records are exported as JSONL and aggregated into a summary for the
+processing report, so bottlenecks can be found without LangSmith.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from statistics import mean
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+SNIPPET_FILE = "java_code_snippet"
+CHARS_PER_TOKEN = 4  # Token estimate for streams stopped before the provider reported usage
+
+
+def _token_usage(response) -> Dict[str, Optional[int]]:
+    """Extract prompt/completion token counts from any of the providers' result formats."""
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    prompt = usage.get("prompt_tokens", usage.get("input_token_count"))
+    completion = usage.get("completion_tokens", usage.get("generated_token_count"))
+
+    if prompt is None or completion is None:
+        for generations in getattr(response, "generations", None) or []:
+            for generation in generations:
+                metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                info = getattr(generation, "generation_info", None) or {}
+                prompt = metadata.get("input_tokens", info.get("prompt_eval_count", prompt))
+                completion = metadata.get("output_tokens", info.get("eval_count", completion))
+    return {"prompt_tokens": prompt, "completion_tokens": completion}
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def _response_text(response) -> str:
+    return "".join(
+        getattr(generation, "text", "") or ""
+        for generations in getattr(response, "generations", None) or []
+        for generation in generations
+    )
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LangChain callback that times LLM calls and collects token usage"""
+
+    def __init__(self, instrumentation: "WorkflowInstrumentation"):
+        self.instrumentation = instrumentation
+        self._runs: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        file_path, node = self.instrumentation.current_context()
+        with self._lock:
+            self._runs[run_id] = {"start": time.perf_counter(), "first_token": None,
+                                  "retries": 0, "file": file_path, "node": node}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.on_llm_start(serialized, [], run_id=run_id, **kwargs)
+        prompt = "".join(str(getattr(m, "content", m)) for batch in messages for m in batch)
+        with self._lock:
+            self._runs[run_id]["prompt_estimate"] = _estimate_tokens(prompt)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None and run["first_token"] is None:
+            run["first_token"] = time.perf_counter()
+
+    def on_retry(self, retry_state, *, run_id, **kwargs):
+        run = self._runs.get(run_id)
+        if run is not None:
+            run["retries"] += 1
+
+    def _finish(self, run_id, **fields):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        end = time.perf_counter()
+        self.instrumentation.record(
+            "llm",
+            file=run["file"],
+            node=run["node"],
+            latency_s=round(end - run["start"], 4),
+            ttft_s=round(run["first_token"] - run["start"], 4) if run["first_token"] else None,
+            retries=run["retries"],
+            **fields,
+        )
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, error=None, **_token_usage(response))
+
+    def on_llm_error(self, error, *, run_id, response=None, **kwargs):
+        if isinstance(error, GeneratorExit):
+            # The caller closed the stream once it had what it needed (see streaming.py)
+            self._finish_stopped_stream(run_id, response)
+            return
+        self._finish(run_id, error=str(error), prompt_tokens=None, completion_tokens=None)
+
+    def _finish_stopped_stream(self, run_id, response):
+        """Record an early-stopped stream as a normal call, estimating usage the provider never sent."""
+        usage = _token_usage(response)
+        run = self._runs.get(run_id) or {}
+        if usage["prompt_tokens"] is None:
+            usage["prompt_tokens"] = run.get("prompt_estimate")
+        if usage["completion_tokens"] is None:
+            usage["completion_tokens"] = _estimate_tokens(_response_text(response))
+        self._finish(run_id, error=None, stopped_early=True, **usage)
+
+
+class TimedRetriever:
+    """Retriever proxy that records the latency of every search"""
+
+    def __init__(self, retriever, instrumentation: "WorkflowInstrumentation"):
+        self._retriever = retriever
+        self._instrumentation = instrumentation
+
+    def _timed(self, method, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            file_path, node = self._instrumentation.current_context()
+            self._instrumentation.record(
+                "retrieval", file=file_path, node=node, latency_s=round(time.perf_counter() - start, 4)
+            )
+
+    def invoke(self, *args, **kwargs):
+        return self._timed(self._retriever.invoke, *args, **kwargs)
+
+    def get_relevant_documents(self, *args, **kwargs):
+        return self._timed(self._retriever.get_relevant_documents, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._retriever, name)
+
+
+class WorkflowInstrumentation:
+    """Collects stage records from graph nodes, LLM callbacks and retriever calls"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.callback = LLMMetricsCallback(self)
+
+    def current_context(self):
+        return getattr(self._local, "file", None), getattr(self._local, "node", None)
+
+    def record(self, event: str, **fields) -> None:
+        entry = {"event": event, "timestamp": datetime.now().isoformat(timespec="milliseconds"), **fields}
+        with self._lock:
+            self.records.append(entry)
+
+    def wrap_node(self, name: str, fn):
+        """Wrap a graph node so its wall time is recorded against the current file."""
+        def timed_node(state):
+            self._local.file = state.get("current_file_path") or SNIPPET_FILE
+            self._local.node = name
+            start = time.perf_counter()
+            try:
+                return fn(state)
+            finally:
+                self.record("node", file=self._local.file, node=name,
+                            wall_time_s=round(time.perf_counter() - start, 4))
+                self._local.node = None
+        timed_node.__name__ = getattr(fn, "__name__", name)
+        return timed_node
+
+    def wrap_retriever(self, retriever):
+        return TimedRetriever(retriever, self) if retriever is not None else None
+
+    def merge_records(self, records: List[Dict[str, Any]]) -> None:
+        """Add records collected in another process (distributed runs)."""
+        with self._lock:
+            self.records.extend(records)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def export_jsonl(self, path) -> None:
+        with self._lock:
+            records = list(self.records)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def summary(self, slowest: int = 10) -> Dict[str, Any]:
+        """Aggregate records per node, for LLM calls, for retrieval and per file."""
+        with self._lock:
+            records = list(self.records)
+
+        nodes: Dict[str, List[float]] = {}
+        files: Dict[str, float] = {}
+        llm_calls = [r for r in records if r["event"] == "llm"]
+        retrievals = [r["latency_s"] for r in records if r["event"] == "retrieval"]
+
+        for r in records:
+            if r["event"] == "node":
+                nodes.setdefault(r["node"], []).append(r["wall_time_s"])
+                files[r["file"]] = files.get(r["file"], 0.0) + r["wall_time_s"]
+
+        llm_by_node: Dict[str, List[float]] = {}
+        for r in llm_calls:
+            llm_by_node.setdefault(r["node"] or "unknown", []).append(r["latency_s"])
+        ttfts = [r["ttft_s"] for r in llm_calls if r.get("ttft_s") is not None]
+
+        return {
+            "nodes": {
+                name: {
+                    "calls": len(times),
+                    "total_s": round(sum(times), 3),
+                    "mean_s": round(mean(times), 3),
+                    "max_s": round(max(times), 3),
+                    "llm_total_s": round(sum(llm_by_node.get(name, [])), 3),
+                }
+                for name, times in sorted(nodes.items(), key=lambda item: -sum(item[1]))
+            },
+            "llm": {
+                "calls": len(llm_calls),
+                "total_latency_s": round(sum(r["latency_s"] for r in llm_calls), 3),
+                "mean_ttft_s": round(mean(ttfts), 3) if ttfts else None,
+                "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in llm_calls),
+                "completion_tokens": sum(r.get("completion_tokens") or 0 for r in llm_calls),
+                "retries": sum(r.get("retries", 0) for r in llm_calls),
+                "errors": sum(1 for r in llm_calls if r.get("error")),
+            },
+            "retrieval": {
+                "calls": len(retrievals),
+                "total_s": round(sum(retrievals), 3),
+                "mean_s": round(mean(retrievals), 4) if retrievals else None,
+            },
+            "slowest_files": [
+                {"file": f, "wall_time_s": round(t, 3)}
+                for f, t in sorted(files.items(), key=lambda item: -item[1])[:slowest]
+            ],
+        }
+
+
+# Global instrumentation instance shared by the graph and the workflow
+instrumentation = WorkflowInstrumentation()
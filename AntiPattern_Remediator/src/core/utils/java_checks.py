@@ -0,0 +1,107 @@
+"""
+Deterministic checks on transformed Java code.
+
+These run before the reviewer LLM so that output which does not parse, breaks
+the public API or changes nothing is settled without a model call.
+"""
+
+from typing import Dict, Optional, Set
+
+import javalang
+
+PRECHECK_FAIL = "fail"      # Send straight back to the transformer
+PRECHECK_NOOP = "noop"      # Identical to the original; nothing to review
+PRECHECK_REVIEW = "review"  # Passed the checks; the reviewer LLM decides
+
+
+def parse_java(code: str):
+    """Parse Java source, returning (tree, error message)."""
+    try:
+        return javalang.parse.parse(code), None
+    except javalang.parser.JavaSyntaxError as e:
+        position = getattr(e.at, "position", None)
+        where = f" at line {position.line}" if position else ""
+        return None, f"Syntax error{where}: {e.description}"
+    except Exception as e:
+        return None, f"Could not parse Java code: {e}"
+
+
+def _type_name(type_node) -> str:
+    if type_node is None:
+        return "void"
+    return type_node.name + "[]" * len(type_node.dimensions or [])
+
+
+def _collect_signatures(type_decl, prefix: str, signatures: Set[str]) -> None:
+    name = f"{prefix}{type_decl.name}"
+    implicitly_public = isinstance(type_decl, javalang.tree.InterfaceDeclaration)
+
+    for member in type_decl.body or []:
+        if isinstance(member, (javalang.tree.ClassDeclaration,
+                               javalang.tree.InterfaceDeclaration,
+                               javalang.tree.EnumDeclaration)):
+            _collect_signatures(member, f"{name}.", signatures)
+            continue
+        if not isinstance(member, (javalang.tree.MethodDeclaration, javalang.tree.ConstructorDeclaration)):
+            continue
+
+        modifiers = member.modifiers or set()
+        if not (implicitly_public or modifiers & {"public", "protected"}) or "private" in modifiers:
+            continue
+
+        params = ", ".join(
+            _type_name(p.type) + ("..." if p.varargs else "") for p in member.parameters
+        )
+        if isinstance(member, javalang.tree.ConstructorDeclaration):
+            signatures.add(f"{name}({params})")
+        else:
+            signatures.add(f"{_type_name(member.return_type)} {name}.{member.name}({params})")
+
+
+def public_api_signatures(tree) -> Set[str]:
+    """Public/protected method and constructor signatures of every declared type."""
+    signatures: Set[str] = set()
+    for type_decl in tree.types or []:
+        _collect_signatures(type_decl, "", signatures)
+    return signatures
+
+
+def _normalise(code: str) -> str:
+    lines = (line.rstrip() for line in (code or "").strip().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def is_noop_change(original: str, refactored: str) -> bool:
+    """True if the code only differs in trailing whitespace or blank lines."""
+    return _normalise(original) == _normalise(refactored)
+
+
+def run_prechecks(original: str, refactored: Optional[str]) -> Dict[str, str]:
+    """
+    Run the deterministic checks and return {"decision": ..., "reason": ...}.
+    Parse and API checks are skipped when the original itself cannot be parsed
+    (e.g. language features newer than javalang supports).
+    """
+    if not refactored or not refactored.strip():
+        return {"decision": PRECHECK_FAIL, "reason": "The transformer produced no code."}
+
+    if is_noop_change(original, refactored):
+        return {"decision": PRECHECK_NOOP, "reason": "The refactored code is identical to the original."}
+
+    original_tree, original_error = parse_java(original)
+    if original_error:
+        return {"decision": PRECHECK_REVIEW, "reason": "Original code is not parsable; structural checks skipped."}
+
+    refactored_tree, error = parse_java(refactored)
+    if error:
+        return {"decision": PRECHECK_FAIL, "reason": f"The refactored code does not parse. {error}"}
+
+    missing = public_api_signatures(original_tree) - public_api_signatures(refactored_tree)
+    if missing:
+        listed = "\n".join(f"- {sig}" for sig in sorted(missing))
+        return {
+            "decision": PRECHECK_FAIL,
+            "reason": f"The refactoring removed or changed public API signatures:\n{listed}",
+        }
+
+    return {"decision": PRECHECK_REVIEW, "reason": "Parsing and public API checks passed."}
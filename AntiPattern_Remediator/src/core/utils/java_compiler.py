@@ -0,0 +1,123 @@
+"""
+Single-file compile check against a cloned Maven module.
+
+The changed file is compiled on its own against the module's existing
+`target/classes` and its dependency classpath, which is resolved once per
+module and cached, so invalid output is caught without a module rebuild.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+CLASSPATH_CACHE_FILE = "antipattern-classpath.txt"
+MAX_ERROR_CHARS = 4000
+COMPILE_TIMEOUT_SECONDS = 300  # Per javac run, and for resolving a module's classpath
+
+
+class JavaCompileChecker:
+    """Compile single Java files against their Maven module's classpath"""
+
+    def __init__(self, timeout: int = COMPILE_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._classpaths: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def find_module_root(file_path: str) -> Optional[Path]:
+        """Nearest ancestor directory of the file that contains a pom.xml."""
+        for parent in Path(file_path).resolve().parents:
+            if (parent / "pom.xml").exists():
+                return parent
+        return None
+
+    def _resolve_dependency_classpath(self, module_root: Path) -> Optional[str]:
+        """Ask Maven for the module's dependency classpath, reusing the cached file when still fresh."""
+        target_dir = module_root / "target"
+        cache_file = target_dir / CLASSPATH_CACHE_FILE
+        pom_file = module_root / "pom.xml"
+
+        if cache_file.exists() and cache_file.stat().st_mtime >= pom_file.stat().st_mtime:
+            return cache_file.read_text(encoding="utf-8").strip()
+
+        mvn_cmd = "mvn.cmd" if os.name == "nt" else "mvn"
+        if not shutil.which(mvn_cmd):
+            return None
+
+        target_dir.mkdir(exist_ok=True)
+        try:
+            result = subprocess.run(
+                [mvn_cmd, "-q", "dependency:build-classpath",
+                 f"-Dmdep.outputFile={cache_file}", "-Dmdep.includeScope=compile"],
+                cwd=module_root,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except (subprocess.TimeoutExpired, OSError):
+            return None
+        if result.returncode != 0 or not cache_file.exists():
+            return None
+        return cache_file.read_text(encoding="utf-8").strip()
+
+    def get_classpath(self, module_root: Path) -> Optional[str]:
+        """Classpath for a module: its compiled classes plus dependencies (cached per module)."""
+        key = str(module_root)
+        with self._lock:
+            if key not in self._classpaths:
+                classes_dir = module_root / "target" / "classes"
+                dependencies = self._resolve_dependency_classpath(module_root)
+                if not classes_dir.exists() or dependencies is None:
+                    self._classpaths[key] = None
+                else:
+                    entries = [str(classes_dir)] + [e for e in dependencies.split(os.pathsep) if e]
+                    self._classpaths[key] = os.pathsep.join(entries)
+            return self._classpaths[key]
+
+    def compile_source(self, file_path: str, source: str) -> dict:
+        """
+        Compile `source` as if it replaced `file_path`.
+        Returns {"status": "ok" | "error" | "skipped", "output": str}.
+        """
+        if not shutil.which("javac"):
+            return {"status": "skipped", "output": "javac not found in PATH"}
+
+        module_root = self.find_module_root(file_path)
+        if module_root is None:
+            return {"status": "skipped", "output": "No Maven module found for file"}
+
+        classpath = self.get_classpath(module_root)
+        if classpath is None:
+            return {"status": "skipped", "output": f"Could not resolve classpath for {module_root.name} (is it built?)"}
+
+        package_match = re.search(r"^\s*package\s+([\w.]+)\s*;", source, re.MULTILINE)
+        package_dir = package_match.group(1).replace(".", os.sep) if package_match else ""
+
+        with tempfile.TemporaryDirectory(prefix="antipattern_javac_") as tmp:
+            source_dir = Path(tmp, "src", package_dir)
+            source_dir.mkdir(parents=True)
+            source_file = source_dir / Path(file_path).name
+            source_file.write_text(source, encoding="utf-8")
+            out_dir = Path(tmp, "classes")
+            out_dir.mkdir()
+
+            try:
+                result = subprocess.run(
+                    ["javac", "-proc:none", "-nowarn", "-encoding", "UTF-8",
+                     "-cp", classpath, "-d", str(out_dir), str(source_file)],
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout,
+                )
+            except subprocess.TimeoutExpired:
+                return {"status": "skipped", "output": "javac timed out"}
+
+        if result.returncode == 0:
+            return {"status": "ok", "output": ""}
+        output = (result.stderr or result.stdout).replace(str(source_file), Path(file_path).name)
+        return {"status": "error", "output": output[:MAX_ERROR_CHARS]}
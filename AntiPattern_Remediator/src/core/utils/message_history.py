@@ -0,0 +1,56 @@
+"""
+History policy for the transform/review loop.
+
+The state keeps every review message, but prompts only receive the latest
+round(s) verbatim plus a one-line-per-round summary of the earlier ones.
+Later transform rounds send only the previous attempt and that feedback: the
+strategy JSON is replaced by REVISION_STRATEGY (the attempt already applies
+it) and the original file is not sent again, so a revision prompt is smaller
+than the first round's.
+"""
+
+import re
+from typing import Any, List
+
+SUMMARY_CHARS = 160      # Per-round budget in the summary of earlier rounds
+
+# Stands in for the strategy JSON in revision rounds
+REVISION_STRATEGY = '{"revision": "The strategies are already applied to this code; only address the review feedback."}'
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _content(message: Any) -> str:
+    if isinstance(message, dict):
+        return str(message.get("content", ""))
+    return str(getattr(message, "content", message))
+
+
+def _one_line(text: str, limit: int) -> str:
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+def bounded_history(msgs: List[Any], keep_last: int = 1, summary_chars: int = SUMMARY_CHARS) -> List[Any]:
+    """Latest `keep_last` messages verbatim, preceded by a compact summary of the earlier ones."""
+    from langchain_core.messages import HumanMessage  # deferred: keeps `src.core.utils` cheap to import
+
+    msgs = list(msgs or [])
+    if len(msgs) <= keep_last:
+        return msgs
+
+    split = len(msgs) - keep_last
+    summary = "\n".join(f"- {_one_line(_content(m), summary_chars)}" for m in msgs[:split])
+    return [
+        HumanMessage(content=f"Summary of earlier review rounds (already addressed or superseded):\n{summary}")
+    ] + msgs[split:]
+
+
+def revision_message():
+    """Tell the transformer that the code it was given is its previous attempt, to be revised rather than redone."""
+    from langchain_core.messages import HumanMessage
+
+    return HumanMessage(content=(
+        "The Java code above is your previous refactoring attempt, not the original file. "
+        "Revise it to address the latest review feedback instead of starting over."
+    ))
@@ -0,0 +1,115 @@
+"""
+Search/replace edit lists for the transformer's patch output mode.
+
+The model returns only the hunks it changes, in the format
+
+    <<<<<<< SEARCH
+    original lines
+    =======
+    replacement lines
+    >>>>>>> REPLACE
+
+and the hunks are applied locally. Each SEARCH block is located on whole
+lines: by exact match, then by whitespace-insensitive match, then by the most
+similar window of lines (difflib), so small transcription slips do not sink a
+patch. A block that matches more than one place is rejected rather than
+applied to the first, so the caller can fall back to the full file.
+"""
+
+import difflib
+import re
+from typing import List, Tuple
+
+MIN_FUZZY_RATIO = 0.9
+
+_BLOCK_RE = re.compile(
+    r"^<{5,}\s*SEARCH[ \t]*\n(.*?)^={5,}[ \t]*\n(.*?)^>{5,}\s*REPLACE[ \t]*$",
+    re.DOTALL | re.MULTILINE,
+)
+
+
+def parse_search_replace_blocks(text: str) -> List[Tuple[str, str]]:
+    """Return the (search, replace) pairs in a model response, in order."""
+    return [(search, replace) for search, replace in _BLOCK_RE.findall(text or "")]
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _find_block(lines: List[str], search_lines: List[str], min_ratio: float):
+    """
+    Locate `search_lines` in `lines` on whole-line boundaries.
+    Returns ([start, end) line span, None), or (None, reason) when the block matches
+    nowhere or in more than one place.
+    """
+    n = len(search_lines)
+    if n == 0 or n > len(lines):
+        return None, "did not match the code"
+    windows = range(len(lines) - n + 1)
+
+    # Exact lines, then whitespace-insensitive lines; the first stage with any match decides
+    stripped = [line.strip() for line in lines]
+    wanted = [line.strip() for line in search_lines]
+    for haystack, needle in ((lines, search_lines), (stripped, wanted)):
+        starts = [start for start in windows if haystack[start:start + n] == needle]
+        if len(starts) == 1:
+            return (starts[0], starts[0] + n), None
+        if starts:
+            return None, f"matches {len(starts)} places"
+
+    # Most similar window of the same length; it must be the only one above `min_ratio`
+    matches = []
+    target = "\n".join(wanted)
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2(target)
+    for start in windows:
+        matcher.set_seq1("\n".join(stripped[start:start + n]))
+        if matcher.real_quick_ratio() < min_ratio or matcher.quick_ratio() < min_ratio:
+            continue
+        if matcher.ratio() >= min_ratio:
+            matches.append(start)
+    if len(matches) == 1:
+        return (matches[0], matches[0] + n), None
+    if matches:
+        return None, f"resembles {len(matches)} places"
+    return None, "did not match the code"
+
+
+def _reindent(replace_lines: List[str], search_lines: List[str], matched_lines: List[str]) -> List[str]:
+    """Shift the replacement by the indentation the SEARCH block dropped (or added)."""
+    search_first = next((line for line in search_lines if line.strip()), "")
+    matched_first = next((line for line in matched_lines if line.strip()), "")
+    have, want = _indent(search_first), _indent(matched_first)
+    if have == want:
+        return replace_lines
+    if want.startswith(have):
+        extra = want[len(have):]
+        return [extra + line if line.strip() else line for line in replace_lines]
+    if have.startswith(want):
+        surplus = have[len(want):]
+        return [line[len(surplus):] if line.startswith(surplus) else line for line in replace_lines]
+    return replace_lines
+
+
+def apply_search_replace(code: str, blocks: List[Tuple[str, str]],
+                         min_ratio: float = MIN_FUZZY_RATIO) -> Tuple[str, List[str]]:
+    """
+    Apply the blocks in order and return (patched code, errors).
+    A block must match exactly one run of whole lines; blocks that match nowhere or
+    ambiguously are reported in `errors` and left unapplied.
+    """
+    errors = []
+    for i, (search, replace) in enumerate(blocks, 1):
+        lines = code.splitlines()
+        search_lines = search.splitlines()
+        span, reason = _find_block(lines, search_lines, min_ratio)
+        if span is None:
+            first_line = next((line.strip() for line in search_lines if line.strip()), "")
+            errors.append(f"Hunk {i} {reason} (starting '{first_line[:80]}').")
+            continue
+        start, end = span
+        replacement = _reindent(replace.splitlines(), search_lines, lines[start:end])
+        trailing_newline = "\n" if code.endswith("\n") else ""
+        code = "\n".join(lines[:start] + replacement + lines[end:]) + trailing_newline
+    return code, errors
@@ -0,0 +1,75 @@
+"""
+Structured scanner output: JSON schema and a single-pass parser.
+
+The scanner's response is parsed once into a `ScanReport` that is stored in
+the workflow state, so downstream consumers never re-scan the raw text.
+"""
+
+from typing import Any, Optional
+
+from .json_utils import extract_first_json
+from ..state import ScanReport
+
+# JSON schema passed to providers that support constrained decoding
+SCAN_REPORT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "total_antipatterns_found": {"type": "integer"},
+        "antipatterns_detected": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "location": {"type": "string"},
+                    "description": {"type": "string"},
+                },
+                "required": ["name", "location", "description"],
+            },
+        },
+    },
+    "required": ["total_antipatterns_found", "antipatterns_detected"],
+}
+
+
+def parse_scan_report(raw: Any) -> Optional[ScanReport]:
+    """
+    Parse scanner output (raw text or already-decoded JSON) into a ScanReport.
+    Returns None if the output does not contain a usable report.
+    """
+    data = raw if isinstance(raw, dict) else extract_first_json(raw)
+    if not isinstance(data, dict):
+        return None
+
+    detected = data.get("antipatterns_detected")
+    if not isinstance(detected, list):
+        if "total_antipatterns_found" not in data:
+            return None
+        detected = []
+
+    findings = []
+    for item in detected:
+        if isinstance(item, dict) and item.get("name"):
+            findings.append({
+                "name": str(item.get("name", "")).strip(),
+                "location": str(item.get("location", "")).strip(),
+                "description": str(item.get("description", "")).strip(),
+            })
+        elif isinstance(item, str) and item.strip():
+            findings.append({"name": item.strip(), "location": "", "description": ""})
+
+    try:
+        total = int(data.get("total_antipatterns_found", len(findings)))
+    except (TypeError, ValueError):
+        total = len(findings)
+
+    return {
+        "total_antipatterns_found": max(total, len(findings)),
+        "antipatterns_detected": findings,
+    }
+
+
+def finding_names(report: Optional[ScanReport]) -> list:
+    """Sorted, case-insensitive set of the anti-pattern names in a report."""
+    findings = (report or {}).get("antipatterns_detected") or []
+    return sorted({str(f.get("name", "")).strip().lower() for f in findings if isinstance(f, dict)})
@@ -0,0 +1,89 @@
+"""
+Streaming helper that stops generation once the useful output is complete.
+
+The explainer's JSON is often followed by prose that `extract_first_json`
+throws away. Streaming lets us close the request as soon as the first JSON
+object is complete instead of paying for those tokens. Closing the stream is
+reported to callbacks as a GeneratorExit; LLMMetricsCallback (see
+instrumentation.py) records that as a normal, early-stopped call.
+
+Code is not streamed: a stray fence or brace inside Java comments or strings
+would cut the file short.
+"""
+
+import json
+from typing import Optional
+
+
+def _chunk_text(chunk) -> str:
+    content = getattr(chunk, "content", chunk)
+    return content if isinstance(content, str) else str(content or "")
+
+
+def _balanced_end(text: str, start: int) -> Optional[int]:
+    """Index just past the brace that closes the one at `start`, if it is in `text`."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def json_object_end(text: str) -> Optional[int]:
+    """
+    Index just past the first complete JSON object, if any.
+    Balanced braces that are not valid JSON (e.g. in leading prose) are skipped.
+    """
+    start = text.find("{")
+    while start != -1:
+        end = _balanced_end(text, start)
+        if end is None:
+            return None
+        try:
+            json.loads(text[start:end])
+            return end
+        except ValueError:
+            start = text.find("{", start + 1)
+    return None
+
+
+def stream_until_complete(llm, messages) -> str:
+    """
+    Stream a JSON response and stop as soon as the first JSON object is complete
+    (inside a ```json fence or not). Closing the stream cancels the request, so
+    trailing prose is never generated. Falls back to a blocking `invoke` if the
+    model cannot stream.
+    """
+    text = ""
+    stream = None
+    try:
+        stream = iter(llm.stream(messages))
+        for chunk in stream:
+            text += _chunk_text(chunk)
+            end = json_object_end(text)
+            if end is not None:
+                return text[:end]
+        return text
+    except NotImplementedError:
+        response = llm.invoke(messages)
+        return _chunk_text(response)
+    finally:
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
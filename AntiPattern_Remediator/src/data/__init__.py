@@ -2,7 +2,16 @@
 Data processing package
 """
 
-from .database import VectorDBManager, TinyDBManager
-from .trove_helpers import trove_search_context
+from ..lazy_module import make_lazy_module
+
+# Backends are imported on first access, so only the chosen trove's dependencies load
+_EXPORTS = {
+    "VectorDBManager": ".database",
+    "TinyDBManager": ".database",
+    "trove_search_context": ".trove_helpers",
+}
 
 __all__ = ["VectorDBManager", "TinyDBManager", "trove_search_context"]
+
+
+__getattr__, __dir__ = make_lazy_module(__name__, _EXPORTS)
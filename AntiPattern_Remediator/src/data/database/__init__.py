@@ -2,7 +2,15 @@
 Database utilities package
 """
 
-from .vector_db import VectorDBManager
-from .tinydb_manager import TinyDBManager
+from ...lazy_module import make_lazy_module
+
+# Each backend is imported on first access (chromadb is slow to import)
+_EXPORTS = {
+    "VectorDBManager": ".vector_db",
+    "TinyDBManager": ".tinydb_manager",
+}
 
 __all__ = ["VectorDBManager", "TinyDBManager"]
+
+
+__getattr__, __dir__ = make_lazy_module(__name__, _EXPORTS)
@@ -9,11 +9,12 @@ class VectorDBManager:
     This class is responsible for managing the connection to the vector database.
     """
 
-    def __init__(self, persist_dir=None):
+    def __init__(self, persist_dir=None, embedding=None):
         # Initialize the database connection
         self.persist_dir = persist_dir or str(settings.VECTOR_DB_DIR)
         print(self.persist_dir)
-        self.embedding = EmbeddingCreator.create_embedding(
+        # `embedding` overrides the provider's model (e.g. an offline one for benchmarks)
+        self.embedding = embedding or EmbeddingCreator.create_embedding(
             provider=settings.LLM_PROVIDER,
             model_name=settings.EMBEDDING_MODEL
         )
@@ -45,5 +46,5 @@ class VectorDBManager:
         except Exception as e:
             print(f"Error adding documents: {e}")
 
-    def as_retriever(self):
-        return self.db.as_retriever()
+    def as_retriever(self, **kwargs):
+        return self.db.as_retriever(**kwargs)
@@ -6,12 +6,15 @@ def trove_search_context(
     retriever_tool: Optional[object] = None,
     cap: int = 8,
     signature_len: int = 160,
+    per_query: Optional[int] = None,
 ) -> str:
     """
     Fetch Trove docs (retriever OR retriever_tool) and return a compact context string.
     - Prefers a single retriever with .invoke(query) or .get_relevant_documents(query)
     - Falls back to retriever_tool.invoke({"query": ...})
     - Deduplicates by the first `signature_len` chars and caps at `cap`
+    - Optionally keeps at most `per_query` docs per query, so one broad query
+      cannot crowd out the others
     """
     # Normalize & de-dupelication queries (preserve order)
     qlist = [q.strip() for q in queries if q and q.strip()]
@@ -39,7 +42,7 @@ def trove_search_context(
             res = []
 
         if isinstance(res, list):
-            docs.extend(res)
+            docs.extend(res[:per_query] if per_query else res)
         elif res:
             docs.append(_wrap_doc(res))
 
@@ -0,0 +1,30 @@
+"""
+Lazy package exports.
+
+Kept at the top of `src` with no imports of its own, so packages can use it
+without pulling in `src.core.utils` and its dependencies.
+"""
+
+import importlib
+import sys
+
+
+def make_lazy_module(module_name: str, exports: dict):
+    """
+    Build a package's `__getattr__` and `__dir__` for `exports` ({name: relative module}):
+    each export is imported on first access and then cached in the package's globals.
+
+    Usage, in a package __init__.py:
+        __getattr__, __dir__ = make_lazy_module(__name__, {"Name": ".module"})
+    """
+    def __getattr__(name):
+        if name in exports:
+            value = getattr(importlib.import_module(exports[name], module_name), name)
+            setattr(sys.modules[module_name], name, value)
+            return value
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from benchmarks.fake_llm import ScriptedChatModel, scripted_models, transformer_script
+from src.core.utils import run_prechecks, PRECHECK_REVIEW
+from src.core.utils.scan_report import parse_scan_report
+from src.core.utils.streaming import stream_until_complete
+
+CODE = "package p;\n\npublic class A {\n    public int f(int x) {\n        return x * 42;\n    }\n}"
+
+
+def test_invoke_reports_usage_and_counts_calls():
+    model = ScriptedChatModel(script=lambda messages: "pass\nfine")
+
+    response = model.invoke([HumanMessage(content="review this")])
+
+    assert response.content == "pass\nfine"
+    assert response.usage_metadata["output_tokens"] == 2
+    assert model.calls == 1
+
+
+def test_stream_yields_the_whole_response():
+    model = ScriptedChatModel(script=lambda messages: '{"closing_summary": "ok"}\ntrailing prose')
+
+    text = "".join(chunk.content for chunk in model.stream([HumanMessage(content="x")]))
+
+    assert text == '{"closing_summary": "ok"}\ntrailing prose'
+    assert stream_until_complete(model, [HumanMessage(content="x")]) == '{"closing_summary": "ok"}'
+
+
+def test_latency_is_simulated_and_accounted():
+    model = ScriptedChatModel(script=lambda messages: "ok", latency_s=0.01)
+
+    model.invoke([HumanMessage(content="x")])
+
+    assert model.simulated_s >= 0.01
+
+
+def test_transformer_script_adds_a_private_constant_that_passes_prechecks():
+    messages = [SystemMessage(content="refactor"),
+                HumanMessage(content=f"```json\n{{}}\n```\n**Original Java Code:**\n```java\n{CODE}\n```")]
+
+    refactored = transformer_script(messages)[len("```java\n"):-len("\n```")]
+
+    assert "private static final int BENCHMARK_LIMIT = 100;" in refactored
+    assert run_prechecks(CODE, refactored)["decision"] == PRECHECK_REVIEW
+
+
+def test_scanner_script_is_a_valid_report():
+    models = scripted_models()
+
+    report = parse_scan_report(models["scanner"].invoke([HumanMessage(content=CODE)]).content)
+
+    assert report["total_antipatterns_found"] == 1
+    assert set(models) == {"scanner", "strategist", "transformer", "reviewer", "explainer"}
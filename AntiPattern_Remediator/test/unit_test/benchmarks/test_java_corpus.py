@@ -0,0 +1,27 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.java_corpus import generate_corpus
+from src.core.utils.java_checks import parse_java
+
+
+def test_corpus_is_deterministic_and_parses(tmp_path):
+    first = generate_corpus(tmp_path / "a", files=12, repos=3, seed=7)
+    second = generate_corpus(tmp_path / "b", files=12, repos=3, seed=7)
+
+    assert [Path(p).read_text() for p in first] == [Path(p).read_text() for p in second]
+    for path in first:
+        tree, error = parse_java(Path(path).read_text())
+        assert error is None, error
+
+
+def test_files_are_spread_over_repositories_under_clones(tmp_path):
+    paths = generate_corpus(tmp_path, files=6, repos=2)
+
+    repos = {Path(p).relative_to(tmp_path / "clones").parts[0] for p in paths}
+    assert repos == {"bench-repo-0", "bench-repo-1"}
@@ -0,0 +1,65 @@
+import math
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.documents import Document
+
+from benchmarks.retrieval_benchmark import (
+    HashingEmbedding, build_queries, evaluate, load_trove_entries, run_benchmark, synthetic_chunks,
+)
+
+
+def test_entries_from_both_sources_share_labels():
+    entries = load_trove_entries()
+    labels = {e["label"] for e in entries}
+
+    assert "god class" in labels
+    assert sum(1 for e in entries if e["label"] == "god class") == 2  # god_class.json and ap.json
+    assert any(e["id"].startswith("ap") for e in entries)
+
+
+def test_signal_queries_are_labelled():
+    queries = build_queries(load_trove_entries())
+    signal = {q["query"]: q["label"] for q in queries if q["source"] == "signal"}
+
+    assert signal["God Class too many responsibilities large class"] == "god class"
+    assert signal["Generic Exception Handling catch Exception"] == "generic exception handling"
+
+
+def test_evaluate_recall_and_mrr():
+    queries = [{"query": "a", "label": "x"}, {"query": "b", "label": "y"}]
+    results = {
+        "a": [Document(page_content="", metadata={"label": "x"}), Document(page_content="", metadata={"label": "x"})],
+        "b": [Document(page_content="", metadata={"label": "z"}), Document(page_content="", metadata={"label": "y"})],
+    }
+
+    metrics = evaluate(results.get, queries, {"x": 2, "y": 1}, ks=(1, 2))
+
+    assert metrics["recall"] == {"@1": 0.25, "@2": 1.0}
+    assert metrics["mrr"] == 0.75
+
+
+def test_synthetic_chunks_are_deterministic_and_unlabelled():
+    entries = load_trove_entries()
+
+    assert synthetic_chunks(entries, 5, seed=1) == synthetic_chunks(entries, 5, seed=1)
+    assert all(chunk["label"] is None for chunk in synthetic_chunks(entries, 5))
+
+
+def test_hashing_embedding_is_normalised():
+    vector = HashingEmbedding(dimensions=64).embed_query("God Class god class")
+
+    assert math.isclose(sum(v * v for v in vector), 1.0)
+
+
+def test_tinydb_run_reports_metrics():
+    result = run_benchmark(retrievers=("tinydb",), sizes=(50,), ks=(1, 5))[0]
+
+    assert result["trove_size"] == len(load_trove_entries()) + 50
+    assert 0 < result["recall"]["@5"] <= 1
+    assert result["latency_ms"]["p99"] >= result["latency_ms"]["p50"]
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.startup_benchmark import parse_importtime, measure_import
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     colorama.ansi
+import time:       300 |        420 |   colorama
+import time:      1000 |       1420 | main
+"""
+
+
+def test_parse_importtime_depths():
+    entries = parse_importtime(SAMPLE)
+
+    assert [e['module'] for e in entries] == ["colorama.ansi", "colorama", "main"]
+    assert [e['depth'] for e in entries] == [2, 1, 0]
+    assert entries[-1]['cumulative_us'] == 1420
+
+
+def test_main_does_not_import_backends_at_startup():
+    report = measure_import("main")
+
+    assert report['total_ms'] > 0
+    assert report['deferred_imported'] == []
+
+
+def test_provider_factory_imports_no_provider_sdk():
+    report = measure_import("src.core.llm_models")
+
+    assert report['deferred_imported'] == []
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from config.settings import Settings, load_provider_config
+
+
+@pytest.fixture
+def ollama_settings(monkeypatch):
+    for var in ("LLM_PROVIDER", "LLM_MODEL", "LLM_ENDPOINTS"):
+        monkeypatch.delenv(var, raising=False)
+    return Settings(
+        LLM_PROVIDER="ollama",
+        LLM_MODEL="granite3.3:8b",
+        parameters={"temperature": 0.4, "num_ctx": 131072},
+        limits={"max_concurrency": 2},
+        agents={
+            "explainer": {"LLM_MODEL": "granite3.3:2b", "parameters": {"num_ctx": 8192}},
+            "reviewer": {"provider": "vllm"},
+        },
+    )
+
+
+def test_default_and_unlisted_agents_use_the_base_model(ollama_settings):
+    default = ollama_settings.agent_llm_config()
+
+    assert default == ollama_settings.agent_llm_config("transformer")
+    assert default["model"] == "granite3.3:8b"
+    assert ollama_settings.agent_llm_config(default_model="other")["model"] == "other"
+
+
+def test_same_provider_override_merges_parameters(ollama_settings):
+    config = ollama_settings.agent_llm_config("explainer")
+
+    assert config["provider"] == "ollama"
+    assert config["model"] == "granite3.3:2b"
+    assert config["parameters"] == {"temperature": 0.4, "num_ctx": 8192}
+    assert config["limits"] == {"max_concurrency": 2}
+
+
+def test_cross_provider_override_starts_from_that_provider(ollama_settings):
+    config = ollama_settings.agent_llm_config("reviewer")
+    vllm = load_provider_config("vllm")
+
+    assert config["provider"] == "vllm"
+    assert config["model"] == vllm["LLM_MODEL"]
+    assert config["parameters"] == vllm["parameters"]
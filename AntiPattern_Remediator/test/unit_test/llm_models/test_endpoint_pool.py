@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.core.llm_models.endpoint_pool import EndpointPool, LoadBalancedLLM, is_endpoint_failure
+from src.core.llm_models.vllm_provider import _vllm_health_url
+
+
+class EndpointClient:
+    def __init__(self, url, fail_with=None):
+        self.url = url
+        self.fail_with = fail_with
+        self.calls = 0
+        self.callbacks = None
+
+    def invoke(self, prompt):
+        self.calls += 1
+        if self.fail_with:
+            raise self.fail_with
+        return f"{self.url}:{prompt}"
+
+    def stream(self, prompt):
+        if self.fail_with:
+            raise self.fail_with
+        yield from (self.url, prompt)
+
+    def bind(self, **kwargs):
+        return self
+
+
+def _balanced(clients, health_check=lambda url: False):
+    pool = EndpointPool(list(clients), health_url=lambda url: url + "/health", health_check=health_check)
+    return LoadBalancedLLM(clients, pool)
+
+
+def test_least_outstanding_with_round_robin_ties():
+    pool = EndpointPool(["a", "b", "c"], health_url=str)
+
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+
+    assert (first, second) == ("a", "b")
+    assert pool.acquire() == "c"
+    assert pool.acquire() == "a"
+
+
+def test_failover_marks_endpoint_down():
+    clients = {"a": EndpointClient("a", fail_with=ConnectionError("refused")), "b": EndpointClient("b")}
+    llm = _balanced(clients)
+
+    assert llm.invoke("hi") == "b:hi"
+    assert llm.invoke("again") == "b:again"
+    assert clients["a"].calls == 1
+    assert llm.pool.status()["a"] == {"healthy": False, "outstanding": 0}
+
+
+def test_request_errors_are_not_failed_over():
+    clients = {"a": EndpointClient("a", fail_with=ValueError("bad prompt")), "b": EndpointClient("b")}
+
+    with pytest.raises(ValueError):
+        _balanced(clients).invoke("hi")
+    assert clients["b"].calls == 0
+
+
+def test_all_endpoints_down_raises_and_recovers_after_health_check():
+    clients = {"a": EndpointClient("a", fail_with=ConnectionError("refused"))}
+    healthy = {"a/health": False}
+    llm = _balanced(clients, health_check=lambda url: healthy[url])
+    llm.pool.check_interval = 0
+
+    with pytest.raises(ConnectionError):
+        llm.invoke("hi")
+
+    clients["a"].fail_with = None
+    healthy["a/health"] = True
+    assert llm.invoke("hi") == "a:hi"
+
+
+def test_stream_fails_over_before_first_chunk_and_fans_out_attributes():
+    clients = {"a": EndpointClient("a", fail_with=TimeoutError()), "b": EndpointClient("b")}
+    llm = _balanced(clients)
+
+    assert list(llm.stream("x")) == ["b", "x"]
+    llm.callbacks = ["cb"]
+    assert clients["a"].callbacks == clients["b"].callbacks == ["cb"]
+
+
+def test_failure_classification_and_health_urls():
+    class APIConnectionError(Exception):
+        pass
+
+    assert is_endpoint_failure(APIConnectionError())
+    assert not is_endpoint_failure(KeyError("x"))
+    assert _vllm_health_url("http://gpu1:8000/v1/") == "http://gpu1:8000/health"
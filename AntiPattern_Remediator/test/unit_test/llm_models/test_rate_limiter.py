@@ -0,0 +1,111 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.llm_models.rate_limiter import ProviderLimiter, RateLimitedLLM, _SlidingWindow
+
+
+class SlowLLM:
+    """Records the peak number of concurrent calls"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.callbacks = None
+        self.bound = None
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def invoke(self, prompt):
+        self._enter()
+        time.sleep(0.02)
+        self._exit()
+        return prompt.upper()
+
+    async def ainvoke(self, prompt):
+        self._enter()
+        await asyncio.sleep(0.02)
+        self._exit()
+        return prompt.upper()
+
+    def stream(self, prompt):
+        yield from prompt
+
+    def bind(self, **kwargs):
+        self.bound = kwargs
+        return self
+
+
+def test_max_concurrency_caps_threads():
+    llm = SlowLLM()
+    limited = RateLimitedLLM(llm, ProviderLimiter(max_concurrency=2))
+
+    threads = [threading.Thread(target=limited.invoke, args=("x",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert llm.peak == 2
+
+
+def test_max_concurrency_caps_async_calls():
+    llm = SlowLLM()
+    limited = RateLimitedLLM(llm, ProviderLimiter(max_concurrency=3))
+
+    async def run():
+        return await asyncio.gather(*(limited.ainvoke("y") for _ in range(9)))
+
+    assert asyncio.run(run()) == ["Y"] * 9
+    assert llm.peak == 3
+
+
+def test_stream_releases_slot_when_closed_early():
+    limiter = ProviderLimiter(max_concurrency=1)
+    limited = RateLimitedLLM(SlowLLM(), limiter)
+
+    stream = limited.stream("abc")
+    assert next(stream) == "a"
+    stream.close()
+
+    assert limited.invoke("ok") == "OK"
+
+
+def test_sliding_window_reports_wait_until_capacity_frees():
+    window = _SlidingWindow(limit=100)
+    window.add(80, now=0.0)
+
+    assert window.wait_time(20, now=1.0) == 0.0
+    assert window.wait_time(30, now=1.0) == 59.0
+    assert window.wait_time(30, now=60.0) == 0.0
+    # An oversized request is admitted once the window is empty
+    assert window.wait_time(500, now=120.0) == 0.0
+
+
+def test_proxy_delegates_attributes_and_bind():
+    llm = SlowLLM()
+    limiter = ProviderLimiter(max_concurrency=1)
+    limited = RateLimitedLLM(llm, limiter)
+
+    limited.callbacks = ["tracer"]
+    bound = limited.bind(format={"type": "object"})
+
+    assert llm.callbacks == ["tracer"]
+    assert isinstance(bound, RateLimitedLLM)
+    assert llm.bound == {"format": {"type": "object"}}
+    assert ProviderLimiter.from_config(None) is None
@@ -508,6 +508,7 @@ class TestErrorHandlingAndEdgeCases:
             manager.ANTIPATTERN_SCANNER = "antipattern_scanner"
             manager.REFACTOR_STRATEGIST = "refactor_strategist" 
             manager.CODE_TRANSFORMER = "code_transformer"
+            manager.CODE_TRANSFORMER_PATCH = "code_transformer_patch"
             manager.CODE_REVIEWER = "code_reviewer"
             manager.EXPLAINER = "explainer"
             manager.prompt_directory = Path("/non/existent/path")
@@ -603,6 +604,7 @@ class TestPromptLoadingIntegration:
             manager.ANTIPATTERN_SCANNER = "antipattern_scanner"
             manager.REFACTOR_STRATEGIST = "refactor_strategist"
             manager.CODE_TRANSFORMER = "code_transformer"
+            manager.CODE_TRANSFORMER_PATCH = "code_transformer_patch"
             manager.CODE_REVIEWER = "code_reviewer"
             manager.EXPLAINER = "explainer"
             manager.prompt_directory = temp_prompt_files
@@ -644,6 +646,7 @@ class TestPromptLoadingIntegration:
                 manager.ANTIPATTERN_SCANNER = "antipattern_scanner"
                 manager.REFACTOR_STRATEGIST = "refactor_strategist"
                 manager.CODE_TRANSFORMER = "code_transformer"
+                manager.CODE_TRANSFORMER_PATCH = "code_transformer_patch"
                 manager.CODE_REVIEWER = "code_reviewer"
                 manager.EXPLAINER = "explainer"
                 manager.prompt_directory = temp_path
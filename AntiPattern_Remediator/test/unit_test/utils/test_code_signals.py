@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.utils.code_signals import (
+    extract_code_signals,
+    build_trove_queries,
+    detect_hints,
+    FALLBACK_QUERY,
+)
+
+SMELLY_CODE = """
+package demo;
+
+public class OrderService {
+    private static final int LIMIT = 250;
+
+    public int price(int quantity) {
+        try {
+            if (quantity > 17) {
+                return quantity * 42 + 99;
+            }
+        } catch (Exception e) {
+        }
+        return LIMIT;
+    }
+}
+"""
+
+
+def test_extract_code_signals_detects_handlers_and_literals():
+    signals = extract_code_signals(SMELLY_CODE)
+
+    assert signals["parsed"] is True
+    assert signals["method_count"] == 1
+    assert signals["catch_all_handlers"] == 1
+    assert signals["empty_catch_blocks"] == 1
+    # 17, 42 and 99 are magic; LIMIT's 250 is a named constant
+    assert signals["magic_numbers"] == 3
+
+
+def test_extract_code_signals_tolerates_unparsable_code():
+    signals = extract_code_signals("this is not java {")
+
+    assert signals["parsed"] is False
+    assert signals["method_count"] == 0
+
+
+def test_build_trove_queries_targets_detected_hints():
+    signals = extract_code_signals(SMELLY_CODE)
+
+    queries = build_trove_queries(signals)
+
+    assert detect_hints(signals) == ["catch_all", "swallowed_exception", "magic_constants"]
+    assert any("Generic Exception" in q for q in queries)
+    assert any("Magic Constants" in q for q in queries)
+
+
+def test_build_trove_queries_caps_and_falls_back():
+    big = {"method_count": 30, "max_nesting": 6, "max_cc": 20, "catch_all_handlers": 2, "magic_numbers": 9}
+
+    assert len(build_trove_queries(big, max_queries=2)) == 2
+    assert build_trove_queries(extract_code_signals("")) == [FALLBACK_QUERY]
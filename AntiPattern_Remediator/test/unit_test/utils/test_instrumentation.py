@@ -0,0 +1,71 @@
+import json
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from src.core.utils.instrumentation import WorkflowInstrumentation
+
+
+def test_node_and_llm_records_are_attributed_to_file_and_node(tmp_path):
+    instrumentation = WorkflowInstrumentation()
+    llm = FakeListChatModel(responses=["ok"], callbacks=[instrumentation.callback])
+
+    def node(state):
+        llm.invoke("hello")
+        return state
+
+    wrapped = instrumentation.wrap_node("analyze", node)
+    wrapped({"current_file_path": "A.java"})
+
+    llm_record = next(r for r in instrumentation.records if r["event"] == "llm")
+    node_record = next(r for r in instrumentation.records if r["event"] == "node")
+    assert (llm_record["file"], llm_record["node"]) == ("A.java", "analyze")
+    assert (node_record["file"], node_record["node"]) == ("A.java", "analyze")
+
+    summary = instrumentation.summary()
+    assert summary["nodes"]["analyze"]["calls"] == 1
+    assert summary["llm"]["calls"] == 1
+    assert summary["slowest_files"][0]["file"] == "A.java"
+
+    out = tmp_path / "metrics.jsonl"
+    instrumentation.export_jsonl(out)
+    assert [json.loads(line)["event"] for line in out.read_text().splitlines()] == ["llm", "node"]
+
+
+def test_timed_retriever_records_latency():
+    instrumentation = WorkflowInstrumentation()
+
+    class Retriever:
+        def invoke(self, query, **kwargs):
+            return [query]
+
+    retriever = instrumentation.wrap_retriever(Retriever())
+
+    assert retriever.invoke("god class") == ["god class"]
+    assert instrumentation.summary()["retrieval"]["calls"] == 1
+
+
+def test_stream_stopped_early_is_recorded_as_a_normal_call_with_usage():
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+    from src.core.utils.streaming import stream_until_complete
+
+    instrumentation = WorkflowInstrumentation()
+    response = AIMessage(content='{"closing_summary": "Introduced a constant"} and then a lot of trailing prose')
+    llm = GenericFakeChatModel(messages=iter([response]), callbacks=[instrumentation.callback])
+
+    text = stream_until_complete(llm, "explain the change")
+
+    assert text == '{"closing_summary": "Introduced a constant"}'
+    record = next(r for r in instrumentation.records if r["event"] == "llm")
+    assert record["error"] is None
+    assert record["stopped_early"] is True
+    assert record["prompt_tokens"] > 0 and record["completion_tokens"] > 0
+    summary = instrumentation.summary()["llm"]
+    assert summary["errors"] == 0
+    assert summary["completion_tokens"] == record["completion_tokens"]
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.utils.java_checks import (
+    run_prechecks,
+    public_api_signatures,
+    parse_java,
+    PRECHECK_FAIL,
+    PRECHECK_NOOP,
+    PRECHECK_REVIEW,
+)
+
+ORIGINAL = """
+package demo;
+
+public class Account {
+    private int balance;
+
+    public Account(int balance) { this.balance = balance; }
+
+    public int deposit(int amount) {
+        balance += amount;
+        return balance;
+    }
+
+    private void audit() { }
+}
+"""
+
+
+def test_public_api_signatures_skip_private_members():
+    tree, _ = parse_java(ORIGINAL)
+
+    assert public_api_signatures(tree) == {"Account(int)", "int Account.deposit(int)"}
+
+
+def test_run_prechecks_detects_noop_changes():
+    result = run_prechecks(ORIGINAL, ORIGINAL.replace("\n\n", "\n") + "   \n")
+
+    assert result["decision"] == PRECHECK_NOOP
+
+
+def test_run_prechecks_fails_on_syntax_errors():
+    result = run_prechecks(ORIGINAL, ORIGINAL.replace("return balance;", "return balance"))
+
+    assert result["decision"] == PRECHECK_FAIL
+    assert "does not parse" in result["reason"]
+
+
+def test_run_prechecks_fails_on_public_api_changes():
+    result = run_prechecks(ORIGINAL, ORIGINAL.replace("deposit(int amount)", "deposit(long amount)"))
+
+    assert result["decision"] == PRECHECK_FAIL
+    assert "int Account.deposit(int)" in result["reason"]
+
+
+def test_run_prechecks_sends_valid_changes_to_review():
+    refactored = ORIGINAL.replace("private void audit() { }", "private void audit() { balance = balance; }")
+
+    assert run_prechecks(ORIGINAL, refactored)["decision"] == PRECHECK_REVIEW
+    assert run_prechecks(ORIGINAL, "")["decision"] == PRECHECK_FAIL
@@ -0,0 +1,182 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.core.utils.java_compiler as java_compiler
+from src.core.agents.code_reviewer import CodeReviewerAgent
+from src.core.graph.conditional_edges import ConditionalEdges, MAX_REVIEW_TIMES
+from src.core.utils import PRECHECK_FAIL, PRECHECK_REVIEW
+from src.core.utils.java_compiler import JavaCompileChecker, CLASSPATH_CACHE_FILE, MAX_ERROR_CHARS
+
+SOURCE = "package demo.app;\n\npublic class Account {}\n"
+
+
+class FakeRun:
+    """Stands in for subprocess.run: Maven writes a classpath file, javac returns `javac_result`"""
+
+    def __init__(self, javac_result=None, javac_error=None):
+        self.commands = []
+        self.javac_result = javac_result or (0, "")
+        self.javac_error = javac_error
+
+    def __call__(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        if cmd[0].startswith("mvn"):
+            output_file = next(arg.split("=", 1)[1] for arg in cmd if arg.startswith("-Dmdep.outputFile="))
+            Path(output_file).write_text(os.pathsep.join(["/m2/a.jar", "/m2/b.jar"]), encoding="utf-8")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+        if self.javac_error is not None:
+            raise self.javac_error
+        returncode, stderr = self.javac_result
+        source_file = cmd[-1]
+        return subprocess.CompletedProcess(cmd, returncode, "", stderr.replace("{source}", source_file))
+
+    def count(self, tool):
+        return sum(1 for cmd in self.commands if cmd[0].startswith(tool))
+
+
+def _module(tmp_path, built=True):
+    """A Maven module with a source file; `built` adds target/classes."""
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    (tmp_path / "pom.xml").write_text("<project/>", encoding="utf-8")
+    if built:
+        (tmp_path / "target" / "classes").mkdir(parents=True)
+    source = tmp_path / "src" / "main" / "java" / "demo" / "app" / "Account.java"
+    source.parent.mkdir(parents=True)
+    source.write_text(SOURCE, encoding="utf-8")
+    return source
+
+
+def _tools(monkeypatch, fake_run, javac=True, mvn=True):
+    available = {"javac": javac, "mvn": mvn, "mvn.cmd": mvn}
+    monkeypatch.setattr(java_compiler.shutil, "which", lambda name: f"/usr/bin/{name}" if available.get(name) else None)
+    monkeypatch.setattr(java_compiler.subprocess, "run", fake_run)
+
+
+def test_find_module_root_picks_the_nearest_pom(tmp_path):
+    source = _module(tmp_path)
+    nested = tmp_path / "sub"
+    (nested / "src").mkdir(parents=True)
+    (nested / "pom.xml").write_text("<project/>", encoding="utf-8")
+
+    assert JavaCompileChecker.find_module_root(str(source)) == tmp_path.resolve()
+    assert JavaCompileChecker.find_module_root(str(nested / "src" / "A.java")) == nested.resolve()
+
+
+def test_classpath_is_resolved_once_per_module(tmp_path, monkeypatch):
+    _module(tmp_path)
+    fake_run = FakeRun()
+    _tools(monkeypatch, fake_run)
+    checker = JavaCompileChecker()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(checker.get_classpath(tmp_path))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = os.pathsep.join([str(tmp_path / "target" / "classes"), "/m2/a.jar", "/m2/b.jar"])
+    assert results == [expected] * 4
+    assert fake_run.count("mvn") == 1
+    # A fresh checker reuses the cached file instead of running Maven again
+    assert JavaCompileChecker().get_classpath(tmp_path) == expected
+    assert fake_run.count("mvn") == 1
+    assert (tmp_path / "target" / CLASSPATH_CACHE_FILE).exists()
+
+
+def test_compile_is_skipped_without_javac_pom_or_build(tmp_path, monkeypatch):
+    source = _module(tmp_path / "built")
+    unbuilt = _module(tmp_path / "unbuilt", built=False)
+    loose = tmp_path / "loose" / "A.java"
+    fake_run = FakeRun()
+
+    _tools(monkeypatch, fake_run, javac=False)
+    assert JavaCompileChecker().compile_source(str(source), SOURCE)["status"] == "skipped"
+
+    _tools(monkeypatch, fake_run)
+    assert JavaCompileChecker().compile_source(str(loose), SOURCE) == {
+        "status": "skipped", "output": "No Maven module found for file"}
+    assert JavaCompileChecker().compile_source(str(unbuilt), SOURCE)["status"] == "skipped"
+    assert fake_run.count("javac") == 0
+
+
+def test_compile_ok_passes_the_module_classpath(tmp_path, monkeypatch):
+    source = _module(tmp_path)
+    fake_run = FakeRun()
+    _tools(monkeypatch, fake_run)
+
+    assert JavaCompileChecker().compile_source(str(source), SOURCE) == {"status": "ok", "output": ""}
+    javac = next(cmd for cmd in fake_run.commands if cmd[0] == "javac")
+    assert javac[javac.index("-cp") + 1].startswith(str(tmp_path / "target" / "classes"))
+    assert Path(javac[-1]).parts[-3:] == ("demo", "app", "Account.java")
+
+
+def test_compile_errors_name_the_original_file_and_are_truncated(tmp_path, monkeypatch):
+    source = _module(tmp_path)
+    error = "{source}:3: error: cannot find symbol\n" + "x" * MAX_ERROR_CHARS
+    _tools(monkeypatch, FakeRun(javac_result=(1, error)))
+
+    result = JavaCompileChecker().compile_source(str(source), SOURCE)
+
+    assert result["status"] == "error"
+    assert result["output"].startswith("Account.java:3: error: cannot find symbol")
+    assert len(result["output"]) == MAX_ERROR_CHARS
+
+
+def test_javac_timeout_skips_the_check(tmp_path, monkeypatch):
+    source = _module(tmp_path)
+    _tools(monkeypatch, FakeRun(javac_error=subprocess.TimeoutExpired("javac", 1)))
+
+    assert JavaCompileChecker(timeout=1).compile_source(str(source), SOURCE) == {
+        "status": "skipped", "output": "javac timed out"}
+
+
+class FakeChecker:
+    def __init__(self, result):
+        self.result = result
+
+    def compile_source(self, file_path, source):
+        return self.result
+
+
+def _state(review_times=0):
+    return {"current_file_path": "Account.java", "refactored_code": SOURCE, "code_review_times": review_times,
+            "msgs": [], "precheck_results": None, "code_review_results": None}
+
+
+def test_compile_errors_route_back_to_the_transformer():
+    reviewer = CodeReviewerAgent(model=None, prompt_manager=None,
+                                 compile_checker=FakeChecker({"status": "error", "output": "Account.java:3: error"}))
+    edges = ConditionalEdges()
+
+    state = reviewer.compile_check(_state())
+
+    assert state["compile_results"] == "error"
+    assert state["precheck_results"] == PRECHECK_FAIL
+    assert state["code_review_times"] == 1
+    assert state["code_review_results"].startswith("fail\nCompilation check: The refactored code does not compile")
+    assert "Account.java:3: error" in state["msgs"][-1].content
+    assert edges.precheck_condition(state) == "transform_code"
+    # The failed round counts, so the loop still ends after the last review round
+    assert edges.precheck_condition(reviewer.compile_check(_state(MAX_REVIEW_TIMES))) == "pass"
+
+
+def test_successful_or_skipped_compile_goes_on_to_review():
+    edges = ConditionalEdges()
+    for result in ({"status": "ok", "output": ""}, {"status": "skipped", "output": "javac not found in PATH"}):
+        state = CodeReviewerAgent(model=None, prompt_manager=None, compile_checker=FakeChecker(result)).compile_check(
+            {**_state(), "precheck_results": PRECHECK_REVIEW})
+        assert state["compile_results"] == result["status"]
+        assert state["code_review_times"] == 0
+        assert edges.precheck_condition(state) == "review_code"
+
+    state = CodeReviewerAgent(model=None, prompt_manager=None).compile_check(_state())
+    assert state["compile_results"] == "skipped"
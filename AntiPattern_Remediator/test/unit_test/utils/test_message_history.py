@@ -0,0 +1,100 @@
+import json
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.core.agents.code_transformer import CodeTransformer
+from src.core.prompt import PromptManager
+from src.core.utils.message_history import bounded_history
+
+
+def _round(n, text):
+    return HumanMessage(content=f"Code Review Feedback (Round {n}): fail\n{text}")
+
+
+def test_short_history_is_unchanged():
+    msgs = [_round(1, "rename things")]
+    assert bounded_history(msgs) == msgs
+    assert bounded_history([]) == []
+
+
+def test_earlier_rounds_are_summarised_and_latest_kept_verbatim():
+    msgs = [_round(1, "x" * 1000), _round(2, "missing method"), _round(3, "still missing")]
+
+    history = bounded_history(msgs, keep_last=1, summary_chars=80)
+
+    assert len(history) == 2
+    assert history[1] is msgs[2]
+    summary = history[0].content
+    assert "Round 1" in summary and "Round 2" in summary and "Round 3" not in summary
+    assert all(len(line) <= 82 for line in summary.splitlines()[1:])
+
+
+def test_summary_size_stays_bounded_as_rounds_grow():
+    sizes = []
+    for rounds in (3, 6, 12):
+        msgs = [_round(n, "y" * 2000) for n in range(1, rounds + 1)]
+        sizes.append(sum(len(m.content) for m in bounded_history(msgs)))
+    per_round_growth = (sizes[2] - sizes[1]) / 6
+    assert per_round_growth < 200
+
+
+ORIGINAL = "public class Report {\n" + "".join(
+    f"    public int total{i}(int[] v) {{ int t = 0; for (int x : v) t += x * {i}; return t; }}\n" for i in range(30)
+) + "}\n"
+ATTEMPT = ORIGINAL.replace("int t = 0;", "int t = INITIAL;").replace("{\n", "{\n    private static final int INITIAL = 0;\n", 1)
+STRATEGY = json.dumps({"strategies": [
+    {"antipattern": "Magic Constants", "steps": ["Introduce a named constant for every literal multiplier"] * 6},
+    {"antipattern": "Duplicated Code", "steps": ["Extract the shared loop into one helper taking the factor"] * 6},
+]}, indent=2)
+
+
+class RecordingLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def invoke(self, messages):
+        self.prompts.append(messages)
+        return AIMessage(content=self.reply)
+
+
+def _prompt_manager():
+    """The shipped transformer prompt, loaded without the global settings"""
+    manager = PromptManager.__new__(PromptManager)
+    manager.CODE_TRANSFORMER = "code_transformer"
+    manager.CODE_TRANSFORMER_PATCH = "code_transformer_patch"
+    manager.prompt_directory = project_root / "static" / "prompt"
+    manager._prompt_cache = {}
+    manager._load_prompt_from_yaml("code_transformer.yaml", manager.CODE_TRANSFORMER)
+    return manager
+
+
+def _prompt_chars(messages):
+    return sum(len(m.content) for m in messages)
+
+
+def test_revision_prompt_is_smaller_than_the_first_round():
+    llm = RecordingLLM(ATTEMPT)
+    transformer = CodeTransformer(llm, _prompt_manager())
+    state = {"code": ORIGINAL, "refactoring_strategy_results": STRATEGY, "msgs": [],
+             "refactored_code": None, "code_review_times": 0}
+
+    state = transformer.transform_code(state)
+    state["msgs"].append(_round(1, "fail\nThe constant is declared but the duplicated loops were not extracted."))
+    state["code_review_times"] = 1
+    transformer.transform_code(state)
+
+    first, revision = llm.prompts
+    assert _prompt_chars(revision) < _prompt_chars(first)
+    revision_text = "\n".join(m.content for m in revision)
+    # Only the previous attempt and the feedback: no original file, no strategy, no diff
+    assert ATTEMPT in revision_text and "duplicated loops" in revision_text
+    assert ORIGINAL not in revision_text and "Magic Constants" not in revision_text
+    assert "previous refactoring attempt" in revision[-1].content
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.utils.patching import parse_search_replace_blocks, apply_search_replace
+
+CODE = """public class Account {
+    private double balance;
+
+    public void deposit(double amount) {
+        if (amount > 0) {
+            balance = balance + amount;
+        }
+    }
+
+    public double getBalance() {
+        return balance;
+    }
+}
+"""
+
+RESPONSE = """<<<<<<< SEARCH
+            balance = balance + amount;
+=======
+            balance += amount;
+>>>>>>> REPLACE
+<<<<<<< SEARCH
+    public double getBalance() {
+=======
+    public void withdraw(double amount) {
+        balance -= amount;
+    }
+
+    public double getBalance() {
+>>>>>>> REPLACE
+"""
+
+
+def test_parse_blocks_in_order():
+    blocks = parse_search_replace_blocks(RESPONSE)
+
+    assert len(blocks) == 2
+    assert blocks[0] == ("            balance = balance + amount;\n", "            balance += amount;\n")
+    assert parse_search_replace_blocks("public class A {}") == []
+
+
+def test_apply_exact_blocks():
+    patched, errors = apply_search_replace(CODE, parse_search_replace_blocks(RESPONSE))
+
+    assert errors == []
+    assert "balance += amount;" in patched
+    assert "public void withdraw(double amount)" in patched
+    assert patched.index("withdraw") < patched.index("getBalance")
+
+
+def test_apply_tolerates_indentation_and_small_slips():
+    blocks = [
+        ("balance = balance + amount;\n", "balance += amount;\n"),  # indentation dropped
+        ("    public double getBalanse() {\n        return balance;\n", "    public double getBalance() {\n        return this.balance;\n"),
+    ]
+
+    patched, errors = apply_search_replace(CODE, blocks)
+
+    assert errors == []
+    assert patched == CODE.replace(
+        "            balance = balance + amount;", "            balance += amount;"
+    ).replace("        return balance;", "        return this.balance;")
+
+
+def test_block_must_match_whole_lines():
+    # "balance;" only occurs inside longer lines
+    patched, errors = apply_search_replace(CODE, [("balance;\n", "total;\n")])
+
+    assert patched == CODE
+    assert len(errors) == 1 and "did not match" in errors[0]
+
+
+def test_ambiguous_block_is_rejected():
+    code = "class A {\n    void a() {\n        run();\n    }\n    void b() {\n        run();\n    }\n}\n"
+
+    patched, errors = apply_search_replace(code, [("        run();\n", "        stop();\n")])
+
+    assert patched == code
+    assert len(errors) == 1 and "matches 2 places" in errors[0]
+
+
+def test_unmatched_block_is_reported_and_skipped():
+    patched, errors = apply_search_replace(CODE, [("public void close() {\n", "")])
+
+    assert patched == CODE
+    assert len(errors) == 1 and "Hunk 1" in errors[0]
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.utils.scan_report import parse_scan_report
+from src.core.agents.refactor_strategist import RefactorStrategist
+from workflow.workflow_utils import parse_antipattern_results
+
+
+def test_parse_scan_report_reads_fenced_json():
+    raw = """Here is the analysis:
+```json
+{"total_antipatterns_found": 2,
+ "antipatterns_detected": [
+   {"name": "God Class", "location": "OrderService", "description": "Too much"},
+   {"name": "Magic Constants", "location": "price()", "description": "42"}
+ ]}
+```"""
+
+    report = parse_scan_report(raw)
+
+    assert report["total_antipatterns_found"] == 2
+    assert [f["name"] for f in report["antipatterns_detected"]] == ["God Class", "Magic Constants"]
+
+
+def test_parse_scan_report_normalises_inconsistent_counts():
+    report = parse_scan_report('{"total_antipatterns_found": 0, "antipatterns_detected": ["Deep Nesting"]}')
+
+    assert report["total_antipatterns_found"] == 1
+    assert report["antipatterns_detected"][0] == {"name": "Deep Nesting", "location": "", "description": ""}
+
+
+def test_parse_scan_report_rejects_prose():
+    assert parse_scan_report("No JSON here") is None
+
+
+def test_downstream_consumers_use_the_report():
+    report = parse_scan_report('{"total_antipatterns_found": 1, "antipatterns_detected": [{"name": "Middle Man"}]}')
+    strategist = RefactorStrategist(model=None, prompt_manager=None)
+
+    assert strategist._build_queries_from_findings(report) == ["Middle Man"]
+    assert parse_antipattern_results(report) == (True, 1)
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.utils.streaming import stream_until_complete, json_object_end
+
+
+class ScriptedStreamingModel:
+    """Yields fixed chunks and records how many were consumed"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def stream(self, messages):
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+def test_stream_stops_after_fenced_json_object():
+    llm = ScriptedStreamingModel(["```json\n", '{"a": 1', "}\n", "```", "\nExplanation: ", "lots of prose"])
+
+    text = stream_until_complete(llm, [])
+
+    assert text == '```json\n{"a": 1}'
+    assert llm.consumed == 3
+    assert llm.closed
+
+
+def test_stream_stops_after_unfenced_json_object():
+    llm = ScriptedStreamingModel(['{"items": [', '{"s": "a } b"}', "]}", " trailing"])
+
+    assert stream_until_complete(llm, []) == '{"items": [{"s": "a } b"}]}'
+    assert llm.consumed == 3
+
+
+def test_balanced_braces_that_are_not_json_do_not_stop_the_stream():
+    llm = ScriptedStreamingModel(["Replaced {magic} numbers. ", '{"a": ', "1}", " trailing"])
+
+    assert stream_until_complete(llm, []) == 'Replaced {magic} numbers. {"a": 1}'
+    assert llm.consumed == 3
+
+
+def test_stream_returns_everything_when_no_object_closes():
+    llm = ScriptedStreamingModel(['{"a": ', "[1, 2"])
+
+    assert stream_until_complete(llm, []) == '{"a": [1, 2'
+    assert llm.closed
+    assert json_object_end('{"a": "\\"}"') is None
@@ -0,0 +1,84 @@
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.backup_manager import create_repository_backup, load_backup_info, restore_repository_backup
+
+
+def _make_repo(tmp_path):
+    repo = tmp_path / "clones" / "demo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "src" / "A.java").write_text("class A {}\n")
+    (repo / "src" / "B.java").write_text("class B {}\n")
+    (repo / "target").mkdir()
+    (repo / "target" / "big.jar").write_bytes(b"0" * 1024)
+    return repo
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def test_snapshot_backs_up_only_slated_files_and_restores_them(tmp_path):
+    repo = _make_repo(tmp_path)
+    slated = [str(repo / "src" / "A.java")]
+
+    info = create_repository_backup({str(repo)}, str(tmp_path / "backups"), mode="snapshot", file_paths=slated)
+    (repo / "src" / "A.java").write_text("class A { /* refactored */ }\n")
+
+    entry = info['backed_up_repos'][0]
+    backed_up = [p.name for p in Path(entry['backup_path']).rglob("*") if p.is_file()]
+    assert backed_up == ["A.java"]
+    assert [f['path'] for f in entry['files']] == ["src/A.java"]
+
+    result = restore_repository_backup(load_backup_info(info['backup_dir']))
+
+    assert result['failed'] == []
+    assert (repo / "src" / "A.java").read_text() == "class A {}\n"
+
+
+def test_copy_mode_copies_whole_repository(tmp_path):
+    repo = _make_repo(tmp_path)
+
+    info = create_repository_backup({str(repo)}, str(tmp_path / "backups"), mode="copy")
+    (repo / "src" / "B.java").write_text("changed")
+    restore_repository_backup(info, file_paths=[str(repo / "src" / "B.java")])
+
+    assert (Path(info['backed_up_repos'][0]['backup_path']) / "target" / "big.jar").exists()
+    assert (repo / "src" / "B.java").read_text() == "class B {}\n"
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_git_mode_restores_tracked_and_untracked_files(tmp_path):
+    repo = _make_repo(tmp_path)
+    _git(repo, "init", "-q")
+    _git(repo, "add", "src/A.java")
+    _git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init")
+    (repo / "src" / "A.java").write_text("class A { int uncommitted; }\n")  # Dirty tracked file
+    slated = [str(repo / "src" / "A.java"), str(repo / "src" / "B.java")]  # B.java is untracked
+
+    info = create_repository_backup({str(repo)}, str(tmp_path / "backups"), mode="git", file_paths=slated)
+    entry = info['backed_up_repos'][0]
+    assert entry['tracked_files'] == ["src/A.java"]
+    assert [f['path'] for f in entry['files']] == ["src/B.java"]
+
+    (repo / "src" / "A.java").write_text("refactored A")
+    (repo / "src" / "B.java").write_text("refactored B")
+    result = restore_repository_backup(info)
+
+    assert result['restored'] == [{'repo_path': str(repo), 'files': 2}]
+    assert (repo / "src" / "A.java").read_text() == "class A { int uncommitted; }\n"
+    assert (repo / "src" / "B.java").read_text() == "class B {}\n"
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_repository_backup(set(), str(tmp_path), mode="rsync")
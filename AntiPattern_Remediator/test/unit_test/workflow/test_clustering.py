@@ -0,0 +1,197 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.agents.refactor_strategist import RefactorStrategist
+from workflow.clustering import (
+    StrategyCache, cluster_files, identifier_mapping, normalized_tokens, rename_identifiers,
+)
+
+
+def _dao(entity: str, table: str, limit: int) -> str:
+    return f"""
+public class {entity}Dao {{
+    private final Connection connection;
+
+    public {entity}Dao(Connection connection) {{
+        this.connection = connection;
+    }}
+
+    public List<{entity}> findAll() throws SQLException {{
+        List<{entity}> result = new ArrayList<>();
+        try (PreparedStatement statement = connection.prepareStatement("SELECT * FROM {table} LIMIT {limit}")) {{
+            ResultSet rows = statement.executeQuery();
+            while (rows.next()) {{
+                result.add(new {entity}(rows.getLong("id"), rows.getString("name")));
+            }}
+        }}
+        return result;
+    }}
+
+    public void delete(long id) throws SQLException {{
+        try (PreparedStatement statement = connection.prepareStatement("DELETE FROM {table} WHERE id = ?")) {{
+            statement.setLong(1, id);
+            statement.executeUpdate();
+        }}
+    }}
+}}
+"""
+
+
+HANDLER = """
+public class EventHandler {
+    public int handle(int[] events) {
+        int total = 0;
+        for (int i = 0; i < events.length; i++) {
+            if (events[i] > 10) {
+                if (events[i] % 2 == 0) {
+                    total += events[i] / 2;
+                } else {
+                    total -= 1;
+                }
+            }
+        }
+        switch (total) {
+            case 0: return -1;
+            default: return total;
+        }
+    }
+}
+"""
+
+
+class RecordingWriter:
+    def submit(self, file_path, final_state):
+        pass
+
+
+def _write(tmp_path: Path, name: str, code: str) -> str:
+    path = tmp_path / name
+    path.write_text(code, encoding="utf-8")
+    return str(path)
+
+
+def test_identifiers_and_literal_values_are_normalised():
+    assert normalized_tokens('int a = 42; String s = "x";') == normalized_tokens('int b = 7; String t = "yz";')
+    assert normalized_tokens("return true;") != normalized_tokens("return null;")
+
+
+def test_structurally_similar_files_cluster_around_the_first(tmp_path):
+    user = _write(tmp_path, "UserDao.java", _dao("User", "users", 100))
+    handler = _write(tmp_path, "EventHandler.java", HANDLER)
+    order = _write(tmp_path, "OrderDao.java", _dao("Order", "orders", 50))
+    tiny = _write(tmp_path, "Tiny.java", "class Tiny {}")
+    tiny_copy = _write(tmp_path, "TinyCopy.java", "class TinyCopy {}")
+
+    clusters = cluster_files([user, handler, order, tiny, tiny_copy])
+
+    assert clusters == {user: [order]}
+
+
+def _state(path, names, seed=None):
+    return {
+        "current_file_path": path,
+        "antipatterns_scan_report": {"total_antipatterns_found": len(names),
+                                     "antipatterns_detected": [{"name": name} for name in names]},
+        "strategy_seed": seed,
+        "refactoring_strategy_results": None,
+        "trove_context": None,
+    }
+
+
+def test_strategy_cache_seeds_members_once_the_representative_is_done():
+    cache = StrategyCache({"UserDao.java": ["OrderDao.java"]})
+    seeds = []
+    member = threading.Thread(target=lambda: seeds.append(cache.seed_for("OrderDao.java", _dao("Order", "orders", 50))))
+    member.start()
+    member.join(timeout=0.2)
+    assert member.is_alive()  # Held until the representative is done
+
+    done = {**_state("UserDao.java", ["God Class"]), "code": _dao("User", "users", 100),
+            "refactoring_strategy_results": "Split UserDao: move findAll(List<User>) into UserFinder",
+            "trove_context": "trove"}
+    cache.record("UserDao.java", done)
+    cache.done("UserDao.java")
+    member.join(timeout=5)
+
+    assert seeds == [{"source": "UserDao.java", "strategy": "Split OrderDao: move findAll(List<Order>) into UserFinder",
+                      "trove_context": "trove", "antipatterns": ["god class"]}]
+    assert cache.seed_for("UserDao.java") is None
+    cache.record("OrderDao.java", _state("OrderDao.java", ["God Class"], seed=seeds[0]))
+    assert cache.stats() == {"clustered": 1, "reused": 1}
+
+
+def test_members_of_a_failed_representative_get_no_seed():
+    cache = StrategyCache({"UserDao.java": ["OrderDao.java"]})
+    cache.done("UserDao.java")
+
+    assert cache.seed_for("OrderDao.java", _dao("Order", "orders", 50)) is None
+
+
+def test_identifiers_are_mapped_by_position():
+    mapping = identifier_mapping(_dao("User", "users", 100), _dao("Order", "orders", 50))
+
+    assert mapping == {"UserDao": "OrderDao", "User": "Order"}
+    assert rename_identifiers("UserDao returns User, not Users or $User", mapping) == \
+        "OrderDao returns Order, not Users or $User"
+
+
+def test_concurrent_members_reuse_their_representatives_strategy(tmp_path):
+    from full_repo_workflow import process_java_files_with_workflow
+
+    user = _write(tmp_path, "UserDao.java", _dao("User", "users", 100))
+    order = _write(tmp_path, "OrderDao.java", _dao("Order", "orders", 50))
+    item = _write(tmp_path, "ItemDao.java", _dao("Item", "items", 10))
+    cache = StrategyCache(cluster_files([user, order, item]))
+
+    class SlowStrategistGraph:
+        def __init__(self):
+            self.seeds = {}
+
+        def invoke(self, state):
+            path = state["current_file_path"]
+            self.seeds[path] = state["strategy_seed"]
+            if state["strategy_seed"] is None:
+                time.sleep(0.2)  # The representative's strategy takes a while
+            return {**state, "refactoring_strategy_results": "Split UserDao" if path == user else "reused",
+                    "antipatterns_scan_report": {"total_antipatterns_found": 1,
+                                                 "antipatterns_detected": [{"name": "God Class"}]}}
+
+    graph = SlowStrategistGraph()
+    process_java_files_with_workflow([user, order, item], SimpleNamespace(TARGETED_TESTS_ENABLED=False), None, None,
+                                     graph, results_writer=RecordingWriter(), concurrency=3, strategy_cache=cache)
+
+    assert graph.seeds[user] is None
+    assert graph.seeds[order]["strategy"] == "Split OrderDao"
+    assert graph.seeds[item]["strategy"] == "Split ItemDao"
+    assert cache.stats() == {"clustered": 2, "reused": 2}
+
+
+def test_strategist_reuses_a_matching_seed_without_calling_the_llm():
+    seed = {"source": "UserDao.java", "strategy": "Split the class", "trove_context": "trove",
+            "antipatterns": ["god class"]}
+    strategist = RefactorStrategist(model=None, prompt_manager=None)
+
+    state = strategist.strategize_refactoring(_state("OrderDao.java", ["GOD CLASS"], seed=seed))
+
+    assert state["refactoring_strategy_results"] == "Split the class"
+    assert state["trove_context"] == "trove"
+    assert state["strategy_seed"] == seed
+
+
+def test_strategist_ignores_a_seed_for_different_findings():
+    seed = {"source": "UserDao.java", "strategy": "Split the class", "trove_context": "trove",
+            "antipatterns": ["god class"]}
+    strategist = RefactorStrategist(model=None, prompt_manager=None)
+
+    state = strategist.strategize_refactoring(_state("OrderDao.java", ["Magic Constants"], seed=seed))
+
+    assert state["strategy_seed"] is None
+    assert state["refactoring_strategy_results"] != "Split the class"
@@ -0,0 +1,122 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.dedup import content_digest, group_duplicates
+from workflow.deferred_explainer import DeferredExplainer
+from workflow.work_queue import WorkQueue
+
+SETTINGS = SimpleNamespace(TARGETED_TESTS_ENABLED=False)
+
+
+class FakeGraph:
+    """Stands in for the compiled graph: adds a comment to every file"""
+
+    def __init__(self):
+        self.invoked = []
+
+    def invoke(self, state):
+        self.invoked.append(state["current_file_path"])
+        return {**state, "refactored_code": "// refactored\n" + state["code"], "code_review_times": 1,
+                "antipatterns_scan_report": {"total_antipatterns_found": 1,
+                                             "antipatterns_detected": [{"name": "God Class"}]}}
+
+
+class RecordingWriter:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, file_path, final_state):
+        self.submitted.append((file_path, final_state["current_file_path"]))
+
+
+def _write(path: Path, content: str) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_identical_files_are_grouped_under_the_first_path(tmp_path):
+    a = _write(tmp_path / "repo-a" / "Util.java", "class Util {}")
+    b = _write(tmp_path / "repo-b" / "Other.java", "class Other {}")
+    c = _write(tmp_path / "fork" / "Util.java", "class Util {}")
+    missing = str(tmp_path / "Missing.java")
+
+    unique, duplicates = group_duplicates([a, b, c, missing, a])
+
+    assert unique == [a, b, missing]
+    assert duplicates == {a: [c]}
+    assert content_digest(a) == content_digest(c) != content_digest(b)
+    assert content_digest(missing) is None
+
+
+def test_each_unique_file_is_processed_once_and_fanned_out(tmp_path):
+    from full_repo_workflow import process_java_files_with_workflow
+
+    a = _write(tmp_path / "repo-a" / "Util.java", "class Util {}")
+    b = _write(tmp_path / "repo-b" / "Other.java", "class Other {}")
+    c = _write(tmp_path / "fork" / "Util.java", "class Util {}")
+    unique, duplicates = group_duplicates([a, b, c])
+    graph, writer = FakeGraph(), RecordingWriter()
+
+    processed, failed = process_java_files_with_workflow(
+        unique, SETTINGS, None, None, graph, results_writer=writer, duplicates=duplicates,
+    )
+
+    assert graph.invoked == [a, b]
+    assert failed == []
+    assert [r['file_path'] for r in processed] == [a, c, b]
+    assert processed[1]['duplicate_of'] == a and 'duplicate_of' not in processed[0]
+    assert all(r['status'] == 'success' for r in processed)
+    assert Path(c).read_text(encoding="utf-8").replace("\r\n", "\n") == "// refactored\nclass Util {}"
+    # Each copy gets its own report, labelled with its own path
+    assert writer.submitted == [(a, a), (c, c), (b, b)]
+
+
+def test_queue_completes_duplicates_with_their_file(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    assert queue.enqueue(["A.java", "B.java"], duplicates={"A.java": ["A2.java"]}) == 3
+
+    assert queue.claim("w1") == "A.java"
+    assert queue.claim("w1") == "B.java"
+    assert queue.claim("w1") is None  # Copies are never claimed
+    assert queue.duplicates_of("A.java") == ["A2.java"]
+    assert queue.counts()['duplicate'] == 1
+
+    assert queue.finish("A.java", "w1", [(path, {'file_path': path, 'status': 'success'}) for path in ("A.java", "A2.java")])
+    assert queue.complete("B.java", {'file_path': "B.java", 'status': 'success'}, "w1")
+    processed, failed = queue.results()
+    assert [r['file_path'] for r in processed] == ["A.java", "A2.java", "B.java"]
+    assert queue.is_drained()
+
+
+def test_failed_copy_of_a_finished_file_is_requeued_on_its_own(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue(["A.java"], duplicates={"A.java": ["A2.java"]})
+    queue.finish(queue.claim("w1"), "w1", [("A.java", {'file_path': "A.java", 'status': 'success'}), ("A2.java", None)])
+
+    queue.enqueue(["A.java"], duplicates={"A.java": ["A2.java"]})
+
+    assert queue.claim("w1") == "A2.java"
+
+
+def test_deferred_explanation_is_shared_by_copies():
+    class Explainer:
+        calls = 0
+
+        def explain_antipattern(self, state):
+            Explainer.calls += 1
+            return {**state, "explanation_json": {"closing_summary": "ok"}}
+
+    writer = RecordingWriter()
+    deferred = DeferredExplainer(Explainer(), settings=None, results_writer=writer)
+    deferred.submit("A.java", {"current_file_path": "A.java"}, duplicates=["A2.java"])
+
+    assert deferred.drain() == {"explained": 2, "failed": 0}
+    assert Explainer.calls == 1
+    assert writer.submitted == [("A.java", "A.java"), ("A2.java", "A2.java")]
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import workflow.deferred_explainer as deferred_module
+from workflow.deferred_explainer import DeferredExplainer, explain_final_state
+
+
+class RecordingExplainer:
+    """Mimics ExplainerAgent: returns the full state without 'code'"""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def explain_antipattern(self, state):
+        self.calls.append(state["current_file_path"])
+        if state["current_file_path"] == self.fail_on:
+            raise RuntimeError("LLM down")
+        merged = {k: v for k, v in state.items() if k != "code"}
+        merged["explanation_json"] = {"closing_summary": state["current_file_path"]}
+        return merged
+
+
+def _state(path):
+    return {"code": "class A {}", "current_file_path": path, "explanation_json": None}
+
+
+def test_explain_final_state_keeps_original_code():
+    state = explain_final_state(RecordingExplainer(), _state("A.java"))
+
+    assert state["code"] == "class A {}"
+    assert state["explanation_json"] == {"closing_summary": "A.java"}
+
+
+def test_nothing_runs_until_drain_and_reports_are_resaved(monkeypatch):
+    saved = []
+    monkeypatch.setattr(deferred_module, "save_intermediate_results",
+                        lambda path, state, settings: saved.append((path, state["explanation_json"])) or True)
+    explainer = RecordingExplainer(fail_on="B.java")
+    deferred = DeferredExplainer(explainer, settings=None)
+
+    for path in ("A.java", "B.java", "C.java"):
+        deferred.submit(path, _state(path))
+    assert explainer.calls == []
+    assert len(deferred) == 3
+
+    stats = deferred.drain()
+
+    assert stats == {"explained": 2, "failed": 1}
+    assert [path for path, _ in saved] == ["A.java", "C.java"]
+    assert saved[0][1] == {"closing_summary": "A.java"}
+    assert len(deferred) == 0
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.distributed import shard_files, merge_worker_results
+
+
+FILES = [f"/work/clones/repo{r}/src/F{i}.java" for r in range(3) for i in range(r + 2)]
+
+
+def test_hash_shards_partition_stably():
+    shards = shard_files(FILES, 3, "hash")
+
+    assert sorted(path for shard in shards for path in shard) == sorted(FILES)
+    # A file lands in the same shard whatever the order of the list
+    reshuffled = shard_files(list(reversed(FILES)), 3, "hash")
+    assert [sorted(shard) for shard in shards] == [sorted(shard) for shard in reshuffled]
+
+
+def test_repo_shards_keep_repositories_together():
+    shards = shard_files(FILES, 2, "repo")
+
+    repos_per_shard = [{Path(path).parts[3] for path in shard} for shard in shards]
+    assert repos_per_shard[0].isdisjoint(repos_per_shard[1])
+    # Largest repository (4 files) alone; the other two (3 + 2 files) together
+    assert sorted(len(shard) for shard in shards) == [4, 5]
+
+
+def test_more_shards_than_files_leaves_empty_shards():
+    shards = shard_files(FILES[:2], 4, "hash")
+
+    assert sum(len(shard) for shard in shards) == 2
+    assert len(shards) == 4
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        shard_files(FILES, 0)
+    with pytest.raises(ValueError):
+        shard_files(FILES, 2, "random")
+
+
+def test_merge_worker_results_sums_everything():
+    merged = merge_worker_results([
+        {'processed_files': [{'file_path': 'A'}], 'failed_files': ['B'],
+         'explanation_stats': {'explained': 1, 'failed': 0}, 'stage_records': [{'event': 'node'}]},
+        {'processed_files': [{'file_path': 'C'}], 'failed_files': [],
+         'explanation_stats': {'explained': 2, 'failed': 1}, 'stage_records': []},
+    ])
+
+    assert [r['file_path'] for r in merged['processed_files']] == ['A', 'C']
+    assert merged['failed_files'] == ['B']
+    assert merged['explanation_stats'] == {'explained': 3, 'failed': 1}
+    assert merged['stage_records'] == [{'event': 'node'}]
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.file_operations import atomic_write_bytes, save_refactored_code
+from workflow.preimage_store import PreimageStore
+
+
+def test_atomic_write_replaces_content_and_keeps_mode(tmp_path):
+    target = tmp_path / "A.java"
+    target.write_text("old")
+    target.chmod(0o640)
+
+    atomic_write_bytes(str(target), b"new")
+
+    assert target.read_bytes() == b"new"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["A.java"]  # No temp file left behind
+
+
+def test_store_deduplicates_contents(tmp_path):
+    store = PreimageStore(str(tmp_path / "store"))
+
+    first = store.put(b"class A {}")
+    second = store.put(b"class A {}")
+
+    assert first == second
+    assert store.get(first) == b"class A {}"
+    assert len([p for p in (tmp_path / "store" / "objects").rglob("*") if p.is_file()]) == 1
+
+
+def test_restore_run_rolls_back_to_first_preimage(tmp_path):
+    store = PreimageStore(str(tmp_path / "store"))
+    preimages = store.for_run("run1")
+    target = tmp_path / "A.java"
+    target.write_text("original\n")
+
+    assert save_refactored_code(str(target), "first pass\n", preimages=preimages)
+    assert save_refactored_code(str(target), "second pass\n", preimages=preimages)
+
+    results = store.restore_run("run1")
+
+    assert results['restored'] == [str(target.resolve())]
+    assert target.read_text() == "original\n"
+
+
+def test_restore_skips_files_changed_since_the_run(tmp_path):
+    store = PreimageStore(str(tmp_path / "store"))
+    target = tmp_path / "A.java"
+    target.write_text("original\n")
+    save_refactored_code(str(target), "refactored\n", preimages=store.for_run("run2"))
+    target.write_text("hand edited\n")
+
+    results = store.restore_run("run2")
+    assert results['skipped'] == [str(target.resolve())]
+    assert target.read_text() == "hand edited\n"
+
+    store.restore_run("run2", force=True)
+    assert target.read_text() == "original\n"
+
+
+def test_unknown_run_restores_nothing(tmp_path):
+    results = PreimageStore(str(tmp_path / "store")).restore_run("missing")
+
+    assert results == {'restored': [], 'skipped': [], 'failed': []}
@@ -0,0 +1,113 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.prescreen import classify_file, load_sonarqube_issue_counts, prescreen_files
+from workflow.results_manager import processing_rates
+
+DTO_CODE = """
+package demo;
+
+public class Point {
+    private final int x;
+    private final int y;
+
+    public Point(int x, int y) {
+        this.x = x;
+        this.y = y;
+    }
+
+    public int getX() { return x; }
+    public int getY() { return y; }
+}
+"""
+
+SMELLY_CODE = """
+package demo;
+
+public class Parser {
+    public int parse(String s) {
+        try {
+            return Integer.parseInt(s) * 37 + 91 - 12;
+        } catch (Exception e) {
+        }
+        return 0;
+    }
+}
+"""
+
+
+def test_classify_file_marks_small_dto_clean():
+    result = classify_file(DTO_CODE, sonarqube_issues=0)
+
+    assert result['classification'] == 'clean'
+    assert result['reasons'] == []
+
+
+def test_classify_file_flags_smells_and_sonarqube_issues():
+    assert classify_file(SMELLY_CODE)['classification'] == 'candidate'
+    assert classify_file(DTO_CODE, sonarqube_issues=2)['reasons'] == ['sonarqube_issues=2']
+
+
+def test_prescreen_files_uses_saved_sonarqube_issues(tmp_path):
+    repo = tmp_path / "clones" / "repo1"
+    source_dir = repo / "src" / "main" / "java"
+    source_dir.mkdir(parents=True)
+    clean_file = source_dir / "Point.java"
+    flagged_file = source_dir / "Other.java"
+    clean_file.write_text(DTO_CODE)
+    flagged_file.write_text(DTO_CODE.replace("Point", "Other"))
+    (repo / "issues.json").write_text(json.dumps({
+        "total": 1,
+        "issues": [{"component": "repo1:src/main/java/Other.java", "rule": "java:S1"}],
+    }))
+
+    counts = load_sonarqube_issue_counts([str(repo)])
+    candidates, clean = prescreen_files([str(clean_file), str(flagged_file)], [str(repo)])
+
+    assert counts[str(repo)] == {"src/main/java/Other.java": 1}
+    assert candidates == [str(flagged_file)]
+    assert [c['file_path'] for c in clean] == [str(clean_file)]
+
+
+def test_rates_ignore_files_skipped_by_the_prescreen():
+    files = [
+        {'status': 'success', 'antipatterns_found': True, 'antipatterns_count': 3, 'code_review_times': 2},
+        {'status': 'no_refactoring', 'antipatterns_found': False, 'antipatterns_count': 0, 'code_review_times': 0},
+    ] + [{'status': 'skipped_clean', 'antipatterns_found': False, 'antipatterns_count': 0, 'code_review_times': 0}] * 8
+
+    assert processing_rates(files) == {'refactoring_success_rate': 50, 'antipattern_detection_rate': 50,
+                                       'average_code_reviews': 1, 'average_antipatterns_per_file': 1.5}
+    assert set(processing_rates(files[2:]).values()) == {0}
+
+
+def test_all_clean_run_is_journaled_and_summarised(tmp_path, monkeypatch):
+    import full_repo_workflow
+    from workflow.run_journal import RunJournal
+
+    repo = tmp_path / "clones" / "demo"
+    repo.mkdir(parents=True)
+    dto = repo / "Point.java"
+    dto.write_text(DTO_CODE, encoding="utf-8")
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)  # Results go to ../processing_results
+    monkeypatch.setattr(full_repo_workflow, "get_repository_paths_from_files", lambda paths: {str(repo)})
+    settings = SimpleNamespace(PRESCREEN_ENABLED=True, DEDUP_ENABLED=True, RESULTS_DB_ENABLED=False,
+                               INSTRUMENTATION_ENABLED=False, TARGETED_TESTS_ENABLED=False, BACKUP_MODE="copy")
+
+    assert full_repo_workflow.run_full_repo_workflow(settings, None, None, None, file_paths=[str(dto)],
+                                                     assume_yes=True, run_id="clean-run")
+
+    journal = RunJournal("clean-run").load()
+    assert journal['header']['backup_info']['mode'] == "none"
+    assert [f['status'] for f in journal['header']['skipped_files']] == ['skipped_clean']
+    summary = json.loads(next((tmp_path / "processing_results").glob("processing_summary_*.json")).read_text())
+    assert summary['processing_session']['skipped_clean'] == 1
+    assert not (tmp_path / "backups").exists()
@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.metric_pooling import load_deltas_db
+from workflow.results_db import ResultsDB
+from workflow.results_writer import ResultsWriter
+
+SETTINGS = SimpleNamespace(LLM_MODEL="test-model", LLM_PROVIDER="ollama", BACKUP_MODE="snapshot")
+
+
+def _metrics(cc, sloc):
+    values = {"avg_cc": cc, "max_cc": cc * 2, "file_sloc_nloc": sloc, "max_nd_in_file": 2, "total_functions": 3}
+    return {"original_metrics": values, "refactored_metrics": {**values, "avg_cc": cc - 1, "file_sloc_nloc": sloc - 10},
+            "improvements": {"avg_cc_improvement": 1, "sloc_reduction": 10}}
+
+
+def _state(*names):
+    return {"code_review_times": 2, "precheck_results": "review",
+            "antipatterns_scan_report": {"total_antipatterns_found": len(names),
+                                         "antipatterns_detected": [{"name": n, "location": "L1", "description": "d"}
+                                                                   for n in names]}}
+
+
+def test_file_state_and_results_are_merged(tmp_path):
+    db = ResultsDB(tmp_path / "results.db")
+    db.start_run("run1", SETTINGS)
+    db.record_file_state("run1", "A.java", _state("God Class", "Magic Constants"), _metrics(4, 100))
+    db.record_file_results("run1", [{'file_path': "A.java", 'status': 'success', 'antipatterns_count': 2,
+                                     'code_review_times': 2, 'test_results': {'status': 'passed'}}], ["B.java"])
+    db.finish_run("run1", 2, 1, {'summary_file': 's.json'})
+
+    assert db.status_counts("run1") == {'success': 1, 'failed': 1}
+    assert db.findings_by_antipattern("run1") == {"God Class": 1, "Magic Constants": 1}
+    run = db.runs()[0]
+    assert (run['model'], run['total_files'], run['failed_files']) == ("test-model", 2, 1)
+    assert run['finished_at'] is not None
+
+
+def test_rerecording_a_file_replaces_its_metrics_and_findings(tmp_path):
+    db = ResultsDB(tmp_path / "results.db")
+    db.record_file_state("run1", "A.java", _state("God Class"), _metrics(4, 100))
+    db.record_file_state("run1", "A.java", _state("Deep Nesting"), _metrics(6, 100))
+
+    assert db.findings_by_antipattern() == {"Deep Nesting": 1}
+    assert db.metric_pairs() == [(
+        {"avg_cc": 6.0, "max_cc": 12.0, "file_sloc_nloc": 100.0, "max_nd_in_file": 2.0},
+        {"avg_cc": 5.0, "max_cc": 12.0, "file_sloc_nloc": 90.0, "max_nd_in_file": 2.0},
+    )]
+
+
+def test_metric_pooling_reads_the_database(tmp_path):
+    db = ResultsDB(tmp_path / "results.db")
+    db.record_file_state("run1", "A.java", _state(), _metrics(4, 100))
+    db.record_file_state("run2", "A.java", _state(), _metrics(5, 50))
+    db.record_file_state("run2", "B.java", _state(), {"original_metrics": _metrics(1, 1)["original_metrics"]})
+
+    n, deltas = load_deltas_db(str(tmp_path / "results.db"))
+    assert n == 2
+    assert deltas["CC"] == [-1.0, -1.0]
+    assert deltas["SLOC"] == [-10.0, -10.0]
+    assert load_deltas_db(str(tmp_path / "results.db"), "run2")[0] == 1
+
+
+def test_stage_timings_are_replaced_per_run(tmp_path):
+    db = ResultsDB(tmp_path / "results.db")
+    records = [{"event": "node", "file": "A.java", "node": "scanner", "wall_time_s": 1.5},
+               {"event": "llm", "file": "A.java", "node": "scanner", "latency_s": 1.2, "prompt_tokens": 10}]
+    db.record_stage_timings("run1", records)
+    db.record_stage_timings("run1", records)
+
+    rows = db._query("SELECT event, seconds, prompt_tokens FROM stage_timings WHERE run_id = ? ORDER BY event", ("run1",))
+    assert rows == [{'event': 'llm', 'seconds': 1.2, 'prompt_tokens': 10},
+                    {'event': 'node', 'seconds': 1.5, 'prompt_tokens': None}]
+
+
+def test_results_writer_records_files(tmp_path):
+    db = ResultsDB(tmp_path / "results.db")
+    writer = ResultsWriter(SETTINGS, "run1", results_dir=str(tmp_path), results_db=db)
+    writer.submit("/repo/A.java", {"code": "class A {}", "refactored_code": "class A { }", **_state("God Class")})
+    writer.close()
+
+    assert db.findings_by_antipattern("run1") == {"God Class": 1}
@@ -0,0 +1,100 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.deferred_explainer import DeferredExplainer
+from workflow.results_writer import ResultsWriter, consolidate_parts, results_writer_for, store_path
+
+SETTINGS = SimpleNamespace(LLM_MODEL="test-model", ASYNC_RESULTS_WRITER=True, RESULTS_STORE="jsonl")
+
+
+def _state(path, refactored="class A { }"):
+    return {"code": "class A {}", "refactored_code": refactored, "current_file_path": path,
+            "antipatterns_scanner_results": "none", "code_review_times": 1}
+
+
+def _records(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_close_writes_reports_and_consolidated_store(tmp_path):
+    writer = ResultsWriter(SETTINGS, "run1", results_dir=str(tmp_path))
+    for name in ("A", "B", "C"):
+        writer.submit(f"/repo/src/{name}.java", _state(name))
+
+    assert writer.close() == {"written": 3, "failed": 0}
+    records = _records(store_path(str(tmp_path), "run1"))
+    assert [r["file_path"] for r in records] == ["/repo/src/A.java", "/repo/src/B.java", "/repo/src/C.java"]
+    assert records[0]["model"] == "test-model"
+    assert "original_metrics" in records[0]["metrics"]
+    assert len(list(tmp_path.glob("*_results.md"))) == 3
+
+
+def test_submitted_state_is_copied(tmp_path):
+    writer = ResultsWriter(SETTINGS, "run2", results_dir=str(tmp_path))
+    state = _state("A")
+    writer.submit("/repo/A.java", state)
+    state["refactored_code"] = "changed after submit"
+    writer.close()
+
+    assert _records(store_path(str(tmp_path), "run2"))[0]["refactored_code"] == "class A { }"
+
+
+def test_store_none_writes_reports_only(tmp_path):
+    writer = ResultsWriter(SETTINGS, "run3", results_dir=str(tmp_path), store="none")
+    writer.submit("/repo/A.java", _state("A"))
+
+    assert writer.close()["written"] == 1
+    assert not list(tmp_path.glob("results_*.jsonl"))
+
+
+def test_parts_are_consolidated(tmp_path):
+    for part in ("w0", "w1"):
+        writer = ResultsWriter(SETTINGS, "run4", results_dir=str(tmp_path), part=part)
+        writer.submit(f"/repo/{part}.java", _state(part))
+        writer.close()
+
+    target = consolidate_parts(str(tmp_path), "run4")
+
+    assert sorted(r["file_path"] for r in _records(target)) == ["/repo/w0.java", "/repo/w1.java"]
+    assert not list(tmp_path.glob("results_run4.part-*"))
+
+
+def test_inline_writer_writes_on_submit(tmp_path):
+    writer = ResultsWriter(SETTINGS, "run5", results_dir=str(tmp_path), background=False)
+    writer.submit("/repo/A.java", _state("A"))
+
+    assert writer.stats["written"] == 1
+    assert writer.close() == {"written": 1, "failed": 0}
+    assert len(_records(store_path(str(tmp_path), "run5"))) == 1
+
+
+def test_writer_for_settings_is_inline_when_async_disabled():
+    settings = SimpleNamespace(LLM_MODEL="m", ASYNC_RESULTS_WRITER=False, RESULTS_STORE="none", RESULTS_DB_ENABLED=False)
+    writer = results_writer_for(settings, "run7")
+
+    assert writer._thread is None
+    writer.close()
+
+
+def test_deferred_explanations_go_through_writer(tmp_path):
+    class Explainer:
+        def explain_antipattern(self, state):
+            return {"explanation_json": {"closing_summary": "done"}}
+
+    writer = ResultsWriter(SETTINGS, "run6", results_dir=str(tmp_path))
+    deferred = DeferredExplainer(Explainer(), SETTINGS, results_writer=writer)
+    writer.submit("/repo/A.java", _state("A"))
+    deferred.submit("/repo/A.java", _state("A"))
+
+    assert deferred.drain() == {"explained": 1, "failed": 0}
+    writer.close()
+    records = _records(store_path(str(tmp_path), "run6"))
+    assert [r["explanation_json"] for r in records] == [None, {"closing_summary": "done"}]
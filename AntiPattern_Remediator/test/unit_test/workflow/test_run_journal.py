@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.run_journal import RunJournal
+
+
+def _result(path, status='success'):
+    return {'file_path': path, 'status': status, 'antipatterns_found': True, 'antipatterns_count': 1,
+            'code_review_times': 1, 'has_intermediate_results': True}
+
+
+def test_load_returns_none_without_journal(tmp_path):
+    assert RunJournal("missing", results_dir=str(tmp_path)).load() is None
+
+
+def test_round_trip_keeps_header_and_results(tmp_path):
+    journal = RunJournal("run1", results_dir=str(tmp_path))
+    backup_info = {'timestamp': 't', 'backup_dir': 'b', 'backed_up_repos': ['r'], 'failed_backups': []}
+    journal.start(["A.java", "B.java", "C.java"], [{'file_path': "D.java", 'status': 'skipped_clean'}], backup_info)
+    journal.record_result(_result("A.java"))
+    journal.record_failure("B.java")
+
+    state = RunJournal("run1", results_dir=str(tmp_path)).load()
+
+    assert state['header']['file_paths'] == ["A.java", "B.java", "C.java"]
+    assert state['header']['backup_info'] == backup_info
+    assert state['header']['skipped_files'][0]['file_path'] == "D.java"
+    assert set(state['results']) == {"A.java"}
+    assert state['failed'] == {"B.java"}
+
+
+def test_retry_success_clears_failure(tmp_path):
+    journal = RunJournal("run2", results_dir=str(tmp_path))
+    journal.start(["A.java"], [], {})
+    journal.record_failure("A.java")
+    journal.record_result(_result("A.java", status='no_refactoring'))
+
+    state = journal.load()
+
+    assert state['failed'] == set()
+    assert state['results']["A.java"]['status'] == 'no_refactoring'
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = RunJournal("run3", results_dir=str(tmp_path))
+    journal.start(["A.java", "B.java"], [], {})
+    journal.record_result(_result("A.java"))
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "file", "result": {"file_pa')
+
+    state = journal.load()
+
+    assert set(state['results']) == {"A.java"}
+
+
+def test_worker_parts_are_merged_on_load(tmp_path):
+    journal = RunJournal("run4", results_dir=str(tmp_path))
+    journal.start(["A.java", "B.java", "C.java"], [], {})
+    journal.part("host-w0").record_result(_result("A.java"))
+    journal.part("host-w1").record_failure("B.java")
+    journal.part("host-w1").record_result(_result("C.java"))
+
+    state = journal.load()
+
+    assert set(state['results']) == {"A.java", "C.java"}
+    assert state['failed'] == {"B.java"}
@@ -0,0 +1,122 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import workflow.targeted_tests as targeted_tests
+from workflow.targeted_tests import TargetedTestRunner
+
+
+def _write(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _make_module(tmp_path: Path) -> Path:
+    module = tmp_path / "clones" / "repo1"
+    _write(module / "pom.xml", "<project/>")
+    _write(module / "src/main/java/com/acme/Order.java", "package com.acme;\npublic class Order {}")
+    _write(module / "src/main/java/com/acme/Unused.java", "package com.acme;\npublic class Unused {}")
+    _write(module / "src/test/java/com/acme/OrderTest.java", "package com.acme;\nclass OrderTest {}")
+    _write(
+        module / "src/test/java/com/acme/billing/InvoiceTest.java",
+        "package com.acme.billing;\nimport com.acme.Order;\nclass InvoiceTest { Order order; }",
+    )
+    _write(
+        module / "src/test/java/com/other/UnrelatedTest.java",
+        "package com.other;\nclass UnrelatedTest { String Order; }",
+    )
+    return module
+
+
+def test_find_tests_uses_naming_and_imports(tmp_path):
+    module = _make_module(tmp_path)
+    runner = TargetedTestRunner()
+
+    module_root, tests = runner.find_tests(str(module / "src/main/java/com/acme/Order.java"))
+
+    assert module_root == module.resolve()
+    assert tests == ["com.acme.OrderTest", "com.acme.billing.InvoiceTest"]
+
+
+def test_run_for_file_without_covering_tests_does_not_invoke_maven(tmp_path):
+    module = _make_module(tmp_path)
+
+    result = TargetedTestRunner().run_for_file(str(module / "src/main/java/com/acme/Unused.java"))
+
+    assert result['status'] == 'no_tests'
+    assert result['tests'] == []
+
+
+def test_runs_in_the_same_module_do_not_overlap(tmp_path, monkeypatch):
+    module = _make_module(tmp_path)
+    runner = TargetedTestRunner()
+    active, overlaps = [], []
+
+    def fake_run(command, **kwargs):
+        active.append(command)
+        overlaps.append(len(active) > 1)
+        time.sleep(0.05)
+        active.pop()
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(targeted_tests.subprocess, "run", fake_run)
+    order = str(module / "src/main/java/com/acme/Order.java")
+    threads = [threading.Thread(target=runner.run_for_file, args=(order,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == [False] * 4
+
+
+def _run_with(monkeypatch, tmp_path, fake_run):
+    module = _make_module(tmp_path)
+    commands = []
+
+    def recording_run(command, **kwargs):
+        commands.append((command, kwargs))
+        return fake_run(command)
+
+    monkeypatch.setattr(targeted_tests.subprocess, "run", recording_run)
+    result = TargetedTestRunner(timeout=5).run_for_file(str(module / "src/main/java/com/acme/Order.java"))
+    return result, commands, module
+
+
+def test_maven_runs_only_the_covering_tests(tmp_path, monkeypatch):
+    result, commands, module = _run_with(
+        monkeypatch, tmp_path, lambda command: subprocess.CompletedProcess(command, 0, "BUILD SUCCESS", ""))
+
+    assert result['status'] == 'passed'
+    assert result['output'] == ''
+    assert result['tests'] == ["com.acme.OrderTest", "com.acme.billing.InvoiceTest"]
+    command, kwargs = commands[0]
+    assert "-Dtest=com.acme.OrderTest,com.acme.billing.InvoiceTest" in command
+    assert command[1:3] == ["-q", "test"]
+    assert kwargs['cwd'] == module.resolve() and kwargs['timeout'] == 5
+
+
+def test_failing_tests_keep_the_maven_output(tmp_path, monkeypatch):
+    result, _, _ = _run_with(
+        monkeypatch, tmp_path, lambda command: subprocess.CompletedProcess(command, 1, "Tests run: 2, Failures: 1", ""))
+
+    assert result['status'] == 'failed'
+    assert "Failures: 1" in result['output']
+
+
+def test_slow_tests_time_out(tmp_path, monkeypatch):
+    def timeout(command):
+        raise subprocess.TimeoutExpired(command, 5)
+
+    result, _, _ = _run_with(monkeypatch, tmp_path, timeout)
+
+    assert result['status'] == 'timeout'
+    assert result['output'] == "Tests exceeded 5s"
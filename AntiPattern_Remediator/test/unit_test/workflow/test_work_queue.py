@@ -0,0 +1,119 @@
+import sys
+import time
+
+import pytest
+from pathlib import Path
+
+# Add the AntiPattern_Remediator directory to Python path
+current_dir = Path(__file__).parent
+project_root = current_dir.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from workflow.work_queue import WorkQueue
+
+
+def _result(path):
+    return {'file_path': path, 'status': 'success', 'antipatterns_found': True, 'antipatterns_count': 1}
+
+
+def test_claims_follow_enqueue_order_and_run_out(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    assert queue.enqueue(["A.java", "B.java"]) == 2
+
+    assert queue.claim("w1") == "A.java"
+    assert queue.claim("w2") == "B.java"
+    assert queue.claim("w1") is None
+    assert queue.counts()['claimed'] == 2
+    assert not queue.is_drained()
+
+
+def test_enqueue_ignores_known_files(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue(["A.java"])
+    queue.complete(queue.claim("w1"), _result("A.java"), "w1")
+
+    assert queue.enqueue(["A.java", "B.java"]) == 1
+    assert queue.counts() == {'pending': 1, 'claimed': 0, 'done': 1, 'failed': 0, 'duplicate': 0}
+
+
+def test_failed_files_are_requeued(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue(["A.java"])
+    queue.fail(queue.claim("w1"), "w1")
+
+    assert queue.enqueue(["A.java"]) == 1
+    assert queue.claim("w2") == "A.java"
+
+
+def test_expired_claims_are_reclaimed(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db", lease_seconds=0)
+    queue.enqueue(["A.java"])
+
+    assert queue.claim("dead-worker") == "A.java"
+    assert queue.claim("w2") == "A.java"
+
+
+def test_results_in_enqueue_order(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue(["A.java", "B.java", "C.java"])
+    claimed = [queue.claim("w1") for _ in range(3)]
+    queue.complete(claimed[2], _result(claimed[2]), "w1")
+    queue.fail(claimed[1], "w1")
+    queue.complete(claimed[0], _result(claimed[0]), "w1")
+
+    processed, failed = queue.results()
+
+    assert [r['file_path'] for r in processed] == ["A.java", "C.java"]
+    assert failed == ["B.java"]
+    assert queue.is_drained()
+
+
+def test_only_the_claim_holder_can_record_a_result(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db", lease_seconds=0)
+    queue.enqueue(["A.java"])
+    queue.claim("slow-worker")
+    assert queue.claim("w2") == "A.java"  # The slow worker's lease expired
+
+    assert not queue.complete("A.java", _result("A.java"), "slow-worker")
+    assert not queue.renew("A.java", "slow-worker")
+    assert queue.counts()['claimed'] == 1
+    assert queue.complete("A.java", _result("A.java"), "w2")
+    assert queue.counts()['done'] == 1
+
+
+def test_heartbeat_keeps_a_long_running_claim(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db", lease_seconds=0.3)
+    queue.enqueue(["A.java"])
+    queue.claim("w1")
+
+    with queue.keep_alive("A.java", "w1"):
+        time.sleep(0.6)  # Twice the lease
+        assert queue.claim("w2") is None
+
+    assert queue.complete("A.java", _result("A.java"), "w1")
+
+
+def test_queue_is_bound_to_the_run_that_filled_it(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db")
+    assert queue.run_id() is None
+    queue.enqueue(["A.java"], run_id="run-1")
+
+    assert WorkQueue(tmp_path / "q.db").run_id() == "run-1"
+    assert queue.enqueue(["A.java", "B.java"], run_id="run-1") == 1  # Resuming the same run
+    with pytest.raises(ValueError, match="run-1"):
+        queue.enqueue(["C.java"], run_id="run-2")
+    assert queue.counts()['pending'] == 2
+
+
+def test_worker_nodes_join_the_queue_run(tmp_path, monkeypatch):
+    import workflow.distributed as distributed
+
+    specs = []
+    monkeypatch.setattr(distributed, "_run_worker_processes", lambda s: specs.extend(s) or [])
+    queue = WorkQueue(tmp_path / "q.db")
+    queue.enqueue(["A.java"], run_id="run-1")
+
+    distributed.run_queue_workers(str(tmp_path / "q.db"), "ollama", "chroma", workers=2)
+    assert [spec['run_id'] for spec in specs] == ["run-1", "run-1"]
+    with pytest.raises(ValueError, match="run-1"):
+        distributed.run_queue_workers(str(tmp_path / "q.db"), "ollama", "chroma", workers=1, run_id="other")
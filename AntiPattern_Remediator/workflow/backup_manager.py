@@ -1,54 +1,216 @@
 """
 Repository backup management for AntiPattern Remediator
 
-This module handles creating backups of repositories before processing.
+This module handles creating backups of repositories before processing, and
+restoring them afterwards. Three backup modes are supported:
+
+- copy: the whole repository is copied (the original behaviour);
+- snapshot: only the files slated for modification are copied, as reflinks
+  (copy-on-write clones) where the filesystem supports them;
+- git: the working tree state is recorded as a commit (`git stash create`, or
+  HEAD when the tree is clean) kept alive by a ref under refs/remediator/;
+  slated files git does not track are snapshotted as above;
+- preimage: nothing is copied up front; each file's original content is
+  saved just before it is rewritten (see preimage_store.py).
+
+Each backup directory holds a backup_info.json so it can be restored later.
 """
 
+import hashlib
+import json
 import shutil
+import subprocess
 from pathlib import Path
 from datetime import datetime
 from colorama import Fore, Style
 
+BACKUP_MODES = ("copy", "snapshot", "git", "preimage")
+BACKUP_INFO_FILE = "backup_info.json"
+GIT_REF_PREFIX = "refs/remediator/backup-"
+
+FICLONE = 0x40049409  # Linux ioctl: reflink the whole file (btrfs, XFS, ...)
+
+
+def _clone_file(source: Path, destination: Path) -> None:
+    """Copy-on-write clone where supported, plain copy otherwise (metadata preserved either way)."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        import fcntl
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source, destination)
+    except (ImportError, OSError):
+        shutil.copy2(source, destination)
+
 
-def create_repository_backup(repo_paths: set, backup_base_dir: str = "../backups") -> dict:
-    """Create backups of repositories before processing."""
+def _sha256(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _git(repo_path, *args) -> str:
+    result = subprocess.run(
+        ["git", "-C", str(repo_path), *args],
+        capture_output=True, text=True, check=True,
+    )
+    return result.stdout.strip()
+
+
+def _files_in_repo(repo_path: str, file_paths) -> list:
+    """Slated files inside `repo_path`, relative to it."""
+    repo = Path(repo_path).resolve()
+    relative = []
+    for file_path in file_paths or []:
+        try:
+            relative.append(str(Path(file_path).resolve().relative_to(repo)))
+        except ValueError:
+            continue
+    return sorted(set(relative))
+
+
+def _snapshot_files(repo_path: str, relative_files: list, backup_repo_path: Path) -> list:
+    """Clone the given files into the backup; returns their manifest entries."""
+    manifest = []
+    for relative in relative_files:
+        source = Path(repo_path) / relative
+        if not source.is_file():
+            continue
+        _clone_file(source, backup_repo_path / relative)
+        manifest.append({'path': relative, 'sha256': _sha256(source)})
+    return manifest
+
+
+def _backup_repo(repo_path: str, backup_repo_path: Path, mode: str, file_paths, timestamp: str) -> dict:
+    entry = {
+        'original_path': repo_path,
+        'backup_path': str(backup_repo_path),
+        'repo_name': Path(repo_path).name,
+        'mode': mode,
+    }
+    if mode == "copy":
+        # Copy the entire repository
+        shutil.copytree(repo_path, backup_repo_path, dirs_exist_ok=True)
+        return entry
+
+    relative_files = _files_in_repo(repo_path, file_paths)
+    if mode == "git":
+        commit = _git(repo_path, "stash", "create") or _git(repo_path, "rev-parse", "HEAD")
+        ref = f"{GIT_REF_PREFIX}{timestamp}"
+        _git(repo_path, "update-ref", ref, commit)
+        tracked = set(_git(repo_path, "ls-files", "--", *relative_files).splitlines()) if relative_files else set()
+        entry.update({'git_ref': ref, 'git_commit': commit, 'tracked_files': sorted(tracked)})
+        relative_files = [relative for relative in relative_files if relative not in tracked]
+
+    entry['files'] = _snapshot_files(repo_path, relative_files, backup_repo_path)
+    return entry
+
+
+def create_repository_backup(repo_paths: set, backup_base_dir: str = "../backups", mode: str = "copy",
+                             file_paths: list = None) -> dict:
+    """
+    Create backups of repositories before processing.
+    `file_paths` are the files slated for modification; the snapshot and git modes only cover those.
+    """
+    if mode not in BACKUP_MODES:
+        raise ValueError(f"Unknown backup mode '{mode}' (expected one of {BACKUP_MODES})")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if mode == "preimage":
+        from workflow.preimage_store import DEFAULT_STORE_DIR
+        print(Fore.BLUE + f"\nOriginal files will be saved when first rewritten, in: {DEFAULT_STORE_DIR}" + Style.RESET_ALL)
+        return {'timestamp': timestamp, 'backup_dir': DEFAULT_STORE_DIR, 'mode': mode,
+                'backed_up_repos': [], 'failed_backups': []}
+
     backup_dir = Path(backup_base_dir) / f"repo_backup_{timestamp}"
     backup_dir.mkdir(parents=True, exist_ok=True)
-    
+
     backup_info = {
         'timestamp': timestamp,
         'backup_dir': str(backup_dir),
+        'mode': mode,
         'backed_up_repos': [],
         'failed_backups': []
     }
-    
-    print(Fore.BLUE + f"\nCreating repository backups in: {backup_dir}" + Style.RESET_ALL)
-    
+
+    print(Fore.BLUE + f"\nCreating repository backups ({mode}) in: {backup_dir}" + Style.RESET_ALL)
+
     for repo_path in repo_paths:
         try:
-            repo_path_obj = Path(repo_path)
-            repo_name = repo_path_obj.name
-            backup_repo_path = backup_dir / repo_name
-            
+            repo_name = Path(repo_path).name
             print(Fore.CYAN + f"Backing up repository: {repo_name}..." + Style.RESET_ALL)
-            
-            # Copy the entire repository
-            shutil.copytree(repo_path, backup_repo_path, dirs_exist_ok=True)
-            
-            backup_info['backed_up_repos'].append({
-                'original_path': repo_path,
-                'backup_path': str(backup_repo_path),
-                'repo_name': repo_name
-            })
-            
+
+            entry = _backup_repo(repo_path, backup_dir / repo_name, mode, file_paths, timestamp)
+            backup_info['backed_up_repos'].append(entry)
+
             print(Fore.GREEN + f"Successfully backed up: {repo_name}" + Style.RESET_ALL)
-            
+
         except Exception as e:
-            print(Fore.RED + f"Failed to backup {repo_path}: {e}" + Style.RESET_ALL)
+            error = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) and e.stderr else str(e)
+            print(Fore.RED + f"Failed to backup {repo_path}: {error}" + Style.RESET_ALL)
             backup_info['failed_backups'].append({
                 'repo_path': repo_path,
-                'error': str(e)
+                'error': error
             })
-    
+
+    try:
+        with open(backup_dir / BACKUP_INFO_FILE, 'w', encoding='utf-8') as f:
+            json.dump(backup_info, f, indent=2)
+    except Exception as e:
+        print(Fore.RED + f"Error saving backup info: {e}" + Style.RESET_ALL)
+
     return backup_info
+
+
+def load_backup_info(backup_dir: str) -> dict:
+    with open(Path(backup_dir) / BACKUP_INFO_FILE, 'r', encoding='utf-8') as f:
+        backup_info = json.load(f)
+    # Recorded paths may be relative to wherever the run was started
+    backup_info['backup_dir'] = str(backup_dir)
+    return backup_info
+
+
+def _restore_repo(entry: dict, backup_dir: str, file_paths) -> int:
+    repo_path = entry['original_path']
+    backup_repo_path = Path(backup_dir) / entry['repo_name']
+    wanted = set(_files_in_repo(repo_path, file_paths)) if file_paths is not None else None
+    mode = entry.get('mode', 'copy')
+
+    if mode == "copy":
+        if wanted is None:
+            shutil.copytree(backup_repo_path, repo_path, dirs_exist_ok=True)
+            return sum(1 for path in backup_repo_path.rglob('*') if path.is_file())
+        for relative in wanted:
+            if (backup_repo_path / relative).is_file():
+                _clone_file(backup_repo_path / relative, Path(repo_path) / relative)
+        return len(wanted)
+
+    restored = 0
+    if mode == "git":
+        tracked = [path for path in entry.get('tracked_files', []) if wanted is None or path in wanted]
+        if tracked:
+            _git(repo_path, "restore", f"--source={entry['git_commit']}", "--worktree", "--", *tracked)
+            restored += len(tracked)
+
+    for item in entry.get('files', []):
+        if wanted is None or item['path'] in wanted:
+            _clone_file(backup_repo_path / item['path'], Path(repo_path) / item['path'])
+            restored += 1
+    return restored
+
+
+def restore_repository_backup(backup_info: dict, file_paths: list = None) -> dict:
+    """
+    Restore backed-up files to their repositories (all of them, or only `file_paths`).
+    Returns {'restored': [...], 'failed': [...]} per repository.
+    """
+    results = {'restored': [], 'failed': []}
+    print(Fore.BLUE + f"\nRestoring backup from: {backup_info['backup_dir']}" + Style.RESET_ALL)
+    for entry in backup_info['backed_up_repos']:
+        try:
+            count = _restore_repo(entry, backup_info['backup_dir'], file_paths)
+            results['restored'].append({'repo_path': entry['original_path'], 'files': count})
+            print(Fore.GREEN + f"Restored {count} files in: {entry['repo_name']}" + Style.RESET_ALL)
+        except Exception as e:
+            error = e.stderr.strip() if isinstance(e, subprocess.CalledProcessError) and e.stderr else str(e)
+            print(Fore.RED + f"Failed to restore {entry['original_path']}: {error}" + Style.RESET_ALL)
+            results['failed'].append({'repo_path': entry['original_path'], 'error': error})
+    return results
@@ -0,0 +1,218 @@
+"""
+Near-duplicate clustering for AntiPattern Remediator
+
+Large codebases have many structurally similar classes (DAOs, handlers,
+builders) that end up with the same refactoring strategy. Files are
+fingerprinted by MinHash over shingles of their javalang tokens, with
+identifiers and literal values normalised away, and grouped with LSH
+banding: each file joins the first earlier file (its cluster's
+representative) whose estimated similarity reaches SIMILARITY_THRESHOLD.
+
+StrategyCache hands a representative's strategy to the rest of its cluster
+as the `strategy_seed` state key; RefactorStrategist uses it instead of an
+LLM call when the file's findings match the representative's. Clustering
+ignores names, so before reuse the strategy's mentions of the
+representative's identifiers are rewritten to the member's, paired up by
+aligning the two files' normalised token streams. Members wait for their
+representative to finish, so reuse also works with concurrent processing.
+"""
+
+import difflib
+import random
+import re
+import threading
+import zlib
+from collections import Counter, defaultdict
+
+import javalang
+from colorama import Fore, Style
+
+from src.core.utils import finding_names
+from .file_operations import read_java_file
+
+SHINGLE_SIZE = 5             # Tokens per shingle
+NUM_PERM = 64                # MinHash signature length
+LSH_BANDS = 16               # NUM_PERM = LSH_BANDS * rows; candidates share at least one band
+SIMILARITY_THRESHOLD = 0.85  # Estimated Jaccard similarity needed to join a cluster
+MIN_SHINGLES = 20            # Smaller files carry too little structure to cluster
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1234)  # Fixed so signatures are comparable across processes
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+# Literal values are replaced by their kind (DecimalInteger, HexInteger, ... -> Integer); true/false/null are kept
+_LITERAL_KINDS = ("Integer", "FloatingPoint", "String", "Character")
+_FALLBACK_TOKEN = re.compile(r"[A-Za-z_$][\w$]*|\d[\w.]*|\S")
+
+
+def _normalize(token) -> str:
+    if isinstance(token, javalang.tokenizer.Identifier):
+        return "ID"
+    if isinstance(token, javalang.tokenizer.Literal) and type(token).__name__.endswith(_LITERAL_KINDS):
+        return next(kind for kind in _LITERAL_KINDS if type(token).__name__.endswith(kind))
+    return token.value
+
+
+def normalized_tokens(code: str) -> list:
+    """javalang tokens with identifiers and literal values replaced by their kind."""
+    try:
+        tokens = list(javalang.tokenizer.tokenize(code))
+    except Exception:  # Lexer errors: fall back to a rough split, without normalisation
+        return _FALLBACK_TOKEN.findall(code)
+    return [_normalize(token) for token in tokens]
+
+
+def identifier_mapping(source_code: str, target_code: str) -> dict:
+    """
+    Pair `source_code`'s identifiers with the ones in the same places in `target_code`,
+    aligning the normalised token streams; returns {source name: target name} for names
+    that differ. Each source name takes the target name it is aligned with most often.
+    """
+    try:
+        source = list(javalang.tokenizer.tokenize(source_code))
+        target = list(javalang.tokenizer.tokenize(target_code))
+    except Exception:
+        return {}
+    matcher = difflib.SequenceMatcher(None, [_normalize(t) for t in source], [_normalize(t) for t in target],
+                                      autojunk=False)
+    votes = defaultdict(Counter)
+    for a, b, size in matcher.get_matching_blocks():
+        for s, t in zip(source[a:a + size], target[b:b + size]):
+            if isinstance(s, javalang.tokenizer.Identifier):
+                votes[s.value][t.value] += 1
+    mapping = {name: counts.most_common(1)[0][0] for name, counts in votes.items()}
+    return {name: other for name, other in mapping.items() if name != other}
+
+
+def rename_identifiers(text: str, mapping: dict) -> str:
+    """Replace whole-word occurrences of each key of `mapping` in `text`, all at once."""
+    if not mapping:
+        return text
+    pattern = re.compile(r"(?<![\w$])(" + "|".join(
+        re.escape(name) for name in sorted(mapping, key=len, reverse=True)) + r")(?![\w$])")
+    return pattern.sub(lambda m: mapping[m.group(1)], text)
+
+
+def token_shingles(code: str, size: int = SHINGLE_SIZE) -> set:
+    """Hashes of every run of `size` consecutive normalised tokens."""
+    tokens = normalized_tokens(code)
+    return {
+        zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8"))
+        for i in range(max(1, len(tokens) - size + 1))
+    }
+
+
+def minhash_signature(shingles: set) -> tuple:
+    return tuple(min((a * x + b) % _MERSENNE_PRIME for x in shingles) for a, b in _PERMUTATIONS)
+
+
+def estimated_similarity(signature_a: tuple, signature_b: tuple) -> float:
+    """Share of matching MinHash values, an estimate of the shingle sets' Jaccard similarity."""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+
+def cluster_files(file_paths: list, threshold: float = SIMILARITY_THRESHOLD) -> dict:
+    """
+    Group near-duplicate files; returns {representative: [members]} for clusters with members.
+    Representatives are the earliest file of their cluster, so sequential runs reach them first.
+    """
+    rows = NUM_PERM // LSH_BANDS
+    buckets = {}
+    signatures = {}
+    clusters = {}
+    for file_path in file_paths:
+        code = read_java_file(file_path)
+        if code is None:
+            continue
+        shingles = token_shingles(code)
+        if len(shingles) < MIN_SHINGLES:
+            continue
+        signature = minhash_signature(shingles)
+        keys = [(band, signature[band * rows:(band + 1) * rows]) for band in range(LSH_BANDS)]
+
+        candidates = dict.fromkeys(rep for key in keys for rep in buckets.get(key, ()))
+        scored = [(estimated_similarity(signature, signatures[rep]), rep) for rep in candidates]
+        best = max(scored, default=(0.0, None), key=lambda pair: pair[0])
+        if best[0] >= threshold:
+            clusters.setdefault(best[1], []).append(file_path)
+            continue
+        # A new representative; only representatives are indexed, so clusters do not chain
+        signatures[file_path] = signature
+        for key in keys:
+            buckets.setdefault(key, []).append(file_path)
+    return clusters
+
+
+class StrategyCache:
+    """
+    Refactoring strategies of cluster representatives, offered to the rest of their cluster.
+    Files must be scheduled in the order given to cluster_files (representatives first) and
+    every representative must be marked `done`, or its members wait for it forever.
+    """
+
+    def __init__(self, clusters: dict):
+        self.clusters = clusters
+        self._representative = {member: rep for rep, members in clusters.items() for member in members}
+        self._done = {rep: threading.Event() for rep in clusters}
+        self._strategies = {}
+        self._reused = 0
+        self._lock = threading.Lock()
+
+    def seed_for(self, file_path: str, code: str = None):
+        """
+        The representative's strategy for a cluster member, with the representative's
+        identifiers renamed to those of `code` (the member's source); None if there is none.
+        Blocks until the representative is done.
+        """
+        representative = self._representative.get(file_path)
+        if representative is None:
+            return None
+        self._done[representative].wait()
+        with self._lock:
+            seed = self._strategies.get(representative)
+        if seed is None:
+            return None
+        # The trove context was retrieved for the same finding names, so it applies as is
+        mapping = identifier_mapping(seed["code"], code) if code else {}
+        return {
+            "source": seed["source"],
+            "strategy": rename_identifiers(seed["strategy"], mapping),
+            "trove_context": seed["trove_context"],
+            "antipatterns": seed["antipatterns"],
+        }
+
+    def record(self, file_path: str, final_state: dict) -> None:
+        """Count a reused seed, or keep a representative's strategy for its cluster."""
+        with self._lock:
+            if final_state.get("strategy_seed"):
+                self._reused += 1
+                return
+            strategy = final_state.get("refactoring_strategy_results")
+            if file_path in self.clusters and strategy and not strategy.startswith("Error occurred"):
+                self._strategies[file_path] = {
+                    "source": file_path,
+                    "strategy": strategy,
+                    "trove_context": final_state.get("trove_context"),
+                    "antipatterns": finding_names(final_state.get("antipatterns_scan_report")),
+                    "code": final_state.get("code") or "",
+                }
+
+    def done(self, file_path: str) -> None:
+        """Release the members of a representative once it has been processed, whatever the outcome."""
+        event = self._done.get(file_path)
+        if event is not None:
+            event.set()
+
+    def stats(self) -> dict:
+        return {'clustered': len(self._representative), 'reused': self._reused}
+
+
+def strategy_cache_for(settings, file_paths: list):
+    """A StrategyCache over `file_paths` when CLUSTERING_ENABLED is on, else None."""
+    if not settings.CLUSTERING_ENABLED:
+        return None
+    clusters = cluster_files(file_paths)
+    members = sum(len(paths) for paths in clusters.values())
+    if members:
+        print(Fore.CYAN + f"Clustered {members} near-duplicate files around {len(clusters)} representatives; "
+              f"they can reuse their representative's refactoring strategy" + Style.RESET_ALL)
+    return StrategyCache(clusters)
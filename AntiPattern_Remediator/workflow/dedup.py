@@ -0,0 +1,56 @@
+"""
+Content-hash deduplication for AntiPattern Remediator
+
+Forks, shaded copies and generated sources mean the same file often appears
+byte-for-byte in several repositories or modules. Files are grouped by the
+SHA-256 of their content; only the first path of each group (its
+representative) goes through the agent graph, and the outcome is applied to
+every copy.
+"""
+
+import hashlib
+
+from colorama import Fore, Style
+
+
+def content_digest(file_path: str):
+    """SHA-256 hex digest of the file's bytes, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def group_duplicates(file_paths: list):
+    """
+    Group byte-identical files.
+    Returns (unique_paths, duplicates): unique_paths keeps the first path of every distinct
+    content in order, and duplicates maps each of those representatives to its other copies.
+    Unreadable files are kept as their own group so they fail (and are reported) as usual.
+    """
+    representatives = {}
+    unique_paths, duplicates = [], {}
+    for file_path in dict.fromkeys(file_paths):
+        digest = content_digest(file_path)
+        representative = representatives.get(digest) if digest is not None else None
+        if representative is None:
+            if digest is not None:
+                representatives[digest] = file_path
+            unique_paths.append(file_path)
+        else:
+            duplicates.setdefault(representative, []).append(file_path)
+    return unique_paths, duplicates
+
+
+def dedup_files(file_paths: list):
+    """`group_duplicates`, reporting how many copies will reuse a representative's result."""
+    unique_paths, duplicates = group_duplicates(file_paths)
+    copies = sum(len(paths) for paths in duplicates.values())
+    if copies:
+        print(Fore.CYAN + f"Found {copies} byte-identical copies of {len(duplicates)} files; "
+              f"processing {len(unique_paths)} unique files and reusing their results" + Style.RESET_ALL)
+    return unique_paths, duplicates
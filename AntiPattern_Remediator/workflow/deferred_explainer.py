@@ -0,0 +1,70 @@
+"""
+Deferred explanations for AntiPattern Remediator
+
+The explainer's output is only used in the markdown reports, so it does not
+need to gate refactoring throughput. In "deferred" mode the graph ends after
+the code review and the final states are queued here; the queue is drained
+once every file has been transformed, and each report is re-saved with its
+explanation (through the run's ResultsWriter, if it has one). Byte-identical
+copies of a file share its explanation.
+"""
+
+import queue
+from colorama import Fore, Style
+
+from .results_manager import save_intermediate_results
+
+
+def explain_final_state(explainer, final_state: dict) -> dict:
+    """Run the explainer on a finished graph state and merge the explanation back in."""
+    explained = explainer.explain_antipattern(final_state)
+    # The explainer never returns 'code', so merge onto the original state
+    return {**final_state, **explained}
+
+
+class DeferredExplainer:
+    """Low-priority queue of finished file states awaiting an explanation"""
+
+    def __init__(self, explainer, settings, results_writer=None):
+        self.explainer = explainer
+        self.settings = settings
+        self.results_writer = results_writer
+        self._queue = queue.Queue()
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, file_path: str, final_state: dict, duplicates=()) -> None:
+        """Queue a file's final state (and its copies' paths); nothing runs until `drain` is called."""
+        self._queue.put((file_path, final_state, tuple(duplicates)))
+
+    def drain(self) -> dict:
+        """Explain every queued file and re-save its intermediate results."""
+        total = len(self)
+        explained, failed = 0, 0
+        if total:
+            print(Fore.CYAN + f"\nGenerating {total} deferred explanation(s)..." + Style.RESET_ALL)
+
+        while True:
+            try:
+                file_path, final_state, duplicates = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                final_state = explain_final_state(self.explainer, final_state)
+                for path in (file_path, *duplicates):
+                    path_state = final_state if path == file_path else {**final_state, "current_file_path": path}
+                    if self.results_writer is not None:
+                        self.results_writer.submit(path, path_state)
+                        explained += 1
+                    elif save_intermediate_results(path, path_state, self.settings):
+                        explained += 1
+                    else:
+                        failed += 1
+            except Exception as e:
+                print(Fore.RED + f"Error explaining {file_path}: {e}" + Style.RESET_ALL)
+                failed += 1
+            finally:
+                self._queue.task_done()
+
+        return {'explained': explained, 'failed': failed}
@@ -0,0 +1,312 @@
+"""
+Distributed execution for the full repository workflow
+
+The file list is split across worker processes, each with its own settings,
+trove connection and graph instance:
+
+- shards: files are partitioned up front, by a stable hash of the path or by
+  repository, and each local worker process gets one shard;
+- queue: files go into a SQLite work queue (see work_queue.py) and workers,
+  local or on other nodes sharing the filesystem, claim them one at a time.
+
+Workers journal every file (see run_journal.py) and return their results to
+the coordinating process, which builds a single processing summary.
+"""
+
+import hashlib
+import multiprocessing
+import socket
+import time
+from pathlib import Path
+
+from colorama import Fore, Style
+
+from workflow.work_queue import WorkQueue, LEASE_SECONDS, DONE, FAILED, CLAIMED
+from workflow.workflow_utils import get_repository_paths_from_files
+
+SHARD_STRATEGIES = ("hash", "repo")
+QUEUE_POLL_SECONDS = 5.0     # Coordinator polling while other nodes finish their claims
+QUEUE_WAIT_SECONDS = 600.0   # How long worker-only nodes wait for the coordinator to fill the queue
+
+
+def _repository_of(file_path: str) -> str:
+    repo_paths = get_repository_paths_from_files([file_path])
+    return next(iter(repo_paths), str(Path(file_path).parent))
+
+
+def shard_files(file_paths: list, num_shards: int, strategy: str = "hash") -> list:
+    """
+    Partition file paths into `num_shards` lists.
+    "hash" spreads files evenly and stably; "repo" keeps each repository in one shard
+    (largest repositories first, each onto the currently smallest shard).
+    """
+    if num_shards < 1:
+        raise ValueError("num_shards must be at least 1")
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"Unknown shard strategy '{strategy}' (expected one of {SHARD_STRATEGIES})")
+
+    shards = [[] for _ in range(num_shards)]
+    if strategy == "hash":
+        for file_path in file_paths:
+            digest = hashlib.sha1(file_path.encode("utf-8")).digest()
+            shards[int.from_bytes(digest[:8], "big") % num_shards].append(file_path)
+        return shards
+
+    by_repo = {}
+    for file_path in file_paths:
+        by_repo.setdefault(_repository_of(file_path), []).append(file_path)
+    for repo in sorted(by_repo, key=lambda r: (-len(by_repo[r]), r)):
+        min(shards, key=len).extend(by_repo[repo])
+    return shards
+
+
+def lease_seconds_for(settings) -> float:
+    """
+    Queue lease long enough for one file's slowest enabled stages: the LLM rounds
+    (LEASE_SECONDS), a compile per transform round plus classpath resolution, and
+    one targeted test run. The heartbeat renews it, so this only bounds a missed beat.
+    """
+    from src.core.graph.conditional_edges import MAX_REVIEW_TIMES
+    from src.core.utils.java_compiler import COMPILE_TIMEOUT_SECONDS
+    from workflow.targeted_tests import TEST_TIMEOUT_SECONDS
+
+    lease = LEASE_SECONDS
+    if settings.COMPILE_CHECK_ENABLED:
+        lease += (MAX_REVIEW_TIMES + 2) * COMPILE_TIMEOUT_SECONDS
+    if settings.TARGETED_TESTS_ENABLED:
+        lease += TEST_TIMEOUT_SECONDS
+    return lease
+
+
+def build_workflow_components(trove: str, seed_trove: bool = True):
+    """PromptManager, trove manager and compiled graph for the current settings."""
+    from src.core.graph import CreateGraph
+    from src.core.prompt import PromptManager
+
+    print("Initializing PromptManager...")
+    prompt_manager = PromptManager()
+
+    # Only the chosen backend is imported (chromadb is slow to import)
+    if trove == "tinydb":
+        from src.data.database import TinyDBManager
+        if seed_trove:
+            from scripts import seed_database
+            print("Seeding TinyDB with AntiPattern Dataset")
+            seed_database.main()
+        db_manager = TinyDBManager()
+        print("Using TinyDB for knowledge retrieval")
+    else:
+        from src.data.database import VectorDBManager
+        vector_db = VectorDBManager()
+        db_manager = vector_db.get_db()
+        print("Using ChromaDB for knowledge retrieval")
+
+    graph = CreateGraph(db_manager, prompt_manager, retriever=db_manager.as_retriever())
+    return db_manager, prompt_manager, graph
+
+
+def _drain_queue(queue: WorkQueue, worker_id: str, settings, langgraph, journal, deferred_explainer, concurrency: int,
+                 preimages=None, results_writer=None):
+    """Claim and process files until the queue has nothing left to claim."""
+    from concurrent.futures import ThreadPoolExecutor
+    from full_repo_workflow import process_java_file
+    from workflow.targeted_tests import TargetedTestRunner
+
+    test_runner = TargetedTestRunner() if settings.TARGETED_TESTS_ENABLED else None
+
+    def claim_loop(thread_index):
+        claimer = f"{worker_id}/{thread_index}"
+        processed, failed = [], []
+        while True:
+            file_path = queue.claim(claimer)
+            if file_path is None:
+                return processed, failed
+            counts = queue.counts()
+            with queue.keep_alive(file_path, claimer):
+                results = process_java_file(
+                    counts[DONE] + counts[FAILED] + counts[CLAIMED], sum(counts.values()),
+                    file_path, settings, langgraph, test_runner, deferred_explainer,
+                    preimages=preimages, results_writer=results_writer, duplicates=queue.duplicates_of(file_path),
+                )
+            if not queue.finish(file_path, claimer, results):
+                print(Fore.YELLOW + f"Lost the claim on {file_path} to another worker; not recording its result" + Style.RESET_ALL)
+                continue
+            for path, file_result in results:
+                if file_result is None:
+                    journal.record_failure(path)
+                    failed.append(path)
+                else:
+                    journal.record_result(file_result)
+                    processed.append(file_result)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        loops = list(pool.map(claim_loop, range(concurrency)))
+    return [r for p, _ in loops for r in p], [f for _, fl in loops for f in fl]
+
+
+def run_worker(spec: dict) -> dict:
+    """
+    Entry point of one worker process. Builds its own settings and graph, then processes
+    either `spec['file_paths']` (a shard) or files claimed from `spec['queue_path']`.
+    """
+    from config.settings import initialize_settings
+    from full_repo_workflow import process_java_files_with_workflow
+    from workflow.clustering import strategy_cache_for
+    from workflow.deferred_explainer import DeferredExplainer
+    from workflow.preimage_store import preimages_for
+    from workflow.results_writer import results_writer_for
+    from workflow.run_journal import RunJournal
+
+    settings = initialize_settings(spec['provider'])
+    db_manager, prompt_manager, graph = build_workflow_components(spec['trove'], seed_trove=False)
+    journal = RunJournal(spec['run_id']).part(spec['worker_id'])
+    # Each worker writes its own part of the results store; the coordinator consolidates them
+    results_writer = results_writer_for(settings, spec['run_id'], part=spec['worker_id'])
+    deferred_explainer = (
+        DeferredExplainer(graph.agents["explainer"], settings, results_writer=results_writer)
+        if settings.EXPLAINER_MODE == "deferred"
+        else None
+    )
+    preimages = preimages_for(settings, spec['run_id'])
+    # Strategies are shared within a shard only; queue claims are not known up front, so no clustering there
+    strategy_cache = None if spec.get('queue_path') else strategy_cache_for(settings, spec['file_paths'])
+
+    try:
+        if spec.get('queue_path'):
+            processed_files, failed_files = _drain_queue(
+                WorkQueue(spec['queue_path'], lease_seconds=lease_seconds_for(settings)), spec['worker_id'],
+                settings, graph.workflow,
+                journal, deferred_explainer, spec.get('concurrency', 1), preimages=preimages,
+                results_writer=results_writer,
+            )
+        else:
+            processed_files, failed_files = process_java_files_with_workflow(
+                spec['file_paths'], settings, db_manager, prompt_manager, graph.workflow, deferred_explainer,
+                journal=journal, concurrency=spec.get('concurrency', 1), preimages=preimages,
+                results_writer=results_writer, duplicates=spec.get('duplicates'), strategy_cache=strategy_cache,
+            )
+        explanation_stats = deferred_explainer.drain() if deferred_explainer is not None else None
+    finally:
+        results_writer.close()
+
+    stage_records = []
+    if settings.INSTRUMENTATION_ENABLED:
+        from src.core.utils.instrumentation import instrumentation
+        stage_records = list(instrumentation.records)
+
+    return {
+        'worker_id': spec['worker_id'],
+        'processed_files': processed_files,
+        'failed_files': failed_files,
+        'explanation_stats': explanation_stats,
+        'strategy_stats': strategy_cache.stats() if strategy_cache is not None else None,
+        'stage_records': stage_records,
+    }
+
+
+def _run_worker_processes(specs: list) -> list:
+    if len(specs) == 1:
+        return [run_worker(specs[0])]
+    # spawn: workers must not inherit the parent's threads, sockets or DB handles
+    with multiprocessing.get_context("spawn").Pool(processes=len(specs)) as pool:
+        return pool.map(run_worker, specs)
+
+
+def _worker_specs(count: int, provider: str, trove: str, run_id: str, concurrency: int, **fields) -> list:
+    host = socket.gethostname()
+    return [
+        {'worker_id': f"{host}-w{i}", 'provider': provider, 'trove': trove, 'run_id': run_id,
+         'concurrency': concurrency, **fields}
+        for i in range(count)
+    ]
+
+
+def merge_worker_results(worker_results: list) -> dict:
+    """Combine the per-worker result dicts into one."""
+    merged = {'processed_files': [], 'failed_files': [], 'explanation_stats': None, 'strategy_stats': None,
+              'stage_records': []}
+    for result in worker_results:
+        merged['processed_files'].extend(result['processed_files'])
+        merged['failed_files'].extend(result['failed_files'])
+        merged['stage_records'].extend(result.get('stage_records') or [])
+        stats = result.get('explanation_stats')
+        if stats:
+            totals = merged['explanation_stats'] or {'explained': 0, 'failed': 0}
+            merged['explanation_stats'] = {key: totals[key] + stats[key] for key in totals}
+        stats = result.get('strategy_stats')
+        if stats:
+            totals = merged['strategy_stats'] or {'clustered': 0, 'reused': 0}
+            merged['strategy_stats'] = {key: totals[key] + stats[key] for key in totals}
+    return merged
+
+
+def run_distributed(file_paths: list, provider: str, trove: str, run_id: str, workers: int,
+                    concurrency: int = 1, strategy: str = "hash", queue_path: str = None, duplicates=None) -> dict:
+    """
+    Process `file_paths` with `workers` local worker processes (sharded, or through the work
+    queue at `queue_path`). `duplicates` maps a file to its byte-identical copies, which are
+    handled by whichever worker processes the file. Returns merged results in the order of
+    `file_paths`, each file followed by its copies.
+    """
+    duplicates = duplicates or {}
+    all_paths = [path for file_path in file_paths for path in (file_path, *duplicates.get(file_path, ()))]
+    if queue_path:
+        queue = WorkQueue(queue_path)
+        queue.enqueue(file_paths, duplicates=duplicates, run_id=run_id)
+        print(Fore.CYAN + f"Queued {len(file_paths)} files in {queue_path}; starting {workers} local workers" + Style.RESET_ALL)
+        specs = _worker_specs(workers, provider, trove, run_id, concurrency, queue_path=queue_path)
+    else:
+        shards = [shard for shard in shard_files(file_paths, workers, strategy) if shard]
+        print(Fore.CYAN + f"Split {len(file_paths)} files into {len(shards)} shards by {strategy}: "
+              f"{', '.join(str(len(shard)) for shard in shards)} files" + Style.RESET_ALL)
+        specs = [
+            {**spec, 'file_paths': shard, 'duplicates': {path: duplicates[path] for path in shard if path in duplicates}}
+            for spec, shard in zip(_worker_specs(len(shards), provider, trove, run_id, concurrency), shards)
+        ]
+
+    merged = merge_worker_results(_run_worker_processes(specs))
+
+    if queue_path:
+        # Workers on other nodes may still hold claims; the queue has everyone's results
+        while not queue.is_drained():
+            counts = queue.counts()
+            print(Fore.CYAN + f"Waiting for other workers: {counts[CLAIMED]} in progress, {counts['pending']} pending" + Style.RESET_ALL)
+            time.sleep(QUEUE_POLL_SECONDS)
+        wanted = set(all_paths)
+        processed_files, failed_files = queue.results()
+        merged['processed_files'] = [r for r in processed_files if r['file_path'] in wanted]
+        merged['failed_files'] = [f for f in failed_files if f in wanted]
+        return merged
+
+    order = {file_path: i for i, file_path in enumerate(all_paths)}
+    merged['processed_files'].sort(key=lambda r: order.get(r['file_path'], len(order)))
+    merged['failed_files'].sort(key=lambda f: order.get(f, len(order)))
+    return merged
+
+
+def run_queue_workers(queue_path: str, provider: str, trove: str, workers: int,
+                      concurrency: int = 1, run_id: str = None) -> dict:
+    """
+    Worker-only node: help drain a queue filled by a coordinator elsewhere; no backups, no summary.
+    The run id is read from the queue, so this node's journal parts, pre-images and results
+    belong to the coordinator's run; a `run_id` that disagrees with it raises ValueError.
+    """
+    queue = WorkQueue(queue_path)
+    deadline = time.monotonic() + QUEUE_WAIT_SECONDS
+    while sum(queue.counts().values()) == 0 or queue.run_id() is None:
+        if time.monotonic() > deadline:
+            print(Fore.RED + f"Work queue {queue_path} is still empty; is the coordinator running?" + Style.RESET_ALL)
+            return merge_worker_results([])
+        time.sleep(QUEUE_POLL_SECONDS)
+
+    queue_run_id = queue.run_id()
+    if run_id and run_id != queue_run_id:
+        raise ValueError(f"Work queue {queue_path} belongs to run '{queue_run_id}', not '{run_id}'")
+    run_id = queue_run_id
+    print(Fore.CYAN + f"Joining run {run_id}" + Style.RESET_ALL)
+
+    specs = _worker_specs(workers, provider, trove, run_id, concurrency, queue_path=queue_path)
+    merged = merge_worker_results(_run_worker_processes(specs))
+    print(Fore.GREEN + f"Worker node done: {len(merged['processed_files'])} processed, "
+          f"{len(merged['failed_files'])} failed" + Style.RESET_ALL)
+    return merged
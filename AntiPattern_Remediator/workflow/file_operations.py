@@ -2,8 +2,15 @@
 File I/O operations for AntiPattern Remediator
 
 This module handles reading and writing files during the workflow process.
+Writes are atomic: the new content goes to a temporary file in the same
+directory, which then replaces the original, so a crash never leaves a
+half-written source file behind.
 """
 
+import os
+import tempfile
+from pathlib import Path
+
 from colorama import Fore, Style
 
 
@@ -17,8 +24,31 @@ def read_java_file(file_path: str) -> str:
         return None
 
 
-def save_refactored_code(file_path: str, refactored_code: str, backup: bool = False) -> bool:
-    """Save the refactored code back to the original file."""
+def atomic_write_bytes(file_path: str, data: bytes) -> None:
+    """Replace `file_path` with `data` in one step, keeping the original's permissions."""
+    path = Path(file_path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(temp_path, path.stat().st_mode & 0o7777)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def save_refactored_code(file_path: str, refactored_code: str, backup: bool = False, preimages=None) -> bool:
+    """
+    Save the refactored code back to the original file.
+    With `preimages` (a RunPreimages), the current content is stored first so the run can be rolled back.
+    """
     try:
         # Create backup if requested (disabled by default since we backup entire repos)
         if backup:
@@ -27,14 +57,19 @@ def save_refactored_code(file_path: str, refactored_code: str, backup: bool = Fa
                 with open(backup_path, 'w', encoding='utf-8') as backup_file:
                     backup_file.write(original.read())
             print(Fore.YELLOW + f"Backup created: {backup_path}" + Style.RESET_ALL)
-        
+
+        # Same line endings as the text-mode write this replaced
+        new_content = refactored_code.replace('\n', os.linesep).encode('utf-8')
+        if preimages is not None:
+            with open(file_path, 'rb') as original:
+                preimages.record(file_path, original.read(), new_content)
+
         # Write refactored code
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(refactored_code)
-        
+        atomic_write_bytes(file_path, new_content)
+
         print(Fore.GREEN + f"Refactored code saved to: {file_path}" + Style.RESET_ALL)
         return True
-        
+
     except Exception as e:
         print(Fore.RED + f"Error saving refactored code to {file_path}: {e}" + Style.RESET_ALL)
         return False
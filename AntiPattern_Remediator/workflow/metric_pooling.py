@@ -48,15 +48,30 @@ def load_deltas(root_dir):
                 keys = ("avg_cc","max_cc","file_sloc_nloc","max_nd_in_file")
                 if not all(k in pre for k in keys) or not all(k in post for k in keys):
                     continue
-                d["CC"].append(float(post["avg_cc"]) - float(pre["avg_cc"]))
-                d["CCMAX"].append(float(post["max_cc"]) - float(pre["max_cc"]))
-                d["SLOC"].append(float(post["file_sloc_nloc"]) - float(pre["file_sloc_nloc"]))
-                d["NEST"].append(float(post["max_nd_in_file"]) - float(pre["max_nd_in_file"]))
+                _add_deltas(d, pre, post)
                 n += 1
             except Exception:
                 continue
     return n, d
 
+def _add_deltas(d, pre, post):
+    d["CC"].append(float(post["avg_cc"]) - float(pre["avg_cc"]))
+    d["CCMAX"].append(float(post["max_cc"]) - float(pre["max_cc"]))
+    d["SLOC"].append(float(post["file_sloc_nloc"]) - float(pre["file_sloc_nloc"]))
+    d["NEST"].append(float(post["max_nd_in_file"]) - float(pre["max_nd_in_file"]))
+
+def load_deltas_db(db_path, run_id=None):
+    """Same as load_deltas, from a results database (optionally one run)."""
+    try:
+        from .results_db import ResultsDB
+    except ImportError:  # Run as a script from workflow/
+        from results_db import ResultsDB
+    d = {"CC":[], "CCMAX":[], "SLOC":[], "NEST":[]}
+    pairs = ResultsDB(db_path).metric_pairs(run_id)
+    for pre, post in pairs:
+        _add_deltas(d, pre, post)
+    return len(pairs), d
+
 def share_improved(vals, changed_mask=None):
     if not vals: return None
     if IMPROVED_DENOM == "changed" and changed_mask is not None:
@@ -83,11 +98,14 @@ def metric_cell(vals, eps):
     return f"{fmt_num(m)} ({fmt_num(i)}) / {fmt_pct(imp)}"
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python metric_pooling_utils.py <directory>", file=sys.stderr)
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python metric_pooling.py <directory | results.db> [run_id]", file=sys.stderr)
         sys.exit(1)
 
-    n, d = load_deltas(sys.argv[1])
+    if os.path.isfile(sys.argv[1]):
+        n, d = load_deltas_db(sys.argv[1], sys.argv[2] if len(sys.argv) == 3 else None)
+    else:
+        n, d = load_deltas(sys.argv[1])
 
     print(f"Files analysed: {n if n else '--'}")
     print(f"CC     (median (IQR) / % improved): {metric_cell(d['CC'],    EPS['CC'])}")
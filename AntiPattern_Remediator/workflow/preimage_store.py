@@ -0,0 +1,143 @@
+"""
+Pre-image store for AntiPattern Remediator
+
+Instead of backing up whole repositories before a run, the original content
+of each file is saved just before its first rewrite. Contents are stored once
+per distinct SHA-256, zlib-compressed, under objects/<aa>/<rest>; each run
+appends (file, pre-image hash, written hash) records to runs/<run_id>.jsonl.
+`restore_run` rolls a run back, leaving files alone if they were edited
+again after the run wrote them.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from colorama import Fore, Style
+
+from workflow.file_operations import atomic_write_bytes
+
+DEFAULT_STORE_DIR = "../backups/preimages"
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class PreimageStore:
+    """Content-addressed, compressed file contents plus per-run manifests"""
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest[2:]
+
+    def manifest_path(self, run_id: str) -> Path:
+        return self.root / "runs" / f"{run_id}.jsonl"
+
+    def put(self, data: bytes) -> str:
+        """Store `data` (once per distinct content) and return its hash."""
+        digest = _sha256(data)
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(str(path), zlib.compress(data))
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with open(self._object_path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if _sha256(data) != digest:
+            raise ValueError(f"Pre-image {digest} is corrupt")
+        return data
+
+    def for_run(self, run_id: str) -> "RunPreimages":
+        return RunPreimages(self, run_id)
+
+    def load_manifest(self, run_id: str) -> list:
+        """The run's records, oldest first (a partially written last line is skipped)."""
+        path = self.manifest_path(run_id)
+        if not path.exists():
+            return []
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
+
+    def restore_run(self, run_id: str, force: bool = False) -> dict:
+        """
+        Put back every file the run changed. A file whose content no longer matches what
+        the run last wrote is skipped (it was changed since) unless `force` is set.
+        """
+        results = {'restored': [], 'skipped': [], 'failed': []}
+        records = self.load_manifest(run_id)
+        if not records:
+            print(Fore.RED + f"No pre-images recorded for run '{run_id}' in {self.root}" + Style.RESET_ALL)
+            return results
+
+        # Restore to the first pre-image; compare against the last write
+        first, last = {}, {}
+        for record in records:
+            first.setdefault(record['file_path'], record)
+            last[record['file_path']] = record
+
+        print(Fore.BLUE + f"\nRolling back run {run_id}: {len(first)} files" + Style.RESET_ALL)
+        for file_path, record in first.items():
+            try:
+                current = Path(file_path).read_bytes() if Path(file_path).exists() else None
+                if not force and current is not None and _sha256(current) != last[file_path]['written_sha256']:
+                    print(Fore.YELLOW + f"Skipped (changed since the run): {file_path}" + Style.RESET_ALL)
+                    results['skipped'].append(file_path)
+                    continue
+                atomic_write_bytes(file_path, self.get(record['preimage_sha256']))
+                results['restored'].append(file_path)
+            except Exception as e:
+                print(Fore.RED + f"Failed to restore {file_path}: {e}" + Style.RESET_ALL)
+                results['failed'].append(file_path)
+
+        print(Fore.GREEN + f"Restored {len(results['restored'])} files, skipped {len(results['skipped'])}, "
+              f"failed {len(results['failed'])}" + Style.RESET_ALL)
+        return results
+
+
+def preimages_for(settings, run_id: str):
+    """The run's pre-image recorder when BACKUP_MODE is "preimage", else None."""
+    return PreimageStore().for_run(run_id) if settings.BACKUP_MODE == "preimage" else None
+
+
+class RunPreimages:
+    """Records the pre-images of one run's writes"""
+
+    def __init__(self, store: PreimageStore, run_id: str):
+        self.store = store
+        self.run_id = run_id
+        self._lock = threading.Lock()
+
+    def record(self, file_path: str, preimage: bytes, written: bytes) -> None:
+        """Save the pre-image; call before `written` replaces the file."""
+        entry = {
+            'file_path': str(Path(file_path).resolve()),
+            'preimage_sha256': self.store.put(preimage),
+            'written_sha256': _sha256(written),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            path = self.store.manifest_path(self.run_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # One O_APPEND write per record, so worker processes can share the manifest
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
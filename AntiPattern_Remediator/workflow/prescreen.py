@@ -0,0 +1,112 @@
+"""
+Static pre-screen for AntiPattern Remediator
+
+This module classifies files as clearly clean or as refactoring candidates
+using deterministic metrics and SonarQube issue counts, so clean files can
+skip the LLM agents entirely.
+"""
+
+import json
+from pathlib import Path
+from colorama import Fore, Style
+
+from src.core.utils.code_signals import extract_code_signals, detect_hints
+from .file_operations import read_java_file
+
+SONARQUBE_ISSUES_FILE = "issues.json"
+
+# A file is clearly clean only if it stays within every limit
+CLEAN_THRESHOLDS = {
+    "max_cc": 5,
+    "max_nesting": 2,
+    "sloc": 150,
+    "method_count": 15,
+    "sonarqube_issues": 0,
+}
+
+
+def _relative_to_repo(file_path: str):
+    """Split a path under 'clones/<repo>/' into (repo_path, path relative to the repo)."""
+    path = Path(file_path)
+    for i, part in enumerate(path.parts):
+        if part == 'clones' and i + 1 < len(path.parts):
+            return str(Path(*path.parts[:i + 2])), Path(*path.parts[i + 2:]).as_posix()
+    return None, None
+
+
+def load_sonarqube_issue_counts(repo_paths) -> dict:
+    """Count SonarQube issues per file from each repository's saved issues.json."""
+    counts = {}
+    for repo_path in repo_paths:
+        issues_file = Path(repo_path) / SONARQUBE_ISSUES_FILE
+        if not issues_file.exists():
+            continue
+        try:
+            with open(issues_file, 'r', encoding='utf-8') as f:
+                issues = json.load(f).get('issues', [])
+        except Exception as e:
+            print(Fore.YELLOW + f"Could not read SonarQube issues from {issues_file}: {e}" + Style.RESET_ALL)
+            continue
+
+        file_counts = {}
+        for issue in issues:
+            # component is '<project_key>:<path relative to the repository>'
+            component = issue.get('component', '')
+            _, _, relative = component.partition(':')
+            if relative:
+                file_counts[relative] = file_counts.get(relative, 0) + 1
+        counts[str(repo_path)] = file_counts
+    return counts
+
+
+def classify_file(code: str, sonarqube_issues: int = None, thresholds: dict = None) -> dict:
+    """
+    Classify source code as 'clean' or 'candidate'.
+    Unknown SonarQube counts (None) do not block a clean verdict.
+    """
+    limits = thresholds or CLEAN_THRESHOLDS
+    signals = extract_code_signals(code)
+    reasons = []
+
+    if not signals['parsed']:
+        reasons.append("could not be parsed")
+    for key in ("max_cc", "max_nesting", "sloc", "method_count"):
+        if signals.get(key, 0) > limits[key]:
+            reasons.append(f"{key}={signals[key]} > {limits[key]}")
+    if sonarqube_issues is not None and sonarqube_issues > limits["sonarqube_issues"]:
+        reasons.append(f"sonarqube_issues={sonarqube_issues}")
+    reasons.extend(f"hint:{hint}" for hint in detect_hints(signals))
+
+    return {
+        'classification': 'candidate' if reasons else 'clean',
+        'reasons': reasons,
+        'sonarqube_issues': sonarqube_issues,
+        'signals': signals,
+    }
+
+
+def prescreen_files(file_paths: list, repo_paths=None) -> tuple:
+    """Split file paths into (candidates, clean) where clean holds classification records."""
+    issue_counts = load_sonarqube_issue_counts(repo_paths or [])
+    candidates = []
+    clean = []
+
+    for file_path in file_paths:
+        code = read_java_file(file_path)
+        if code is None:
+            # Let the workflow report the read failure
+            candidates.append(file_path)
+            continue
+
+        repo_path, relative = _relative_to_repo(file_path)
+        repo_counts = issue_counts.get(repo_path)
+        sonarqube_issues = repo_counts.get(relative, 0) if repo_counts is not None else None
+
+        result = classify_file(code, sonarqube_issues)
+        if result['classification'] == 'clean':
+            clean.append({'file_path': file_path, **result})
+        else:
+            candidates.append(file_path)
+
+    print(Fore.CYAN + f"Pre-screen: {len(candidates)} candidates, {len(clean)} clearly clean files skipped" + Style.RESET_ALL)
+    return candidates, clean
@@ -0,0 +1,261 @@
+"""
+SQLite results database for AntiPattern Remediator
+
+Every repo run records into one database next to the other results
+(../processing_results/results.db), so cross-run questions are indexed
+queries rather than scans over per-file JSON:
+
+- runs: one row per run id (model, provider, backup mode, start/finish, summary);
+- files: one row per run and file (status, anti-pattern count, review rounds, gate results);
+- metrics: original / refactored / improvement code metrics, one row per value;
+- findings: the scanner's anti-patterns with their location and description;
+- stage_timings: the instrumentation records (node wall times, LLM and retrieval latency).
+
+Worker processes write to the same database; like the work queue, it relies on
+SQLite locking, so keep it on a local disk or a filesystem with working fcntl.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_DB_PATH = "../processing_results/results.db"
+
+# Metric columns compared by metric pooling
+DELTA_METRICS = ("avg_cc", "max_cc", "file_sloc_nloc", "max_nd_in_file")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    model TEXT,
+    provider TEXT,
+    backup_mode TEXT,
+    total_files INTEGER,
+    failed_files INTEGER,
+    summary TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    run_id TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT,
+    antipatterns_count INTEGER,
+    code_review_times INTEGER,
+    precheck_results TEXT,
+    compile_results TEXT,
+    test_status TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, file_path)
+);
+CREATE INDEX IF NOT EXISTS files_by_path ON files (file_path);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    phase TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, file_path, phase, name)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_name ON metrics (name, phase);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    antipattern TEXT NOT NULL,
+    location TEXT,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_by_file ON findings (run_id, file_path);
+CREATE INDEX IF NOT EXISTS findings_by_antipattern ON findings (antipattern);
+CREATE TABLE IF NOT EXISTS stage_timings (
+    run_id TEXT NOT NULL,
+    file_path TEXT,
+    event TEXT NOT NULL,
+    node TEXT,
+    seconds REAL,
+    ttft_s REAL,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER,
+    error TEXT,
+    timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS stage_timings_by_run ON stage_timings (run_id, event, node);
+"""
+
+# Metric phases as stored, keyed by their name in the metrics JSON
+METRIC_PHASES = {"original_metrics": "original", "refactored_metrics": "refactored", "improvements": "improvement"}
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class ResultsDB:
+    """Runs, files, metrics, findings and stage timings in one SQLite database"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")  # Readers don't block the writers
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def _write(self, statements) -> None:
+        """Run (sql, params-list) pairs in one transaction."""
+        conn = self._connect()
+        try:
+            with conn:
+                for sql, rows in statements:
+                    conn.executemany(sql, rows)
+        finally:
+            conn.close()
+
+    def _query(self, sql: str, params=()) -> list:
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    # Writes
+
+    def start_run(self, run_id: str, settings) -> None:
+        """Register a run; a resumed run keeps its original start time."""
+        self._write([(
+            "INSERT OR IGNORE INTO runs (run_id, started_at, model, provider, backup_mode) VALUES (?, ?, ?, ?, ?)",
+            [(run_id, _now(), settings.LLM_MODEL, settings.LLM_PROVIDER, settings.BACKUP_MODE)],
+        )])
+
+    def record_file_state(self, run_id: str, file_path: str, final_state: dict, metrics_data: dict) -> None:
+        """Store a file's graph outcome, metrics and findings (replacing any earlier record for the file)."""
+        report = final_state.get("antipatterns_scan_report") or {}
+        findings = report.get("antipatterns_detected") or []
+        metric_rows = [
+            (run_id, file_path, phase, name, float(value))
+            for key, phase in METRIC_PHASES.items()
+            for name, value in (metrics_data.get(key) or {}).items()
+            if _is_number(value)
+        ]
+        key = (run_id, file_path)
+        self._write([
+            (
+                """
+                INSERT INTO files (run_id, file_path, antipatterns_count, code_review_times, precheck_results,
+                                   compile_results, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_id, file_path) DO UPDATE SET
+                    antipatterns_count = excluded.antipatterns_count, code_review_times = excluded.code_review_times,
+                    precheck_results = excluded.precheck_results, compile_results = excluded.compile_results,
+                    updated_at = excluded.updated_at
+                """,
+                [(run_id, file_path, report.get("total_antipatterns_found"), final_state.get("code_review_times"),
+                  final_state.get("precheck_results"), final_state.get("compile_results"), _now())],
+            ),
+            ("DELETE FROM metrics WHERE run_id = ? AND file_path = ?", [key]),
+            ("INSERT INTO metrics (run_id, file_path, phase, name, value) VALUES (?, ?, ?, ?, ?)", metric_rows),
+            ("DELETE FROM findings WHERE run_id = ? AND file_path = ?", [key]),
+            (
+                "INSERT INTO findings (run_id, file_path, antipattern, location, description) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, file_path, f.get("name"), f.get("location"), f.get("description")) for f in findings],
+            ),
+        ])
+
+    def record_file_results(self, run_id: str, processed_files: list, failed_files: list) -> None:
+        """Store each file's final status (processing results, plus failures)."""
+        rows = [
+            (run_id, r['file_path'], r['status'], r.get('antipatterns_count'), r.get('code_review_times'),
+             (r.get('test_results') or {}).get('status'), _now())
+            for r in processed_files
+        ] + [(run_id, file_path, 'failed', None, None, None, _now()) for file_path in failed_files]
+        self._write([(
+            """
+            INSERT INTO files (run_id, file_path, status, antipatterns_count, code_review_times, test_status, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, file_path) DO UPDATE SET
+                status = excluded.status,
+                antipatterns_count = COALESCE(excluded.antipatterns_count, files.antipatterns_count),
+                code_review_times = COALESCE(excluded.code_review_times, files.code_review_times),
+                test_status = excluded.test_status, updated_at = excluded.updated_at
+            """,
+            rows,
+        )])
+
+    def record_stage_timings(self, run_id: str, records: list) -> None:
+        """Replace the run's stage timings with `records` (instrumentation records)."""
+        self._write([
+            ("DELETE FROM stage_timings WHERE run_id = ?", [(run_id,)]),
+            (
+                """
+                INSERT INTO stage_timings (run_id, file_path, event, node, seconds, ttft_s, prompt_tokens,
+                                           completion_tokens, error, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(run_id, r.get('file'), r['event'], r.get('node'), r.get('wall_time_s', r.get('latency_s')),
+                  r.get('ttft_s'), r.get('prompt_tokens'), r.get('completion_tokens'), r.get('error'),
+                  r.get('timestamp'))
+                 for r in records],
+            ),
+        ])
+
+    def finish_run(self, run_id: str, total_files: int, failed_files: int, summary: dict = None) -> None:
+        self._write([(
+            "UPDATE runs SET finished_at = ?, total_files = ?, failed_files = ?, summary = ? WHERE run_id = ?",
+            [(_now(), total_files, failed_files, json.dumps(summary, default=str) if summary else None, run_id)],
+        )])
+
+    # Queries
+
+    def runs(self) -> list:
+        return self._query("SELECT * FROM runs ORDER BY started_at")
+
+    def metric_pairs(self, run_id: str = None) -> list:
+        """(original, refactored) DELTA_METRICS dicts for every file that has both, optionally for one run."""
+        rows = self._query(
+            f"""
+            SELECT run_id, file_path, phase, name, value FROM metrics
+            WHERE phase IN ('original', 'refactored') AND name IN ({', '.join('?' * len(DELTA_METRICS))})
+            {'AND run_id = ?' if run_id else ''}
+            ORDER BY run_id, file_path
+            """,
+            (*DELTA_METRICS, run_id) if run_id else DELTA_METRICS,
+        )
+        by_file = {}
+        for row in rows:
+            by_file.setdefault((row['run_id'], row['file_path']), {}).setdefault(row['phase'], {})[row['name']] = row['value']
+        return [
+            (phases['original'], phases['refactored'])
+            for phases in by_file.values()
+            if all(len(phases.get(phase, {})) == len(DELTA_METRICS) for phase in ('original', 'refactored'))
+        ]
+
+    def findings_by_antipattern(self, run_id: str = None) -> dict:
+        """Number of findings per anti-pattern name."""
+        rows = self._query(
+            f"SELECT antipattern, COUNT(*) AS n FROM findings {'WHERE run_id = ?' if run_id else ''} "
+            "GROUP BY antipattern ORDER BY n DESC",
+            (run_id,) if run_id else (),
+        )
+        return {row['antipattern']: row['n'] for row in rows}
+
+    def status_counts(self, run_id: str) -> dict:
+        rows = self._query("SELECT status, COUNT(*) AS n FROM files WHERE run_id = ? GROUP BY status", (run_id,))
+        return {row['status']: row['n'] for row in rows}
+
+
+def results_db_for(settings, db_path: str = DEFAULT_DB_PATH):
+    """The results database when RESULTS_DB_ENABLED is on, else None."""
+    return ResultsDB(db_path) if settings.RESULTS_DB_ENABLED else None
@@ -45,48 +45,153 @@ def compute_code_metrics(final_state: dict) -> dict:
         return {}
 
 
-def save_intermediate_results(file_path: str, final_state: dict, settings, results_dir: str = "../processing_results") -> bool:
-    """Save intermediate results from the agentic workflow for analysis in markdown format."""
-    try:
-        # Compute code metrics
-        metrics_data = compute_code_metrics(final_state)
+SNIPPET_FILE = 'java_code_snippet'
 
-        if file_path != 'java_code_snippet' and not None:
-            # Create results directory if it doesn't exist
-            results_path = Path(results_dir)
-            results_path.mkdir(parents=True, exist_ok=True)
-            
-            # Create a unique filename based on the original file path
-            file_path_obj = Path(file_path)
-            
-            # Extract the meaningful part of the path starting from the repository name
-            # Find the 'clones' directory and take everything after it
-            meaningful_path = None
-            for i, part in enumerate(file_path_obj.parts):
-                if part == 'clones' and i + 1 < len(file_path_obj.parts):
-                    # Take from the repo name onwards
-                    meaningful_path = Path(*file_path_obj.parts[i+1:])
-                    break
-            
-            if meaningful_path is None:
-                # Fallback: use just the filename if 'clones' not found
-                meaningful_path = file_path_obj.name
-            
-            # Create a safe filename by replacing path separators and other problematic characters
-            safe_filename = str(meaningful_path).replace('/', '_').replace('\\', '_').replace(':', '_')
-            
-            # Replace .java extension with .md and add results suffix
-            if safe_filename.endswith('.java'):
-                safe_filename = safe_filename[:-5]  # Remove .java
-            results_filename = f"{safe_filename}_results.md"
-            results_file_path = results_path / results_filename
-        else: 
-            results_filename = f"java_code_snippet_results.md"
-            results_file_path = results_filename
-
-        # Generate markdown content
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        markdown_content = f"""# Processing Results: {file_path_obj.name if file_path != 'java_code_snippet' else 'Java Code Snippet'}
+
+def results_file_paths(file_path: str, results_dir: str = "../processing_results"):
+    """(markdown path, metrics JSON path) for a processed file's intermediate results."""
+    if file_path == SNIPPET_FILE:
+        return Path("java_code_snippet_results.md"), Path("java_code_snippet_metrics.json")
+
+    file_path_obj = Path(file_path)
+
+    # Extract the meaningful part of the path starting from the repository name
+    # Find the 'clones' directory and take everything after it
+    meaningful_path = None
+    for i, part in enumerate(file_path_obj.parts):
+        if part == 'clones' and i + 1 < len(file_path_obj.parts):
+            # Take from the repo name onwards
+            meaningful_path = Path(*file_path_obj.parts[i+1:])
+            break
+
+    if meaningful_path is None:
+        # Fallback: use just the filename if 'clones' not found
+        meaningful_path = file_path_obj.name
+
+    # Create a safe filename by replacing path separators and other problematic characters
+    safe_filename = str(meaningful_path).replace('/', '_').replace('\\', '_').replace(':', '_')
+
+    # Replace .java extension with .md and add results suffix
+    if safe_filename.endswith('.java'):
+        safe_filename = safe_filename[:-5]  # Remove .java
+    results_path = Path(results_dir)
+    return results_path / f"{safe_filename}_results.md", results_path / f"{safe_filename}_metrics.json"
+
+
+def _render_agent_results(parts: list, results, empty_message: str) -> None:
+    """Scanner/strategist output: raw text, a dict of sections, or anything else as JSON."""
+    if results:
+        if isinstance(results, str):
+            parts.append(f"\n{results}\n\n\n")
+        elif isinstance(results, dict):
+            for key, value in results.items():
+                parts.append(f"### {key.replace('_', ' ').title()}\n")
+                if isinstance(value, (list, dict)):
+                    parts.append(f"```json\n{json.dumps(value, indent=2)}\n```\n\n")
+                else:
+                    parts.append(f"{value}\n\n")
+        else:
+            parts.append(f"```json\n{json.dumps(results, indent=2, default=str)}\n```\n\n")
+    else:
+        parts.append(empty_message)
+
+
+def _render_explanation(parts: list, explanation_results) -> None:
+    if not explanation_results:
+        parts.append("No explanation generated.\n\n")
+        return
+
+    parts.append("---\n\n## Explanation Results\n\n")
+    if not isinstance(explanation_results, dict):
+        # Fallback to JSON if format is unexpected
+        parts.append(f"```json\n{json.dumps(explanation_results, indent=2, default=str)}\n```\n\n")
+        return
+
+    # Handle individual anti-patterns
+    items = explanation_results.get('items', [])
+    if items:
+        parts.append("### Anti-Patterns Addressed\n\n")
+        for i, item in enumerate(items, 1):
+            parts.append(f"#### {i}. {item.get('antipattern_name', 'Unknown Pattern')}\n\n")
+            # Loop through all keys in the item (except refactored_code and antipattern_name)
+            for key, value in item.items():
+                if key not in ['antipattern_name', 'refactored_code'] and value:
+                    # Convert snake_case to Title Case for heading
+                    parts.append(f"**{key.replace('_', ' ').title()}:** {value}\n\n")
+            parts.append("---\n\n")
+
+    # Handle all other sections dynamically
+    for key, value in explanation_results.items():
+        if key != 'items' and value:  # Skip items (already processed) and empty values
+            parts.append(f"### {key.replace('_', ' ').title()}\n\n")
+            if isinstance(value, list):
+                parts.extend(f"- {item}\n" for item in value)
+                parts.append("\n")
+            else:
+                parts.append(f"{value}\n\n")
+
+
+def _render_code_comparison(parts: list, original_code: str, refactored_code: str) -> None:
+    parts.append("---\n\n## Code Comparison\n\n")
+    if not (original_code or refactored_code):
+        parts.append("No code available for comparison.\n\n")
+        return
+
+    parts.append("### Original Code vs Refactored Code\n\n")
+    parts.append('<div style="display: flex; gap: 20px;">\n\n')
+    for label, code, missing in (
+        ("Original Code", original_code, "*No original code available*"),
+        ("Refactored Code", refactored_code, "*No refactored code generated*"),
+    ):
+        parts.append('<div style="flex: 1;">\n\n')
+        parts.append(f"**{label}:**\n\n")
+        parts.append(f"```java\n{code}\n```\n\n" if code else f"{missing}\n\n")
+        parts.append('</div>\n\n')
+    parts.append('</div>\n\n')
+
+
+def _render_metrics(parts: list, metrics_data: dict) -> None:
+    if not metrics_data:
+        return
+    parts.append("---\n\n## Code Metrics\n\n")
+
+    # Display Original and Refactored metrics side by side
+    rows = (
+        ("Source Lines of Code (SLOC)", 'file_sloc_nloc'),
+        ("Total Functions", 'total_functions'),
+        ("Average Cyclomatic Complexity", 'avg_cc'),
+        ("Max Cyclomatic Complexity", 'max_cc'),
+        ("Max Nesting Depth", 'max_nd_in_file'),
+    )
+    if 'original_metrics' in metrics_data and 'refactored_metrics' in metrics_data:
+        orig = metrics_data['original_metrics']
+        refac = metrics_data['refactored_metrics']
+        parts.append("### Original vs Refactored Code \n\n")
+        parts.append("| Metric | Original | Refactored |\n")
+        parts.append("|--------|----------|------------|\n")
+        parts.extend(f"| **{label}** | {orig.get(key, 'N/A')} | {refac.get(key, 'N/A')} |\n" for label, key in rows)
+        parts.append("\n")
+    elif 'original_metrics' in metrics_data:
+        orig = metrics_data['original_metrics']
+        parts.append("### Original Code Metrics\n\n")
+        parts.extend(f"- **{label}:** {orig.get(key, 'N/A')}\n" for label, key in rows)
+        parts.append("\n")
+
+    # Display Improvements
+    if 'improvements' in metrics_data:
+        imp = metrics_data['improvements']
+        parts.append("### Comparison\n\n")
+        parts.append(f"- **Lines of Code Change:** {imp.get('sloc_reduction', 0):+d} lines\n")
+        parts.append(f"- **Function Count Change:** {imp.get('function_count_change', 0):+d} functions\n")
+        parts.append(f"- **Average Complexity Improvement:** {imp.get('avg_cc_improvement', 0):+.2f}\n")
+        parts.append(f"- **Max Complexity Reduction:** {imp.get('max_cc_reduction', 0):+d}\n")
+        parts.append(f"- **Max Nesting Reduction:** {imp.get('max_nesting_reduction', 0):+d}\n\n")
+
+
+def render_results_markdown(file_path: str, final_state: dict, metrics_data: dict, model_name: str, timestamp: str) -> str:
+    """The intermediate results report for one file, as markdown."""
+    title = Path(file_path).name if file_path != SNIPPET_FILE else 'Java Code Snippet'
+    parts = [f"""# Processing Results: {title}
 
 ## File Information
 - **Original File Path**: `{file_path}`
@@ -97,190 +202,53 @@ def save_intermediate_results(file_path: str, final_state: dict, settings, resul
 
 ## Anti-Pattern Scanner Results
 
-"""
-        
-        antipatterns_results = final_state.get('antipatterns_scanner_results')
-        if antipatterns_results:
-            if isinstance(antipatterns_results, str):
-                markdown_content += f"\n{antipatterns_results}\n\n\n"
-            elif isinstance(antipatterns_results, dict):
-                for key, value in antipatterns_results.items():
-                    markdown_content += f"### {key.replace('_', ' ').title()}\n"
-                    if isinstance(value, (list, dict)):
-                        markdown_content += f"```json\n{json.dumps(value, indent=2)}\n```\n\n"
-                    else:
-                        markdown_content += f"{value}\n\n"
-            else:
-                markdown_content += f"```json\n{json.dumps(antipatterns_results, indent=2, default=str)}\n```\n\n"
-        else:
-            markdown_content += "No anti-patterns detected or scanner did not run.\n\n"
-        
-        markdown_content += "---\n\n## Refactoring Strategy Results\n\n"
-        
-        refactoring_results = final_state.get('refactoring_strategy_results')
-        if refactoring_results:
-            if isinstance(refactoring_results, str):
-                markdown_content += f"\n{refactoring_results}\n\n\n"
-            elif isinstance(refactoring_results, dict):
-                for key, value in refactoring_results.items():
-                    markdown_content += f"### {key.replace('_', ' ').title()}\n"
-                    if isinstance(value, (list, dict)):
-                        markdown_content += f"```json\n{json.dumps(value, indent=2)}\n```\n\n"
-                    else:
-                        markdown_content += f"{value}\n\n"
-            else:
-                markdown_content += f"```json\n{json.dumps(refactoring_results, indent=2, default=str)}\n```\n\n"
-        else:
-            markdown_content += "No refactoring strategy generated.\n\n"
-        
-        if final_state.get("explanation_json"):
-            explanation_results = final_state.get('explanation_json')
-            markdown_content += "---\n\n## Explanation Results\n\n"
-            
-            # Parse and format the explanation JSON
-            if isinstance(explanation_results, dict):
-                # Handle individual anti-patterns
-                items = explanation_results.get('items', [])
-                if items:
-                    markdown_content += "### Anti-Patterns Addressed\n\n"
-                    
-                    for i, item in enumerate(items, 1):
-                        antipattern_name = item.get('antipattern_name', 'Unknown Pattern')
-                        markdown_content += f"#### {i}. {antipattern_name}\n\n"
-                        
-                        # Loop through all keys in the item (except refactored_code and antipattern_name)
-                        for key, value in item.items():
-                            if key not in ['antipattern_name', 'refactored_code'] and value:
-                                # Convert snake_case to Title Case for heading
-                                heading = key.replace('_', ' ').title()
-                                markdown_content += f"**{heading}:** {value}\n\n"
-                        
-                        markdown_content += "---\n\n"
-                
-                # Handle all other sections dynamically
-                for key, value in explanation_results.items():
-                    if key != 'items' and value:  # Skip items (already processed) and empty values
-                        # Convert snake_case to Title Case for section heading
-                        section_title = key.replace('_', ' ').title()
-                        markdown_content += f"### {section_title}\n\n"
-                        
-                        if isinstance(value, list):
-                            # Handle list items
-                            for item in value:
-                                markdown_content += f"- {item}\n"
-                            markdown_content += "\n"
-                        else:
-                            # Handle single values
-                            markdown_content += f"{value}\n\n"
-            else:
-                # Fallback to JSON if format is unexpected
-                markdown_content += f"```json\n{json.dumps(explanation_results, indent=2, default=str)}\n```\n\n"
-        else:
-            markdown_content += "No explanation generated.\n\n"
-        
-        # Add side-by-side code comparison
-        markdown_content += "---\n\n## Code Comparison\n\n"
-        
-        original_code = final_state.get('code', '')
-        refactored_code = final_state.get('refactored_code', '')
-        
-        if original_code or refactored_code:
-            markdown_content += "### Original Code vs Refactored Code\n\n"
-            markdown_content += '<div style="display: flex; gap: 20px;">\n\n'
-            
-            # Original code column
-            markdown_content += '<div style="flex: 1;">\n\n'
-            markdown_content += "**Original Code:**\n\n"
-            if original_code:
-                markdown_content += f"```java\n{original_code}\n```\n\n"
-            else:
-                markdown_content += "*No original code available*\n\n"
-            markdown_content += '</div>\n\n'
-            
-            # Refactored code column
-            markdown_content += '<div style="flex: 1;">\n\n'
-            markdown_content += "**Refactored Code:**\n\n"
-            if refactored_code:
-                markdown_content += f"```java\n{refactored_code}\n```\n\n"
-            else:
-                markdown_content += "*No refactored code generated*\n\n"
-            markdown_content += '</div>\n\n'
-            
-            markdown_content += '</div>\n\n'
-            
-        else:
-            markdown_content += "No code available for comparison.\n\n"
-        
-        # Add code metrics section
-        if metrics_data:
-            markdown_content += "---\n\n## Code Metrics\n\n"
-            
-            # Display Original and Refactored metrics side by side
-            if 'original_metrics' in metrics_data and 'refactored_metrics' in metrics_data:
-                orig = metrics_data['original_metrics']
-                refac = metrics_data['refactored_metrics']
-
-                markdown_content += "### Original vs Refactored Code \n\n"
-                markdown_content += "| Metric | Original | Refactored |\n"
-                markdown_content += "|--------|----------|------------|\n"
-                markdown_content += f"| **Source Lines of Code (SLOC)** | {orig.get('file_sloc_nloc', 'N/A')} | {refac.get('file_sloc_nloc', 'N/A')} |\n"
-                markdown_content += f"| **Total Functions** | {orig.get('total_functions', 'N/A')} | {refac.get('total_functions', 'N/A')} |\n"
-                markdown_content += f"| **Average Cyclomatic Complexity** | {orig.get('avg_cc', 'N/A')} | {refac.get('avg_cc', 'N/A')} |\n"
-                markdown_content += f"| **Max Cyclomatic Complexity** | {orig.get('max_cc', 'N/A')} | {refac.get('max_cc', 'N/A')} |\n"
-                markdown_content += f"| **Max Nesting Depth** | {orig.get('max_nd_in_file', 'N/A')} | {refac.get('max_nd_in_file', 'N/A')} |\n\n"
-            
-            elif 'original_metrics' in metrics_data:
-                orig = metrics_data['original_metrics']
-                markdown_content += "### Original Code Metrics\n\n"
-                markdown_content += f"- **Source Lines of Code (SLOC):** {orig.get('file_sloc_nloc', 'N/A')}\n"
-                markdown_content += f"- **Total Functions:** {orig.get('total_functions', 'N/A')}\n"
-                markdown_content += f"- **Average Cyclomatic Complexity:** {orig.get('avg_cc', 'N/A')}\n"
-                markdown_content += f"- **Max Cyclomatic Complexity:** {orig.get('max_cc', 'N/A')}\n"
-                markdown_content += f"- **Max Nesting Depth:** {orig.get('max_nd_in_file', 'N/A')}\n\n"
-            
-            # Display Improvements
-            if 'improvements' in metrics_data:
-                imp = metrics_data['improvements']
-                markdown_content += "### Comparison\n\n"
-
-                sloc_change = imp.get('sloc_reduction', 0)
-                func_change = imp.get('function_count_change', 0)
-                avg_cc_imp = imp.get('avg_cc_improvement', 0)
-                max_cc_red = imp.get('max_cc_reduction', 0)
-                nest_red = imp.get('max_nesting_reduction', 0)
-                
-                markdown_content += f"- **Lines of Code Change:** {sloc_change:+d} lines\n"
-                markdown_content += f"- **Function Count Change:** {func_change:+d} functions\n"
-                markdown_content += f"- **Average Complexity Improvement:** {avg_cc_imp:+.2f}\n"
-                markdown_content += f"- **Max Complexity Reduction:** {max_cc_red:+d}\n"
-                markdown_content += f"- **Max Nesting Reduction:** {nest_red:+d}\n\n"
-        
-        markdown_content += f"---\n\n*Generated by AntiPattern Remediator Tool using {settings.LLM_MODEL}*\n"        
-        # Save to markdown file
-        with open(results_file_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-        
-        # Save metrics to JSON file if available
-        if metrics_data:
-            if file_path != 'java_code_snippet':
-                json_filename = f"{safe_filename}_metrics.json"
-                json_file_path = results_path / json_filename
-            else:
-                json_filename = "java_code_snippet_metrics.json"
-                json_file_path = json_filename
-            
-            # Include file path and timestamp in metrics JSON
-            metrics_with_metadata = {
-                "file_path": file_path,
-                "timestamp": timestamp,
-                "metrics": metrics_data
-            }
-            
-            with open(json_file_path, 'w', encoding='utf-8') as f:
-                json.dump(metrics_with_metadata, f, indent=2)
-            
+"""]
+    _render_agent_results(parts, final_state.get('antipatterns_scanner_results'),
+                          "No anti-patterns detected or scanner did not run.\n\n")
+    parts.append("---\n\n## Refactoring Strategy Results\n\n")
+    _render_agent_results(parts, final_state.get('refactoring_strategy_results'),
+                          "No refactoring strategy generated.\n\n")
+    _render_explanation(parts, final_state.get("explanation_json"))
+    _render_code_comparison(parts, final_state.get('code', ''), final_state.get('refactored_code', ''))
+    _render_metrics(parts, metrics_data)
+    parts.append(f"---\n\n*Generated by AntiPattern Remediator Tool using {model_name}*\n")
+    return "".join(parts)
+
+
+def write_intermediate_results(file_path: str, final_state: dict, metrics_data: dict, model_name: str,
+                               results_dir: str = "../processing_results", timestamp: str = None):
+    """Write the markdown report and metrics JSON; returns (markdown path, metrics path or None)."""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    results_file_path, json_file_path = results_file_paths(file_path, results_dir)
+    results_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(results_file_path, 'w', encoding='utf-8') as f:
+        f.write(render_results_markdown(file_path, final_state, metrics_data, model_name, timestamp))
+
+    if not metrics_data:
+        return results_file_path, None
+
+    # Include file path and timestamp in metrics JSON
+    metrics_with_metadata = {
+        "file_path": file_path,
+        "timestamp": timestamp,
+        "metrics": metrics_data
+    }
+    with open(json_file_path, 'w', encoding='utf-8') as f:
+        json.dump(metrics_with_metadata, f, indent=2)
+    return results_file_path, json_file_path
+
+
+def save_intermediate_results(file_path: str, final_state: dict, settings, results_dir: str = "../processing_results") -> bool:
+    """Save intermediate results from the agentic workflow for analysis in markdown format."""
+    try:
+        # Compute code metrics
+        metrics_data = compute_code_metrics(final_state)
+        results_file_path, json_file_path = write_intermediate_results(
+            file_path, final_state, metrics_data, settings.LLM_MODEL, results_dir
+        )
+        if json_file_path is not None:
             print(Fore.CYAN + f"Code metrics saved: {json_file_path}" + Style.RESET_ALL)
-        
         print(Fore.CYAN + f"Intermediate results saved: {results_file_path}" + Style.RESET_ALL)
         return True
         
@@ -289,7 +257,51 @@ def save_intermediate_results(file_path: str, final_state: dict, settings, resul
         return False
 
 
-def create_processing_summary(processed_files: list, backup_info: dict, results_dir: str = "../processing_results") -> str:
+def record_run_results(results_db, run_id: str, processed_files: list, failed_files: list,
+                       stage_records: list = None, summary: dict = None) -> bool:
+    """Record a finished run's file statuses, stage timings and summary in the results database."""
+    try:
+        results_db.record_file_results(run_id, processed_files, failed_files)
+        if stage_records is not None:
+            results_db.record_stage_timings(run_id, stage_records)
+        results_db.finish_run(run_id, len(processed_files) + len(failed_files), len(failed_files), summary)
+        print(Fore.CYAN + f"Run recorded in results database: {results_db.db_path}" + Style.RESET_ALL)
+        return True
+    except Exception as e:
+        print(Fore.RED + f"Error recording run {run_id} in the results database: {e}" + Style.RESET_ALL)
+        return False
+
+
+def export_stage_metrics(instrumentation, results_dir: str = "../processing_results") -> dict:
+    """Export per-stage records as JSONL and return the aggregated stage summary."""
+    try:
+        results_path = Path(results_dir)
+        results_path.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        metrics_file = results_path / f"stage_metrics_{timestamp}.jsonl"
+        instrumentation.export_jsonl(metrics_file)
+        print(Fore.CYAN + f"Stage metrics saved: {metrics_file}" + Style.RESET_ALL)
+        return instrumentation.summary()
+    except Exception as e:
+        print(Fore.RED + f"Error exporting stage metrics: {e}" + Style.RESET_ALL)
+        return None
+
+
+def processing_rates(processed_files: list) -> dict:
+    """Per-file rates and averages over the files sent to the agents; pre-screen skips are not counted."""
+    attempted = [f for f in processed_files if f['status'] != 'skipped_clean']
+    if not attempted:
+        return {'refactoring_success_rate': 0, 'antipattern_detection_rate': 0,
+                'average_code_reviews': 0, 'average_antipatterns_per_file': 0}
+    return {
+        'refactoring_success_rate': sum(1 for f in attempted if f['status'] == 'success') / len(attempted) * 100,
+        'antipattern_detection_rate': sum(1 for f in attempted if f.get('antipatterns_found', False)) / len(attempted) * 100,
+        'average_code_reviews': sum(f.get('code_review_times', 0) for f in attempted) / len(attempted),
+        'average_antipatterns_per_file': sum(f.get('antipatterns_count', 0) for f in attempted) / len(attempted),
+    }
+
+
+def create_processing_summary(processed_files: list, backup_info: dict, results_dir: str = "../processing_results", stage_summary: dict = None) -> str:
     """Create a comprehensive summary report of the processing session."""
     try:
         results_path = Path(results_dir)
@@ -301,8 +313,11 @@ def create_processing_summary(processed_files: list, backup_info: dict, results_
         # Categorize results
         successful_refactoring = [f for f in processed_files if f['status'] == 'success']
         no_refactoring_needed = [f for f in processed_files if f['status'] == 'no_refactoring']
+        skipped_clean = [f for f in processed_files if f['status'] == 'skipped_clean']
         files_with_antipatterns = [f for f in processed_files if f.get('antipatterns_found', False)]
         total_antipatterns = sum(f.get('antipatterns_count', 0) for f in processed_files)
+        test_results = [f['test_results'] for f in processed_files if f.get('test_results')]
+        rates = processing_rates(processed_files)
         
         summary_data = {
             'processing_session': {
@@ -311,22 +326,30 @@ def create_processing_summary(processed_files: list, backup_info: dict, results_
                 'total_files_processed': len(processed_files),
                 'successful_refactoring': len(successful_refactoring),
                 'no_refactoring_needed': len(no_refactoring_needed),
+                'skipped_clean': len(skipped_clean),
                 'files_with_antipatterns_detected': len(files_with_antipatterns),
                 'total_antipatterns_found': total_antipatterns
             },
             'detailed_results': {
                 'successful_refactoring': successful_refactoring,
                 'no_refactoring_needed': no_refactoring_needed,
+                'skipped_clean': skipped_clean,
             },
             'statistics': {
-                'refactoring_success_rate': len(successful_refactoring) / len(processed_files) * 100 if processed_files else 0,
-                'antipattern_detection_rate': len(files_with_antipatterns) / len(processed_files) * 100 if processed_files else 0,
-                'average_code_reviews': sum(f.get('code_review_times', 0) for f in processed_files) / len(processed_files) if processed_files else 0,
+                'refactoring_success_rate': rates['refactoring_success_rate'],
+                'antipattern_detection_rate': rates['antipattern_detection_rate'],
+                'average_code_reviews': rates['average_code_reviews'],
                 'total_antipatterns_found': total_antipatterns,
-                'average_antipatterns_per_file': total_antipatterns / len(processed_files) if processed_files else 0
+                'average_antipatterns_per_file': rates['average_antipatterns_per_file'],
+                'targeted_tests_passed': sum(1 for t in test_results if t['status'] == 'passed'),
+                'targeted_tests_failed': sum(1 for t in test_results if t['status'] in ('failed', 'timeout', 'error')),
+                'targeted_tests_duration_seconds': round(sum(t['duration_seconds'] for t in test_results), 2)
             }
         }
         
+        if stage_summary:
+            summary_data['stage_metrics'] = stage_summary
+        
         # Save summary
         with open(summary_file, 'w', encoding='utf-8') as f:
             json.dump(summary_data, f, indent=2, ensure_ascii=False, default=str)
@@ -0,0 +1,197 @@
+"""
+Background results writer for AntiPattern Remediator
+
+Metrics, markdown reports and the consolidated result store are produced on
+a writer thread, so the workflow threads only hand over the final state and
+go back to the LLM-bound work. Besides the per-file markdown and metrics
+JSON, every state is appended to one JSONL store per run
+(results_<run_id>.jsonl), which is fsynced in batches rather than per file;
+with RESULTS_STORE=parquet it is also converted to Parquet when the writer
+closes (requires pyarrow). With a ResultsDB, the file's metrics and findings
+are recorded there too. With background=False the same writes happen on the
+submitting thread.
+
+A file can appear more than once in the store (e.g. again once its deferred
+explanation is ready); the last record for a file is the current one.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from colorama import Fore, Style
+
+from .results_manager import compute_code_metrics, write_intermediate_results
+
+RESULT_STORES = ("jsonl", "parquet", "none")
+QUEUE_SIZE = 256          # Back-pressure: submit blocks once this many states are waiting
+FSYNC_EVERY = 50          # Records between fsyncs of the consolidated store
+FSYNC_INTERVAL = 5.0      # ...or seconds, whichever comes first
+
+# Final-state keys kept in the consolidated store
+RECORD_KEYS = (
+    "antipatterns_scanner_results", "antipatterns_scan_report", "refactoring_strategy_results",
+    "precheck_results", "compile_results", "code_review_results", "code_review_times",
+    "explanation_json", "code", "refactored_code",
+)
+
+_STOP = object()
+
+
+def store_path(results_dir: str, run_id: str, part: str = None, suffix: str = ".jsonl") -> Path:
+    name = f"results_{run_id}.part-{part}" if part else f"results_{run_id}"
+    return Path(results_dir) / f"{name}{suffix}"
+
+
+def build_result_record(file_path: str, final_state: dict, metrics_data: dict, model_name: str, timestamp: str) -> dict:
+    record = {"file_path": file_path, "timestamp": timestamp, "model": model_name, "metrics": metrics_data}
+    record.update({key: final_state.get(key) for key in RECORD_KEYS})
+    return record
+
+
+class ResultsWriter:
+    """Queue + thread that writes intermediate results off the workflow threads"""
+
+    def __init__(self, settings, run_id: str, results_dir: str = "../processing_results", store: str = "jsonl",
+                 part: str = None, fsync_every: int = FSYNC_EVERY, fsync_interval: float = FSYNC_INTERVAL,
+                 results_db=None, background: bool = True):
+        self.model_name = settings.LLM_MODEL
+        self.run_id = run_id
+        self.results_db = results_db
+        self.results_dir = results_dir
+        self.store = store if store in RESULT_STORES else "jsonl"
+        self.store_file = store_path(results_dir, run_id, part) if self.store != "none" else None
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.stats = {"written": 0, "failed": 0}
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._store_handle = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, file_path: str, final_state: dict) -> None:
+        """Hand a final state to the writer thread (a shallow copy, so later updates don't race)."""
+        if self._thread is None:
+            with self._lock:
+                self._write(file_path, final_state)
+            return
+        self._queue.put((file_path, dict(final_state)))
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, file_path: str, final_state: dict) -> None:
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            metrics_data = compute_code_metrics(final_state)
+            write_intermediate_results(file_path, final_state, metrics_data, self.model_name, self.results_dir, timestamp)
+            if self.store_file is not None:
+                self._append(build_result_record(file_path, final_state, metrics_data, self.model_name, timestamp))
+            if self.results_db is not None:
+                self.results_db.record_file_state(self.run_id, file_path, final_state, metrics_data)
+            self.stats["written"] += 1
+        except Exception as e:
+            print(Fore.RED + f"Error saving intermediate results for {file_path}: {e}" + Style.RESET_ALL)
+            self.stats["failed"] += 1
+
+    def _append(self, record: dict) -> None:
+        if self._store_handle is None:
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            self._store_handle = open(self.store_file, 'a', encoding='utf-8')
+        self._store_handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._store_handle is not None and self._unsynced:
+            self._store_handle.flush()
+            os.fsync(self._store_handle.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> dict:
+        """Write everything still queued, fsync the store and stop the thread; returns the counts."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._sync()
+        if self._store_handle is not None:
+            self._store_handle.close()
+            self._store_handle = None
+            print(Fore.CYAN + f"Consolidated results saved: {self.store_file}" + Style.RESET_ALL)
+            if self.store == "parquet":
+                export_parquet(self.store_file)
+        return dict(self.stats)
+
+
+def results_writer_for(settings, run_id: str, part: str = None) -> ResultsWriter:
+    """The run's ResultsWriter; it writes on its own thread when ASYNC_RESULTS_WRITER is on."""
+    from .results_db import results_db_for
+    return ResultsWriter(settings, run_id, store=settings.RESULTS_STORE, part=part,
+                         results_db=results_db_for(settings), background=settings.ASYNC_RESULTS_WRITER)
+
+
+def consolidate_parts(results_dir: str, run_id: str, store: str = "jsonl") -> Path:
+    """Append worker processes' part stores to the run's store and remove them."""
+    target = store_path(results_dir, run_id)
+    parts = sorted(Path(results_dir).glob(f"results_{run_id}.part-*.jsonl"))
+    if not parts:
+        return target if target.exists() else None
+    with open(target, 'a', encoding='utf-8') as out:
+        for part in parts:
+            with open(part, 'r', encoding='utf-8') as f:
+                for line in f:
+                    out.write(line)
+        out.flush()
+        os.fsync(out.fileno())
+    for part in parts:
+        part.unlink()
+    print(Fore.CYAN + f"Consolidated results saved: {target}" + Style.RESET_ALL)
+    if store == "parquet":
+        export_parquet(target)
+    return target
+
+
+def export_parquet(jsonl_path: Path):
+    """Convert a JSONL store to Parquet next to it; nested values are kept as JSON strings."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        print(Fore.YELLOW + "pyarrow is not installed; results kept as JSONL only" + Style.RESET_ALL)
+        return None
+
+    latest = {}
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            latest[record["file_path"]] = record  # Last record per file is the current one
+    rows = [
+        {key: value if isinstance(value, (str, int, float, bool, type(None))) else json.dumps(value, default=str)
+         for key, value in record.items()}
+        for record in latest.values()
+    ]
+    parquet_path = Path(jsonl_path).with_suffix(".parquet")
+    pq.write_table(pa.Table.from_pylist(rows), parquet_path)
+    print(Fore.CYAN + f"Parquet results saved: {parquet_path}" + Style.RESET_ALL)
+    return parquet_path
@@ -0,0 +1,94 @@
+"""
+Run journal for AntiPattern Remediator
+
+Each full-repository run appends to a JSONL journal under
+processing_results/runs/<run_id>.jsonl: a header with the run's file list,
+pre-screen results and backup info, then one record per finished file.
+An interrupted run can be resumed from its journal, re-processing only the
+files that have no successful record yet.
+
+Worker processes of a distributed run write their file records to their own
+part file (<run_id>.part-<name>.jsonl); `load` merges the parts back in.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+RUNS_DIR = "runs"
+
+
+def new_run_id() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class RunJournal:
+    """Append-only record of a run's progress"""
+
+    def __init__(self, run_id: str, results_dir: str = "../processing_results", part: Optional[str] = None):
+        self.run_id = run_id
+        self.results_dir = results_dir
+        runs_dir = Path(results_dir) / RUNS_DIR
+        self.path = runs_dir / f"{run_id}.jsonl"
+        self._write_path = runs_dir / f"{run_id}.part-{part}.jsonl" if part else self.path
+        self._lock = threading.Lock()
+
+    def part(self, name: str) -> "RunJournal":
+        """Journal a worker process writes its file records to."""
+        return RunJournal(self.run_id, self.results_dir, part=name)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _append(self, record: dict) -> None:
+        with self._lock:
+            self._write_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._write_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+
+    def start(self, file_paths: list, skipped_files: list, backup_info: dict) -> None:
+        """Record what the run is going to process."""
+        self._append({
+            'type': 'run',
+            'run_id': self.run_id,
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'file_paths': file_paths,
+            'skipped_files': skipped_files,
+            'backup_info': backup_info,
+        })
+
+    def record_result(self, file_result: dict) -> None:
+        self._append({'type': 'file', 'result': file_result})
+
+    def record_failure(self, file_path: str) -> None:
+        self._append({'type': 'failed', 'file_path': file_path})
+
+    def load(self) -> Optional[dict]:
+        """
+        Return {'header', 'results', 'failed'} where `results` maps file paths to
+        their last recorded result; None if the journal has no header.
+        """
+        if not self.exists():
+            return None
+        header, results, failed = None, {}, set()
+        parts = sorted(self.path.parent.glob(f"{self.run_id}.part-*.jsonl"))
+        for path in [self.path] + parts:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Partially written last line of an interrupted run
+                    if record.get('type') == 'run' and header is None:
+                        header = record
+                    elif record.get('type') == 'file':
+                        results[record['result']['file_path']] = record['result']
+                        failed.discard(record['result']['file_path'])
+                    elif record.get('type') == 'failed' and record['file_path'] not in results:
+                        failed.add(record['file_path'])
+        if header is None:
+            return None
+        return {'header': header, 'results': results, 'failed': failed}
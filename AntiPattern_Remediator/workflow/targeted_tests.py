@@ -0,0 +1,140 @@
+"""
+Targeted test execution for AntiPattern Remediator
+
+This module maps each refactored source file to the test classes that cover
+it and runs only those tests through Surefire's -Dtest filter, instead of
+running the module's full suite for every file. Runs in the same module are
+serialised, since concurrent `mvn test` invocations share its target/ directory.
+"""
+
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from colorama import Fore, Style
+
+from src.core.utils.java_compiler import JavaCompileChecker
+
+TEST_SOURCE_DIR = Path("src") / "test" / "java"
+MAIN_SOURCE_DIR = Path("src") / "main" / "java"
+TEST_NAME_PATTERNS = ("{name}Test", "{name}Tests", "Test{name}", "{name}TestCase")
+MAX_OUTPUT_CHARS = 4000
+TEST_TIMEOUT_SECONDS = 900
+
+_PACKAGE_RE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+_IMPORT_RE = re.compile(r"^\s*import\s+(?:static\s+)?([\w.]+)(?:\.\*)?\s*;", re.MULTILINE)
+_IDENTIFIER_RE = re.compile(r"\b[A-Z]\w*\b")
+
+
+def _fqcn_for(source_root: Path, java_file: Path) -> str:
+    """Fully qualified class name of a file under a source root."""
+    return ".".join(java_file.relative_to(source_root).with_suffix("").parts)
+
+
+class CoveringTestIndex:
+    """Name/import heuristic index from production classes to the test classes that use them"""
+
+    def __init__(self, module_root: Path):
+        self.module_root = module_root
+        self.tests = {}  # test FQCN -> {'package', 'imports', 'identifiers'}
+        self._build()
+
+    def _build(self) -> None:
+        test_root = self.module_root / TEST_SOURCE_DIR
+        if not test_root.exists():
+            return
+        for test_file in test_root.rglob("*.java"):
+            try:
+                source = test_file.read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            package = _PACKAGE_RE.search(source)
+            self.tests[_fqcn_for(test_root, test_file)] = {
+                'package': package.group(1) if package else "",
+                'imports': set(_IMPORT_RE.findall(source)),
+                'identifiers': set(_IDENTIFIER_RE.findall(source)),
+            }
+
+    def tests_for(self, class_fqcn: str) -> list:
+        """Test classes that follow the naming convention for, or reference, the given class."""
+        package, _, name = class_fqcn.rpartition(".")
+        by_name = {f"{package}.{p.format(name=name)}".lstrip(".") for p in TEST_NAME_PATTERNS}
+
+        matches = []
+        for test_fqcn, info in self.tests.items():
+            if test_fqcn in by_name:
+                matches.append(test_fqcn)
+                continue
+            visible = info['package'] == package or class_fqcn in info['imports'] or package in info['imports']
+            if visible and name in info['identifiers'] and test_fqcn.rpartition(".")[2] != name:
+                matches.append(test_fqcn)
+        return sorted(matches)
+
+
+class TargetedTestRunner:
+    """Run only the tests covering a refactored file (test index built once per module)"""
+
+    def __init__(self, timeout: int = TEST_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self._indices = {}
+        self._module_locks = {}
+        self._lock = threading.Lock()
+
+    def _index_for(self, module_root: Path) -> CoveringTestIndex:
+        key = str(module_root)
+        with self._lock:
+            if key not in self._indices:
+                self._indices[key] = CoveringTestIndex(module_root)
+            return self._indices[key]
+
+    def _module_lock(self, module_root: Path) -> threading.Lock:
+        """One lock per module: its Maven runs share target/, so they must not overlap."""
+        with self._lock:
+            return self._module_locks.setdefault(str(module_root), threading.Lock())
+
+    def find_tests(self, file_path: str) -> tuple:
+        """Return (module_root, covering test classes) for a source file."""
+        module_root = JavaCompileChecker.find_module_root(file_path)
+        if module_root is None:
+            return None, []
+        try:
+            class_fqcn = _fqcn_for(module_root / MAIN_SOURCE_DIR, Path(file_path).resolve())
+        except ValueError:
+            return module_root, []
+        return module_root, self._index_for(module_root).tests_for(class_fqcn)
+
+    def run_for_file(self, file_path: str) -> dict:
+        """Run the covering tests and record status, the tests run and the duration."""
+        module_root, tests = self.find_tests(file_path)
+        if module_root is None:
+            return {'status': 'skipped', 'tests': [], 'duration_seconds': 0.0, 'output': 'No Maven module found'}
+        if not tests:
+            return {'status': 'no_tests', 'tests': [], 'duration_seconds': 0.0, 'output': ''}
+
+        mvn_cmd = "mvn.cmd" if os.name == "nt" else "mvn"
+        command = [
+            mvn_cmd, "-q", "test",
+            f"-Dtest={','.join(tests)}",
+            "-Dsurefire.failIfNoSpecifiedTests=false",
+            "-DfailIfNoTests=false",
+            "-Drat.skip=true",
+        ]
+
+        with self._module_lock(module_root):
+            print(Fore.CYAN + f"Running {len(tests)} covering test class(es) in {module_root.name}..." + Style.RESET_ALL)
+            start = time.perf_counter()
+            try:
+                result = subprocess.run(command, cwd=module_root, capture_output=True, text=True, timeout=self.timeout)
+                status = 'passed' if result.returncode == 0 else 'failed'
+                output = result.stdout[-MAX_OUTPUT_CHARS:] if status == 'failed' else ''
+            except subprocess.TimeoutExpired:
+                status, output = 'timeout', f"Tests exceeded {self.timeout}s"
+            except OSError as e:
+                status, output = 'error', str(e)
+            duration = round(time.perf_counter() - start, 2)
+
+        colour = Fore.GREEN if status == 'passed' else Fore.RED
+        print(colour + f"Targeted tests {status} in {duration}s" + Style.RESET_ALL)
+        return {'status': status, 'tests': tests, 'duration_seconds': duration, 'output': output}
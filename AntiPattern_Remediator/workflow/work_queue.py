@@ -0,0 +1,283 @@
+"""
+SQLite work queue for AntiPattern Remediator
+
+Workers on one machine, or on several nodes that share a filesystem, claim
+files from a single SQLite database instead of a pre-computed shard. A claim
+is a lease, renewed by a heartbeat while the file is processed: if a worker
+dies, its files become claimable again once the lease expires. Results are
+only recorded by the worker that still holds the claim. Results are stored
+next to the task so whoever finishes last can build the processing summary.
+
+A queue belongs to one run: the coordinator records its run id when it
+enqueues, worker-only nodes read it back so their journal parts, pre-images
+and results land under the same run, and enqueueing for another run is refused.
+
+Byte-identical copies of a queued file (see dedup.py) are stored as
+"duplicate" tasks: they are never claimed, and the worker that processes
+their file completes them with the same result.
+
+SQLite locking on network filesystems is only as good as the filesystem's
+fcntl support; prefer a local disk or a filesystem known to handle it.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+LEASE_SECONDS = 1800  # A claim not renewed for this long is assumed to belong to a dead worker
+
+PENDING = "pending"
+CLAIMED = "claimed"
+DONE = "done"
+FAILED = "failed"
+DUPLICATE = "duplicate"  # Waiting for the file it duplicates
+
+
+class WorkQueue:
+    """File-level task queue backed by a SQLite database"""
+
+    def __init__(self, db_path: str, lease_seconds: float = LEASE_SECONDS):
+        self.db_path = str(db_path)
+        self.lease_seconds = lease_seconds
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS tasks (
+                    file_path TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    claimed_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    result TEXT
+                )
+                """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS duplicates (file_path TEXT PRIMARY KEY, duplicate_of TEXT NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def run_id(self) -> Optional[str]:
+        """The run this queue was filled for, or None if nothing has been enqueued with a run id."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'run_id'").fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def enqueue(self, file_paths: list, duplicates: dict = None, run_id: str = None) -> int:
+        """
+        Add new files and requeue failed ones; returns how many became pending (or duplicate).
+        `duplicates` maps a file to its byte-identical copies, queued right after it.
+        With `run_id`, the queue is bound to that run; raises ValueError if it already
+        holds tasks of another run.
+        """
+        duplicates = duplicates or {}
+        tasks = [
+            (path, status)
+            for file_path in file_paths
+            for path, status in ((file_path, PENDING), *((copy, DUPLICATE) for copy in duplicates.get(file_path, ())))
+        ]
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if run_id is not None:
+                self._bind_run(conn, run_id)
+            start = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tasks").fetchone()[0]
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT INTO tasks (file_path, position, status) VALUES (?, ?, ?)
+                ON CONFLICT(file_path) DO UPDATE SET status = excluded.status, worker = NULL WHERE tasks.status = ?
+                """,
+                [(path, start + i, status, FAILED) for i, (path, status) in enumerate(tasks)],
+            )
+            added = conn.total_changes - before
+            conn.executemany(
+                "INSERT OR REPLACE INTO duplicates (file_path, duplicate_of) VALUES (?, ?)",
+                [(copy, file_path) for file_path, copies in duplicates.items() for copy in copies],
+            )
+            # A copy whose file is no longer going to be processed is processed on its own
+            conn.execute(
+                """
+                UPDATE tasks SET status = ? WHERE status = ? AND file_path NOT IN (
+                    SELECT d.file_path FROM duplicates d JOIN tasks t ON t.file_path = d.duplicate_of
+                    WHERE t.status IN (?, ?)
+                )
+                """,
+                (PENDING, DUPLICATE, PENDING, CLAIMED),
+            )
+            conn.execute("COMMIT")
+            return added
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _bind_run(self, conn, run_id: str) -> None:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'run_id'").fetchone()
+        if row is None and conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is not None:
+            row = ("an earlier run",)
+        if row is not None and row[0] != run_id:
+            raise ValueError(f"Work queue {self.db_path} belongs to {row[0]!r}, not run {run_id!r}; "
+                             f"use a new --queue path or --resume {row[0]}")
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('run_id', ?)", (run_id,))
+
+    def claim(self, worker: str) -> Optional[str]:
+        """Atomically claim the next pending (or expired) file; None when nothing is left to claim."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                """
+                SELECT file_path FROM tasks
+                WHERE status = ? OR (status = ? AND claimed_at < ?)
+                ORDER BY position LIMIT 1
+                """,
+                (PENDING, CLAIMED, now - self.lease_seconds),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE file_path = ?",
+                    (CLAIMED, worker, now, row[0]),
+                )
+            conn.execute("COMMIT")
+            return row[0] if row else None
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def duplicates_of(self, file_path: str) -> list:
+        """The copies waiting on `file_path`, in queue order."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT t.file_path FROM duplicates d JOIN tasks t ON t.file_path = d.file_path
+                WHERE d.duplicate_of = ? AND t.status = ? ORDER BY t.position
+                """,
+                (file_path, DUPLICATE),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def renew(self, file_path: str, worker: str) -> bool:
+        """Extend `worker`'s lease on `file_path`; False if the claim has been lost."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE tasks SET claimed_at = ? WHERE file_path = ? AND status = ? AND worker = ?",
+                (time.time(), file_path, CLAIMED, worker),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    @contextmanager
+    def keep_alive(self, file_path: str, worker: str):
+        """Renew the lease on `file_path` every third of the lease while the block runs."""
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    if not self.renew(file_path, worker):
+                        return
+                except sqlite3.Error:
+                    continue  # Busy database; retry on the next beat, well within the lease
+
+        thread = threading.Thread(target=heartbeat, name=f"lease-{worker}", daemon=True)
+        if self.lease_seconds > 0:
+            thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            if thread.is_alive():
+                thread.join()
+
+    def finish(self, file_path: str, worker: str, results: list) -> bool:
+        """
+        Record the (path, result or None if it failed) pairs for `file_path` and its copies,
+        only if `worker` still holds the claim on `file_path`. Returns False (recording
+        nothing) when the claim has expired and been taken over.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            owner = conn.execute(
+                "SELECT 1 FROM tasks WHERE file_path = ? AND status = ? AND worker = ?",
+                (file_path, CLAIMED, worker),
+            ).fetchone()
+            if owner is None:
+                conn.execute("ROLLBACK")
+                return False
+            for path, result in results:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, result = ? WHERE file_path = ? AND status = ?",
+                    (DONE if result is not None else FAILED,
+                     json.dumps(result, default=str) if result is not None else None,
+                     path, CLAIMED if path == file_path else DUPLICATE),
+                )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def complete(self, file_path: str, file_result: dict, worker: str) -> bool:
+        return self.finish(file_path, worker, [(file_path, file_result)])
+
+    def fail(self, file_path: str, worker: str) -> bool:
+        return self.finish(file_path, worker, [(file_path, None)])
+
+    def counts(self) -> dict:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        counts = {PENDING: 0, CLAIMED: 0, DONE: 0, FAILED: 0, DUPLICATE: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def is_drained(self) -> bool:
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[CLAIMED] == 0
+
+    def results(self):
+        """(processed_files, failed_files) in enqueue order."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT file_path, status, result FROM tasks WHERE status IN (?, ?) ORDER BY position",
+                (DONE, FAILED),
+            ).fetchall()
+        finally:
+            conn.close()
+        processed = [json.loads(result) for _, status, result in rows if status == DONE]
+        failed = [file_path for file_path, status, _ in rows if status == FAILED]
+        return processed, failed